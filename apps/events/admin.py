@@ -10,7 +10,7 @@ from django.contrib import admin
 
 # Register your models here.
 from apps.events.models import EventType, Event, EventImage, FavouriteEvent, TicketCategoryFeature, TicketCategory, \
-    Ticket, Order, OrderItem, ETicket, EventHighlightingType, EventHighlighting
+    Ticket, TicketHold, Order, OrderItem, ETicket, ETicketSequence, EventHighlightingType, EventHighlighting
 from apps.notifications.tasks import notifications_tasks
 from apps.xlib.enums import OrderStatusEnum
 from commons.admin import BaseModelAdmin
@@ -291,6 +291,13 @@ class TicketAdmin(BaseModelAdmin):
     ordering = ['-timestamp']
 
 
+@admin.register(TicketHold)
+class TicketHoldAdmin(BaseModelAdmin):
+    search_fields = ("order__order_id", "ticket__name")
+    list_filter = ('status',)
+    ordering = ['-timestamp']
+
+
 @admin.register(Order)
 class OrderAdmin(BaseModelAdmin):
     search_fields = ("name", "email", "phone", "order_id", "user__first_name", "user__last_name")
@@ -316,6 +323,11 @@ class ETicketAdmin(BaseModelAdmin):
     pass
 
 
+@admin.register(ETicketSequence)
+class ETicketSequenceAdmin(BaseModelAdmin):
+    search_fields = ("event__name",)
+
+
 @admin.register(EventHighlightingType)
 class EventHighlightingTypeAdmin(BaseModelAdmin):
     pass
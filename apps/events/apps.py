@@ -16,4 +16,5 @@ class EventsConfig(AppConfig):
     def ready(self):
         import apps.events.signals.handlers
         import apps.events.signals.commission_signals
+        import apps.events.signals.feed_cache_signals
 
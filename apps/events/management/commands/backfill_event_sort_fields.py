@@ -0,0 +1,45 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.events.models import Event, EventHighlighting
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = """
+    Recompute the denormalized `start_datetime` and `highlight_level` columns of every event
+    cmd_sample:
+        pym backfill_event_sort_fields --batch-size 1000
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, **options):
+        batch_size = options["batch_size"]
+
+        self.stdout.write(self.style.SUCCESS("\n \n Start backfilling ... \n \n "))
+
+        levels = {
+            event_id: order if active_status else 0
+            for event_id, order, active_status in EventHighlighting.global_objects.values_list(
+                "event_id", "type__order", "active_status"
+            ).iterator(chunk_size=batch_size)
+        }
+
+        batch = []
+        updated = 0
+        queryset = Event.global_objects.only("pk", "date", "hour", "start_datetime", "highlight_level")
+        for event in queryset.iterator(chunk_size=batch_size):
+            event.start_datetime = event.compute_start_datetime()
+            event.highlight_level = levels.get(event.pk, 0)
+            batch.append(event)
+            if len(batch) >= batch_size:
+                updated += Event.global_objects.bulk_update(batch, ["start_datetime", "highlight_level"])
+                batch = []
+        if batch:
+            updated += Event.global_objects.bulk_update(batch, ["start_datetime", "highlight_level"])
+
+        self.stdout.write(self.style.SUCCESS(f"\n \n {updated} events successfully backfilled. \n \n "))
@@ -0,0 +1,41 @@
+import secrets
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.events.services.qr_codes import QRCodeBatchService, render_qr_code_png
+
+
+class Command(BaseCommand):
+    help = """
+    Compare the per-ticket cost of the QR code generation, one by one versus QRCodeBatchService
+    ( cold cache then warm cache ), on synthetic e-ticket QR code data
+    cmd_sample:
+        pym benchmark_qr_codes --count 1000
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000)
+
+    def report(self, label, elapsed, count):
+        self.stdout.write(f"{label:<32} {elapsed:8.3f} s   {elapsed * 1000 / count:8.3f} ms / ticket")
+
+    def handle(self, **options):
+        count = options["count"]
+        datas = [
+            '{"id64": "%s", "secret_phrase": "%s"}' % (secrets.token_urlsafe(24), secrets.token_urlsafe(96))
+            for _ in range(count)
+        ]
+
+        started_at = time.perf_counter()
+        for data in datas:
+            render_qr_code_png(data)
+        self.report("one by one", time.perf_counter() - started_at, count)
+
+        started_at = time.perf_counter()
+        QRCodeBatchService.get_many(datas)
+        self.report("batch service ( cold cache )", time.perf_counter() - started_at, count)
+
+        started_at = time.perf_counter()
+        QRCodeBatchService.get_many(datas)
+        self.report("batch service ( warm cache )", time.perf_counter() - started_at, count)
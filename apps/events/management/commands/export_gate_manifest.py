@@ -0,0 +1,36 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.models import Event
+from apps.events.services.gate_manifest import GateManifestService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = """
+    Export the signed offline gate manifest of an event
+    cmd_sample:
+        pym export_gate_manifest <event_pk> --output ./gate-manifest.wegm
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("event_pk", type=str)
+        parser.add_argument("--output", type=str, default=None)
+
+    def handle(self, **options):
+        event = Event.admin_objects.filter(pk=options["event_pk"]).only("pk").first()
+        if event is None:
+            raise CommandError(f"Event {options['event_pk']} not found.")
+
+        output_file = options["output"] or GateManifestService.get_filename(event)
+        size = 0
+        with open(output_file, "wb") as outfile:
+            for chunk in GateManifestService.stream(event):
+                outfile.write(chunk)
+                size += len(chunk)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"\n \n Manifest of {event.pk} written to {output_file} ({size} bytes). \n \n ")
+        )
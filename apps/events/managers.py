@@ -6,12 +6,11 @@ Created on April 26 2022
     Wesley Eliel MONTCHO, alias DevBackend7
 """
 
-import datetime
 import logging
 
-from django.db.models import DateTimeField, F, IntegerField, Sum, Value
-from django.db.models.expressions import ExpressionWrapper, Func
-from django.db.models.functions import Coalesce, Cast
+from django.db.models import F, IntegerField, Value
+from django.db.models.expressions import Func
+from django.utils import timezone
 from django_softdelete.models import SoftDeleteManager
 
 from apps.utils.managers import GeoModelManager
@@ -19,8 +18,6 @@ from apps.utils.managers import GeoModelManager
 logger = logging.getLogger(__name__)
 logger.setLevel('INFO')
 
-TIMESTAMP_DIFFERENCE = 3600
-
 
 def update_event_highlighting_status(obj):
     try:
@@ -58,13 +55,7 @@ class EventManager(GeoModelManager):
     def get_queryset(self):
         return super(GeoModelManager, self).get_queryset().select_related("type").select_related(
             "publisher").select_related("organization").select_related("country").filter(active=True, is_ephemeral=False  ).annotate(
-            start_datetime=ExpressionWrapper(F('date') + F('hour'), output_field=DateTimeField())).annotate(
-            highlight_level=Coalesce(Sum(F('highlight__type__order') * Cast('highlight__active_status', IntegerField()),
-                                         output_field=IntegerField()), 0)).annotate(
-            time_before_start=Epoch(F('start_datetime') - Value(datetime.datetime.now())) - Value(
-                TIMESTAMP_DIFFERENCE)).order_by(
-            'highlight_level').order_by(
-            'time_before_start')
+            time_before_start=Epoch(F('start_datetime') - Value(timezone.now()))).order_by('start_datetime')
     
     def public_events(self):
         """
@@ -111,11 +102,7 @@ class AdminEventManager(GeoModelManager):
     def get_queryset(self):
         queryset = super(GeoModelManager, self).get_queryset().select_related("type").select_related(
             "publisher").select_related("organization").select_related("country").annotate(
-            start_datetime=ExpressionWrapper(F('date') + F('hour'), output_field=DateTimeField())).annotate(
-            highlight_level=Coalesce(Sum(F('highlight__type__order') * Cast('highlight__active_status', IntegerField()),
-                                         output_field=IntegerField()), 0)).annotate(
-            time_before_start=Epoch(F('start_datetime') - Value(datetime.datetime.now())) - Value(
-                TIMESTAMP_DIFFERENCE)).order_by('time_before_start')
+            time_before_start=Epoch(F('start_datetime') - Value(timezone.now()))).order_by('start_datetime')
         queryset.from_admin = True
         return queryset
 
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0026_alter_eventhighlighting_end_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='highlight_level',
+            field=models.IntegerField(db_index=True, default=0, editable=False, verbose_name='Niveau de mise en avant'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='start_datetime',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name="Date et heure de début de l' évènement"),
+        ),
+        migrations.AddField(
+            model_name='historicalevent',
+            name='highlight_level',
+            field=models.IntegerField(db_index=True, default=0, editable=False, verbose_name='Niveau de mise en avant'),
+        ),
+        migrations.AddField(
+            model_name='historicalevent',
+            name='start_datetime',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name="Date et heure de début de l' évènement"),
+        ),
+    ]
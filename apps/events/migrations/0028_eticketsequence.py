@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-17 10:03
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0027_event_start_datetime_event_highlight_level_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ETicketSequence',
+            fields=[
+                ('is_deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True, verbose_name="Date d' ajout")),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('active', models.BooleanField(default=True, verbose_name="Désigne si l' instance est active")),
+                ('last_number', models.PositiveIntegerField(default=0, verbose_name='Dernier numéro attribué')),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='e_ticket_sequence', to='events.event', verbose_name='Évènement connexe')),
+            ],
+            options={
+                'verbose_name': "Séquence d' E-tickets",
+                'verbose_name_plural': "Séquences d' E-tickets",
+            },
+        ),
+    ]
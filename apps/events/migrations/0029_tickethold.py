@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-17 14:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0028_eticketsequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketHold',
+            fields=[
+                ('is_deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True, verbose_name="Date d' ajout")),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('active', models.BooleanField(default=True, verbose_name="Désigne si l' instance est active")),
+                ('quantity', models.PositiveIntegerField(verbose_name='Quantité réservée')),
+                ('expires_at', models.DateTimeField(verbose_name="Date d' expiration")),
+                ('status', models.CharField(choices=[('HELD', 'HELD'), ('CONFIRMED', 'CONFIRMED'), ('RELEASED', 'RELEASED'), ('EXPIRED', 'EXPIRED')], default='HELD', max_length=20, verbose_name='Statut')),
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_hold', to='events.order', verbose_name='Commande')),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='holds', to='events.ticket', verbose_name='Ticket')),
+            ],
+            options={
+                'verbose_name': 'Réservation de tickets',
+                'verbose_name_plural': 'Réservations de tickets',
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='ticket_hold_expiry_idx')],
+            },
+        ),
+    ]
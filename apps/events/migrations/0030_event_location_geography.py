@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:00
+
+import django.contrib.gis.db.models.fields
+from django.contrib.gis.geos import Point
+from django.db import migrations, models
+
+
+def fill_location_geography(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    if getattr(schema_editor.connection.ops, 'postgis', False):
+        schema_editor.execute(
+            f"UPDATE {Event._meta.db_table} "
+            f"SET location_geography = ST_SetSRID(ST_MakePoint(location_long, location_lat), 4326)::geography"
+        )
+        return
+    for event in Event._base_manager.iterator(chunk_size=2000):
+        event.location_geography = Point(event.location_long, event.location_lat, srid=4326)
+        event.save(update_fields=['location_geography'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0029_tickethold'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='location_geography',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, editable=False, geography=True, null=True, srid=4326, verbose_name="Lieu de l' évènement ( geography )"),
+        ),
+        migrations.AddField(
+            model_name='historicalevent',
+            name='location_geography',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, editable=False, geography=True, null=True, srid=4326, verbose_name="Lieu de l' évènement ( geography )"),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['location_lat', 'location_long'], name='event_lat_long_idx'),
+        ),
+        migrations.RunPython(fill_location_geography, migrations.RunPython.noop),
+    ]
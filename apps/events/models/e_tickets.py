@@ -11,7 +11,7 @@ import logging
 from typing import Tuple, Any
 
 from cryptography.fernet import Fernet
-from django.db import models
+from django.db import connection, models
 from django.utils.encoding import force_bytes, force_str as force_text
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 
@@ -49,8 +49,8 @@ class ETicket(AbstractCommonBaseModel):
         return f"{self.name}"
 
     @staticmethod
-    def format_name(event):
-        return f"E-Ticket N° {len(ETicket.objects.filter(event=event)) + 1} | {event.__str__()} "
+    def format_name(event, number: int):
+        return f"E-Ticket N° {number} | {event.__str__()} "
 
     def format_informations(self):
         return f"{self.name} @ {int(round(self.expiration_date.timestamp()))}"
@@ -95,7 +95,8 @@ class ETicket(AbstractCommonBaseModel):
         self.secret_phrase = self.format_informations()
 
     def set_name(self):
-        self.name = self.format_name(self.event)
+        number, = ETicketSequence.allocate(self.event, 1)
+        self.name = self.format_name(self.event, number)
 
     def save(self, *args, **kwargs):
         if self.name is None or self.name == "":
@@ -113,6 +114,74 @@ class ETicket(AbstractCommonBaseModel):
         self.qr_code_data = self.make_qr_code_data()
         self.save()
 
+    @classmethod
+    def bulk_generate(cls, *, event, ticket, related_order, quantity: int, expiration_date=None, batch_size=500):
+        """
+            Generate `quantity` e-tickets in memory ( name, secret, QR code data ) and write them with one bulk insert.
+            Sequence numbers are reserved in one shot through the event' s ETicketSequence.
+        """
+        if expiration_date is None:
+            expiration_date = ticket.expiry_date
+
+        e_tickets = []
+        for number in ETicketSequence.allocate(event, quantity):
+            e_ticket = cls(
+                event=event,
+                ticket=ticket,
+                related_order=related_order,
+                expiration_date=expiration_date,
+                name=cls.format_name(event, number),
+                secret_key=Fernet.generate_key(),
+            )
+            e_ticket.set_secret_phrase()
+            e_ticket.qr_code_data = e_ticket.make_qr_code_data()
+            e_tickets.append(e_ticket)
+
+        return cls.objects.bulk_create(e_tickets, batch_size=batch_size)
+
     class Meta:
         verbose_name = "E-ticket"
         verbose_name_plural = "E-tickets"
+
+
+class ETicketSequence(AbstractCommonBaseModel):
+    event = models.OneToOneField(
+        to="events.Event",
+        verbose_name="Évènement connexe",
+        related_name="e_ticket_sequence",
+        on_delete=models.CASCADE,
+    )
+    last_number = models.PositiveIntegerField(default=0, verbose_name="Dernier numéro attribué")
+
+    def __str__(self) -> str:
+        return f"{self.event_id} | {self.last_number}"
+
+    @classmethod
+    def allocate(cls, event, quantity: int = 1) -> range:
+        """
+            Reserve `quantity` contiguous e-ticket numbers for the event and return them as a range.
+            The counter row is seeded from the existing e-tickets count the first time it is used.
+        """
+        quantity = int(quantity)
+        if quantity <= 0:
+            return range(0)
+
+        cls.objects.get_or_create(
+            event_id=event.pk,
+            defaults={"last_number": lambda: ETicket.objects.filter(event_id=event.pk).count()},
+        )
+        event_field = cls._meta.get_field("event")
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {quote_name(cls._meta.db_table)} SET last_number = last_number + %s "
+                f"WHERE {quote_name(event_field.column)} = %s RETURNING last_number",
+                [quantity, event_field.get_db_prep_value(event.pk, connection)],
+            )
+            last_number = cursor.fetchone()[0]
+
+        return range(last_number - quantity + 1, last_number + 1)
+
+    class Meta:
+        verbose_name = "Séquence d' E-tickets"
+        verbose_name_plural = "Séquences d' E-tickets"
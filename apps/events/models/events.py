@@ -12,11 +12,13 @@ import logging
 from django.contrib.gis.db import models as gis_model
 from django.contrib.gis.geos import Point
 from django.db import models
+from django.utils.timezone import make_aware, get_default_timezone
 from model_utils import FieldTracker
 from simple_history.models import HistoricalRecords
 
 from apps.events.managers import EphemeralEventManager, EventManager, AdminEventManager
 from apps.notifications.utils.firebase import FirebaseDynamicLinkGenerator
+from apps.utils.managers import geography_point
 from apps.utils.utils import _upload_to
 from commons.models import AbstractCommonBaseModel
 
@@ -49,6 +51,11 @@ class Event(AbstractCommonBaseModel):
     location = gis_model.PointField(
         verbose_name="Lieu de l' évènement ", blank=False, null=True, srid=4326
     )
+    # ( longitude, latitude ) en geography : distances en mètres, index GiST pour la recherche de proximité
+    location_geography = gis_model.PointField(
+        verbose_name="Lieu de l' évènement ( geography )", geography=True, blank=True, null=True, srid=4326,
+        editable=False,
+    )
     hour = models.TimeField(
         verbose_name="Heure à laquelle aura lieu l' évènement ",
         default=datetime.time(00, 00, 00),
@@ -106,6 +113,19 @@ class Event(AbstractCommonBaseModel):
     participant_limit = models.IntegerField(
         verbose_name="Limite de participants", default=15, blank=True
     )
+    start_datetime = models.DateTimeField(
+        verbose_name="Date et heure de début de l' évènement",
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True,
+    )
+    highlight_level = models.IntegerField(
+        verbose_name="Niveau de mise en avant",
+        default=0,
+        editable=False,
+        db_index=True,
+    )
     objects = EventManager()
     admin_objects = AdminEventManager()
 
@@ -166,12 +186,24 @@ class Event(AbstractCommonBaseModel):
         location = Point(self.location_lat, self.location_long, srid=2953)
         location.transform(4326)
         self.location = location
+        self.location_geography = geography_point(self.location_lat, self.location_long)
         if not self.expiry_date:
             self.expiry_date = datetime.datetime.combine(
                 self.date, self.hour
             ) + datetime.timedelta(days=1)
+        self.start_datetime = self.compute_start_datetime()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"date", "hour"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"start_datetime"}
+        if update_fields is not None and {"location_lat", "location_long"} & set(update_fields):
+            kwargs["update_fields"] = set(kwargs["update_fields"]) | {"location", "location_geography"}
         return super().save(*args, **kwargs)
 
+    def compute_start_datetime(self):
+        return make_aware(
+            datetime.datetime.combine(self.date, self.hour), get_default_timezone()
+        )
+
     def get_dynamic_link(self):
         event_link = f"https://wuloevents.com/event/{self.pk}"
         if self.dynamic_link:
@@ -209,6 +241,9 @@ class Event(AbstractCommonBaseModel):
                 name="private_event_participant_limit"
             )
         ]
+        indexes = [
+            models.Index(fields=["location_lat", "location_long"], name="event_lat_long_idx"),
+        ]
 
     def is_accessible_publicly(self):
         """
@@ -35,6 +35,15 @@ class EventHighlightingType(AbstractCommonBaseModel):
     def get_purchase_cost(self, quantity: int):
         return self.price * quantity
 
+    def save(self, *args, **kwargs):
+        result = super().save(*args, **kwargs)
+        from apps.events.models import Event
+
+        Event.admin_objects.filter(
+            highlight__type=self, highlight__active_status=True
+        ).exclude(highlight_level=self.order).update(highlight_level=self.order)
+        return result
+
     @property
     def get_entity_info(self):
         return {"name": self.name}
@@ -66,3 +75,18 @@ class EventHighlighting(AbstractCommonBaseModel):
     @property
     def active(self):
         return True
+
+    @property
+    def level(self) -> int:
+        return self.type.order if self.active_status else 0
+
+    def save(self, *args, **kwargs):
+        result = super().save(*args, **kwargs)
+        self.sync_event_highlight_level()
+        return result
+
+    def sync_event_highlight_level(self):
+        from apps.events.models import Event
+
+        level = self.level
+        Event.admin_objects.filter(pk=self.event_id).exclude(highlight_level=level).update(highlight_level=level)
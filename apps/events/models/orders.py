@@ -107,6 +107,8 @@ class Order(AbstractCommonBaseModel):
         return super().save(*args, **kwargs)
 
     def distribute_the_income(self):
+        from apps.organizations.models import FinancialAccountEntry
+
         if not self.is_income_distributed:
             order_item = self.item
             line_total = order_item.line_total
@@ -118,8 +120,8 @@ class Order(AbstractCommonBaseModel):
             financial_account = organization.get_financial_account
             income = Decimal(
                 line_total) * Decimal(1 - to_apply_percentage)
-            financial_account.balance += income
-            financial_account.save(update_fields=['balance'])
+            financial_account.credit(income.quantize(Decimal("0.01")), kind=FinancialAccountEntry.ORDER_INCOME,
+                                     reference=str(self.pk))
 
             self.is_income_distributed = True
             self.applied_percentage = to_apply_percentage
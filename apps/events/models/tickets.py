@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from django.db import models
 
 from apps.organizations.models import Organization
+from apps.xlib.enums import TicketHoldStatusEnum
 from commons.models import AbstractCommonBaseModel
 
 logger = logging.getLogger(__name__)
@@ -106,3 +107,28 @@ class Ticket(AbstractCommonBaseModel):
         verbose_name = "Ticket"
         verbose_name_plural = "Tickets"
         unique_together = ('name', 'category')
+
+
+class TicketHold(AbstractCommonBaseModel):
+    """
+    Réservation temporaire de tickets prise à la soumission d' une commande.
+    La quantité est déjà retirée de `Ticket.available_quantity`, elle y est remise si le paiement échoue ou expire.
+    """
+
+    ticket = models.ForeignKey(to=Ticket, verbose_name='Ticket', related_name='holds', on_delete=models.CASCADE)
+    order = models.OneToOneField(to="events.Order", verbose_name='Commande', related_name='ticket_hold',
+                                 on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField(verbose_name='Quantité réservée')
+    expires_at = models.DateTimeField(verbose_name="Date d' expiration")
+    status = models.CharField(max_length=20, choices=TicketHoldStatusEnum.items(),
+                              default=TicketHoldStatusEnum.HELD.value, verbose_name='Statut')
+
+    def __str__(self) -> str:
+        return f'{self.quantity} x {self.ticket_id} ( {self.status} )'
+
+    class Meta:
+        verbose_name = "Réservation de tickets"
+        verbose_name_plural = "Réservations de tickets"
+        indexes = [
+            models.Index(fields=["status", "expires_at"], name="ticket_hold_expiry_idx"),
+        ]
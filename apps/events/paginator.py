@@ -1,4 +1,10 @@
+import binascii
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
 from rest_framework import pagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class EventPagination(pagination.PageNumberPagination):
@@ -19,3 +25,68 @@ class EventTypePagination(pagination.PageNumberPagination):
 
     def get_paginated_response(self, data):
         return super().get_paginated_response(data)
+
+
+class EventDistanceCursorPagination(pagination.BasePagination):
+    """
+    Pagination par curseur des évènements triés par ( distance, pk ) : le curseur porte la distance et la clé
+    du dernier évènement servi, la page suivante reprend juste après sans OFFSET ni COUNT.
+    """
+    page_size = 12
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    cursor_query_param = 'cursor'
+
+    def __init__(self):
+        self.page = []
+        self.has_next = False
+        self.request = None
+
+    def get_page_size(self, request):
+        try:
+            return max(1, min(int(request.query_params[self.page_size_query_param]), self.max_page_size))
+        except (KeyError, ValueError):
+            return self.page_size
+
+    @staticmethod
+    def encode_cursor(distance, pk) -> str:
+        return urlsafe_b64encode(f"{distance!r}|{pk}".encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        """
+        :return: ( distance, pk )
+        :raise ValueError: on a malformed cursor
+        """
+        try:
+            distance, pk = urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return float(distance), uuid.UUID(pk)
+        except (TypeError, UnicodeDecodeError, binascii.Error) as exc:
+            raise ValueError(exc)
+
+    def get_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        return self.decode_cursor(cursor) if cursor else None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page = results[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, self.encode_cursor(last.distance, last.pk)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data,
+        })
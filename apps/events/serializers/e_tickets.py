@@ -57,3 +57,16 @@ class ETicketSerializer(serializers.ModelSerializer):
 class ScanETicketSerializer(serializers.Serializer):
     id64 = serializers.CharField(required=True)
     secret_phrase = serializers.CharField(required=True)
+
+
+class GateScanBatchSerializer(serializers.Serializer):
+    scans = ScanETicketSerializer(many=True, allow_empty=False)
+
+
+class GateScanResultSerializer(serializers.Serializer):
+    id64 = serializers.CharField()
+    status = serializers.CharField()
+
+
+class GateCheckInsSerializer(serializers.Serializer):
+    checked_in = serializers.ListField(child=serializers.CharField(), allow_empty=False)
@@ -9,6 +9,7 @@ Created on June 05, 2024
 import logging
 
 from django.contrib.auth import get_user_model
+from django.db import transaction as db_transaction
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import APIException, ValidationError
@@ -19,6 +20,7 @@ from apps.events.models import (
     OrderItem,
 )
 from apps.events.serializers import LightEventSerializer
+from apps.events.services.inventory import TicketInventoryService, InsufficientTicketQuantity
 from apps.marketing.models import Coupon, Discount
 from apps.marketing.services.discounts import (
     is_discount_available_to_user_or_organization,
@@ -140,7 +142,22 @@ class OrderSerializer(serializers.ModelSerializer):
                 code=ErrorEnum.INSUFFICIENT_ITEMS_FOR_ORDERING.value,
             )
 
-        order_item = OrderItem.objects.create(**order_item_data)
+        with db_transaction.atomic():
+            order_item = OrderItem.objects.create(**order_item_data)
+            order: Order = super(OrderSerializer, self).create(
+                {
+                    "item_id": order_item.pk,
+                    "is_pseudo_anonymous": self.context.get("is_pseudo_anonymous_request", False),
+                    **validated_data
+                })
+            # Tickets held until the payment ends, or put back on sale when it is abandoned
+            try:
+                TicketInventoryService.reserve(order, order_item.ticket, int(order_item.quantity))
+            except InsufficientTicketQuantity:
+                raise APIException(
+                    ErrorUtil.get_error_detail(ErrorEnum.INSUFFICIENT_TICKET_QUANTITY),
+                    code=ErrorEnum.INSUFFICIENT_TICKET_QUANTITY.value,
+                )
         order_amount = order_item.line_total
 
         # Check for automatic discounts if no manual coupon is provided
@@ -159,13 +176,6 @@ class OrderSerializer(serializers.ModelSerializer):
                 auto_coupon = create_automatic_coupon_for_discount(best_discount)
                 coupon = auto_coupon
 
-        order: Order = super(OrderSerializer, self).create(
-            {
-                "item_id": order_item.pk,
-                "is_pseudo_anonymous": self.context.get("is_pseudo_anonymous_request", False),
-                **validated_data
-            })
-
         if enable_payment:
             request = self.context.get("request")
             auto_resolve_transaction = self.context.get("auto_resolve_transaction", False)
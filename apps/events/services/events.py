@@ -8,42 +8,40 @@ Created on 18/09/2023
 from decimal import Decimal
 from typing import List
 
-from apps.events.models import Event, Order, ETicket
+from django.db.models import Sum
+
+from apps.events.models import Event, ETicket
 from apps.events.serializers import LightTicketSerializer
 from apps.organizations.models import Organization
 from apps.users.serializers import UserSerializerLight
-from apps.xlib.enums import OrderStatusEnum
 
 
 def generate_stats_for_events(organization: Organization, events: List[Event]) -> list:
+    from apps.organizations.models import OrganizationSalesRollup
+
+    events = list(events)
+    tickets_sales = {
+        entry["ticket_id"]: entry
+        for entry in OrganizationSalesRollup.objects.filter(
+            organization_id=organization.pk, event_id__in=[event.pk for event in events]
+        ).values("ticket_id").annotate(
+            sold=Sum("quantity"), entries=Sum("discounted_gross"), amount_earn=Sum("net_earn")
+        )
+    }
+    percentage_for_wuloevents = organization.get_retribution_percentage()
     data = []
 
     for event in events:
         ticket_data = []
         for ticket in event.tickets.all():
             # Todo: Add discount usages to stats data
-            quantity_sold = 0
-            entries = Decimal("0")
-            amount_earn = Decimal("0")
-            related_orders = Order.objects.select_related('item').only("applied_percentage", "item").filter(
-                item__ticket_id=ticket.pk, status=OrderStatusEnum.FINISHED.value)
-            for order in related_orders:
-                potential_discount_data = order.item.potential_discount_data
-                _entry = order.item.line_total if not potential_discount_data.get("use_coupon", False) else Decimal(
-                    potential_discount_data.get("reduced_amount"))
-                _amount_earn = Decimal(1 - order.applied_percentage) * _entry
-
-                quantity_sold += order.item.quantity
-                entries += _entry
-                amount_earn += _amount_earn
-
-                # entries = ticket.price * Decimal(e_tickets_length)
+            ticket_sales = tickets_sales.get(ticket.pk, {})
             _data = {
                 "name": ticket.name,
                 "available_quantity": ticket.available_quantity,
-                "sold": quantity_sold,
-                "entries": entries,
-                "amount_earn": amount_earn
+                "sold": ticket_sales.get("sold") or 0,
+                "entries": ticket_sales.get("entries") or Decimal("0"),
+                "amount_earn": ticket_sales.get("amount_earn") or Decimal("0")
 
             }
             ticket_data.append(_data)
@@ -53,7 +51,7 @@ def generate_stats_for_events(organization: Organization, events: List[Event]) -
             "name": event.name,
             "views": event.views,
             "participant_count": event.participant_count,
-            "percentage_for_wuloevents": organization.get_retribution_percentage(),
+            "percentage_for_wuloevents": percentage_for_wuloevents,
             "tickets_data": ticket_data,
             "total_earn": sum([elmt["amount_earn"] for elmt in ticket_data])
         })
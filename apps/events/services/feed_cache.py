@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import hashlib
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class EventFeedCacheService:
+    """
+    Cache des réponses des listes publiques d' évènements.
+
+    Les clés sont versionnées par portée (liste, type, date, mis en avant) :
+    invalider une portée revient à changer sa version, les anciennes entrées
+    expirent d' elles-mêmes.
+    """
+
+    CACHE_KEY_PREFIX = "events_feed:"
+    CACHE_TIMEOUT = 60 * 2
+
+    GLOBAL_SCOPE = "all"
+    LIST_SCOPE = "list"
+    HIGHLIGHTED_SCOPE = "highlighted"
+
+    @staticmethod
+    def type_scope(event_type_pk) -> str:
+        return f"type:{event_type_pk}"
+
+    @staticmethod
+    def date_scope(date) -> str:
+        return f"date:{date}"
+
+    @classmethod
+    def _version_key(cls, scope: str) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}version:{scope}"
+
+    @classmethod
+    def get_version(cls, scope: str):
+        """
+        :return: the version of the scope, None when the cache is unavailable
+        """
+        try:
+            return cache.get_or_set(cls._version_key(scope), time.time_ns, None)
+        except Exception as exc:
+            logger.exception(exc.__str__())
+        return None
+
+    @classmethod
+    def invalidate(cls, *scopes: str) -> None:
+        try:
+            cache.set_many({cls._version_key(scope): time.time_ns() for scope in set(scopes)}, None)
+        except Exception as exc:
+            logger.exception(exc.__str__())
+
+    @classmethod
+    def invalidate_event(cls, event) -> None:
+        scopes = [
+            cls.LIST_SCOPE,
+            cls.HIGHLIGHTED_SCOPE,
+            cls.type_scope(event.type_id),
+            cls.date_scope(event.date),
+        ]
+        tracker = getattr(event, "tracker", None)
+        if tracker is not None:
+            if tracker.has_changed("type_id") and tracker.previous("type_id"):
+                scopes.append(cls.type_scope(tracker.previous("type_id")))
+            if tracker.has_changed("date") and tracker.previous("date"):
+                scopes.append(cls.date_scope(tracker.previous("date")))
+        cls.invalidate(*scopes)
+
+    @staticmethod
+    def is_cacheable(request) -> bool:
+        # `is_user_favourite` dépend de l' utilisateur, seules les requêtes anonymes sont mises en cache.
+        if request.user and request.user.is_authenticated:
+            return False
+        return request.query_params.get("from_admin") != "true"
+
+    @classmethod
+    def build_key(cls, action: str, scope: str, request):
+        """
+        :return: the cache key of the request, None when the cache is unavailable
+        """
+        global_version, scope_version = cls.get_version(cls.GLOBAL_SCOPE), cls.get_version(scope)
+        if global_version is None or scope_version is None:
+            return None
+        params = sorted(
+            (key, sorted(values)) for key, values in request.query_params.lists()
+        )
+        raw = f"{request.get_host()}|{params}"
+        digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+        return (
+            f"{cls.CACHE_KEY_PREFIX}{action}:{scope}:"
+            f"{global_version}:{scope_version}:{digest}"
+        )
+
+    @classmethod
+    def get(cls, key: str):
+        try:
+            return cache.get(key)
+        except Exception as exc:
+            logger.exception(exc.__str__())
+        return None
+
+    @classmethod
+    def set(cls, key: str, data) -> None:
+        try:
+            cache.set(key, data, cls.CACHE_TIMEOUT)
+        except Exception as exc:
+            logger.exception(exc.__str__())
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import base64
+import hashlib
+import hmac
+import logging
+import struct
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+
+from apps.events.models import ETicket
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class GateManifestService:
+    """
+    Manifeste binaire signé des e-tickets d' un évènement, pour la vérification hors ligne aux portes.
+
+    Format ( big-endian ) :
+        en-tête      : b"WEGM" | version ( B ) | uuid de l' évènement ( 16s ) | date de génération ( Q )
+        enregistrement : empreinte de l' id ( 16s ) | clé Fernet brute ( 32s ) | empreinte du secret ( 16s ) | drapeaux ( B )
+        fin          : b"WEGE" | nombre d' enregistrements ( I ) | HMAC-SHA256 de tout ce qui précède ( 32s )
+
+    L' empreinte de l' id est sha256( str(uuid) )[:16], celle du secret sha256( secret_phrase )[:16].
+    Le scanner déchiffre le secret du QR code avec la clé, le hache et compare les empreintes.
+    """
+
+    MAGIC = b"WEGM"
+    END_MAGIC = b"WEGE"
+    VERSION = 1
+    CHUNK_SIZE = 2000
+
+    HEADER_FORMAT = ">4sB16sQ"
+    RECORD_FORMAT = ">16s32s16sB"
+    TRAILER_FORMAT = ">4sI"
+
+    FLAG_ACTIVE = 0x01
+
+    @staticmethod
+    def hash_id(e_ticket_pk) -> bytes:
+        return hashlib.sha256(force_bytes(str(e_ticket_pk))).digest()[:16]
+
+    @staticmethod
+    def hash_secret_phrase(secret_phrase) -> bytes:
+        return hashlib.sha256(force_bytes(secret_phrase)).digest()[:16]
+
+    @staticmethod
+    def _signing_key() -> bytes:
+        # Clé partagée avec les scanners, dérivée de la SECRET_KEY si elle n' est pas configurée
+        signing_key = getattr(settings, "GATE_MANIFEST_SIGNING_KEY", None)
+        if signing_key:
+            return force_bytes(signing_key)
+        return hashlib.sha256(force_bytes(f"gate-manifest:{settings.SECRET_KEY}")).digest()
+
+    @classmethod
+    def stream(cls, event):
+        """
+            Yield the manifest of the event chunk by chunk, reading the e-tickets through a server side cursor.
+        """
+        signature = hmac.new(cls._signing_key(), digestmod=hashlib.sha256)
+
+        header = struct.pack(
+            cls.HEADER_FORMAT,
+            cls.MAGIC,
+            cls.VERSION,
+            uuid.UUID(str(event.pk)).bytes,
+            int(timezone.now().timestamp()),
+        )
+        signature.update(header)
+        yield header
+
+        queryset = ETicket.objects.filter(event_id=event.pk).values_list(
+            "pk", "secret_key", "secret_phrase", "active"
+        )
+        count = 0
+        buffer = []
+        for pk, secret_key, secret_phrase, active in queryset.iterator(chunk_size=cls.CHUNK_SIZE):
+            buffer.append(
+                struct.pack(
+                    cls.RECORD_FORMAT,
+                    cls.hash_id(pk),
+                    base64.urlsafe_b64decode(bytes(secret_key)),
+                    cls.hash_secret_phrase(secret_phrase),
+                    cls.FLAG_ACTIVE if active else 0,
+                )
+            )
+            count += 1
+            if len(buffer) >= cls.CHUNK_SIZE:
+                chunk = b"".join(buffer)
+                signature.update(chunk)
+                buffer = []
+                yield chunk
+
+        chunk = b"".join(buffer)
+        signature.update(chunk)
+        trailer = struct.pack(cls.TRAILER_FORMAT, cls.END_MAGIC, count)
+        signature.update(trailer)
+        yield chunk + trailer + signature.digest()
+
+    @classmethod
+    def verify(cls, manifest: bytes) -> bool:
+        body, digest = manifest[:-32], manifest[-32:]
+        expected = hmac.new(cls._signing_key(), body, hashlib.sha256).digest()
+        return hmac.compare_digest(expected, digest)
+
+    @classmethod
+    def get_filename(cls, event) -> str:
+        return f"gate-manifest-{event.pk}.wegm"
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from cryptography.fernet import Fernet, InvalidToken
+from django.core.cache import cache
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode
+
+from apps.events.models import ETicket
+from apps.xlib.enums import ErrorEnum
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+VALID_SCAN_STATUS = "VALID"
+
+
+class _LocalETicketCache:
+    """
+    Cache LRU borné, propre au processus, des clés de vérification des e-tickets.
+    Les entrées expirent après `timeout` secondes, comme celles du cache partagé.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class GateScanService:
+    """
+    Mode scan à l' entrée d' un évènement.
+
+    A l' ouverture des portes, les clés de vérification de tous les e-tickets de l' évènement sont
+    chargées dans le cache partagé. Les scans sont ensuite vérifiés sans requête SQL, le premier
+    passage est réservé atomiquement dans le cache et l' écriture en base est confiée à une tâche Celery
+    par lot de scans. Les e-tickets absents du cache ( vendus après l' ouverture, évincés ) sont lus en base.
+    """
+
+    CACHE_KEY_PREFIX = "gate_scan:"
+    CACHE_TIMEOUT = 60 * 60 * 12
+    PRELOAD_CHUNK_SIZE = 2000
+
+    local_cache = _LocalETicketCache(max_size=50000, timeout=CACHE_TIMEOUT)
+
+    @classmethod
+    def _opened_key(cls, event_pk) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}{event_pk}:opened"
+
+    @classmethod
+    def _entry_key(cls, event_pk, e_ticket_pk) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}{event_pk}:ticket:{e_ticket_pk}"
+
+    @classmethod
+    def _used_key(cls, event_pk, e_ticket_pk) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}{event_pk}:used:{e_ticket_pk}"
+
+    @classmethod
+    def get_gate_organization(cls, event_pk):
+        """
+            Return the id of the organization that opened the event' s doors, None when the doors are closed.
+        """
+        return cache.get(cls._opened_key(event_pk))
+
+    @classmethod
+    def is_opened(cls, event_pk) -> bool:
+        return cls.get_gate_organization(event_pk) is not None
+
+    @classmethod
+    def open_doors(cls, event) -> int:
+        """
+            Preload every e-ticket verification material of the event in the shared cache.
+        :return: the number of e-tickets loaded
+        """
+        queryset = ETicket.objects.filter(event_id=event.pk).values_list(
+            "pk", "secret_key", "secret_phrase", "active"
+        )
+        loaded = 0
+        entries, used = {}, {}
+        for pk, secret_key, secret_phrase, active in queryset.iterator(chunk_size=cls.PRELOAD_CHUNK_SIZE):
+            entries[cls._entry_key(event.pk, pk)] = (bytes(secret_key), secret_phrase)
+            if not active:
+                used[cls._used_key(event.pk, pk)] = 1
+            if len(entries) >= cls.PRELOAD_CHUNK_SIZE:
+                loaded += cls._store(entries, used)
+                entries, used = {}, {}
+        loaded += cls._store(entries, used)
+
+        cache.set(cls._opened_key(event.pk), str(event.organization_id), cls.CACHE_TIMEOUT)
+        return loaded
+
+    @classmethod
+    def _store(cls, entries, used) -> int:
+        if entries:
+            cache.set_many(entries, cls.CACHE_TIMEOUT)
+        if used:
+            cache.set_many(used, cls.CACHE_TIMEOUT)
+        return len(entries)
+
+    @classmethod
+    def close_doors(cls, event) -> None:
+        cache.delete(cls._opened_key(event.pk))
+
+    @staticmethod
+    def decode_id64(id64):
+        try:
+            instance_id = urlsafe_base64_decode(force_str(id64))
+            instance_id = instance_id.decode() if type(instance_id) is bytes else instance_id
+            return str(uuid.UUID(instance_id))
+        except Exception as exc:
+            logger.warning(exc)
+        return None
+
+    @classmethod
+    def _get_entries(cls, event_pk, e_ticket_ids):
+        entries, missing = {}, []
+        for e_ticket_id in e_ticket_ids:
+            entry = cls.local_cache.get((str(event_pk), e_ticket_id))
+            if entry is not None:
+                entries[e_ticket_id] = entry
+            else:
+                missing.append(e_ticket_id)
+
+        if missing:
+            keys = {cls._entry_key(event_pk, e_ticket_id): e_ticket_id for e_ticket_id in missing}
+            for key, entry in cache.get_many(list(keys)).items():
+                entries[keys[key]] = entry
+                cls.local_cache.set((str(event_pk), keys[key]), entry)
+
+        missing = [e_ticket_id for e_ticket_id in missing if e_ticket_id not in entries]
+        if missing:
+            # Repli sur la base, les e-tickets trouvés sont mis en cache
+            rows = ETicket.objects.filter(event_id=event_pk, pk__in=missing).values_list(
+                "pk", "secret_key", "secret_phrase", "active"
+            )
+            for pk, secret_key, secret_phrase, active in rows:
+                entry = (bytes(secret_key), secret_phrase)
+                entries[str(pk)] = entry
+                cache.set(cls._entry_key(event_pk, pk), entry, cls.CACHE_TIMEOUT)
+                if not active:
+                    cache.add(cls._used_key(event_pk, pk), 1, cls.CACHE_TIMEOUT)
+        return entries
+
+    @staticmethod
+    def _check_secret(entry, encrypted_secret_phrase) -> bool:
+        secret_key, secret_phrase = entry
+        try:
+            decrypted = force_str(Fernet(secret_key).decrypt(force_bytes(encrypted_secret_phrase)))
+        except (InvalidToken, ValueError, TypeError) as exc:
+            logger.warning(exc)
+            return False
+        return decrypted == secret_phrase
+
+    @classmethod
+    def reserve_check_in(cls, event_pk, e_ticket_pk) -> bool:
+        """
+            Reserve the first check-in of an e-ticket, shared by the gates and the single e-ticket scan.
+        :return: False when the e-ticket has already been checked in
+        """
+        try:
+            return cache.add(cls._used_key(event_pk, e_ticket_pk), 1, cls.CACHE_TIMEOUT)
+        except Exception as exc:
+            # The single e-ticket scan still relies on `ETicket.active`
+            logger.exception(exc.__str__())
+        return True
+
+    @staticmethod
+    def save_check_ins(event_pk, e_ticket_ids) -> None:
+        from apps.events.tasks import eticket_tasks
+
+        try:
+            eticket_tasks.record_gate_check_ins.delay(str(event_pk), list(e_ticket_ids))
+        except Exception as exc:
+            logger.exception(exc.__str__())
+            # Broker unavailable: the check-ins are written within the request
+            eticket_tasks.record_gate_check_ins(str(event_pk), list(e_ticket_ids))
+
+    @classmethod
+    def record_check_ins(cls, event_pk, e_ticket_ids) -> None:
+        """
+            Register check-ins made elsewhere ( offline scanners ) so that online gates reject those e-tickets too.
+        """
+        cache.set_many({cls._used_key(event_pk, e_ticket_id): 1 for e_ticket_id in e_ticket_ids}, cls.CACHE_TIMEOUT)
+        cls.save_check_ins(event_pk, e_ticket_ids)
+
+    @classmethod
+    def scan(cls, event_pk, scans):
+        """
+            Verify a batch of scanned e-tickets data ( {id64, secret_phrase} ) for the event.
+        :return: a list of {id64, status} in the same order, status being VALID or an ErrorEnum value
+        """
+        started_at = time.perf_counter()
+        decoded = [cls.decode_id64(item.get("id64")) for item in scans]
+        entries = cls._get_entries(event_pk, [e_ticket_id for e_ticket_id in decoded if e_ticket_id])
+
+        results, checked_in = [], []
+        for item, e_ticket_id in zip(scans, decoded):
+            entry = entries.get(e_ticket_id) if e_ticket_id else None
+            if entry is None:
+                status = ErrorEnum.TICKET_NOT_FOUND.value
+            elif not cls._check_secret(entry, item.get("secret_phrase")):
+                status = ErrorEnum.INVALID_TICKET.value
+            elif not cls.reserve_check_in(event_pk, e_ticket_id):
+                status = ErrorEnum.ALREADY_USED_TICKET.value
+            else:
+                status = VALID_SCAN_STATUS
+                checked_in.append(e_ticket_id)
+            results.append({"id64": item.get("id64"), "status": status})
+
+        if checked_in:
+            cls.save_check_ins(event_pk, checked_in)
+
+        logger.info(
+            f"{len(scans)} scans verified for event {event_pk} in {(time.perf_counter() - started_at) * 1000:.2f} ms"
+        )
+        return results
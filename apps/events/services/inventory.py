@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.events.models import Ticket, TicketHold
+from apps.xlib.enums import TicketHoldStatusEnum
+from commons.balances import apply_balance_deltas
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class InsufficientTicketQuantity(Exception):
+    pass
+
+
+class TicketInventoryService:
+    """
+    Réservation des tickets sans verrou de ligne.
+
+    Chaque retrait est un `UPDATE ... WHERE available_quantity >= n` conditionnel : deux acheteurs du même ticket
+    ne s' attendent jamais et le stock ne peut pas devenir négatif.
+    Une commande soumise prend une réservation ( TicketHold ) de HOLD_TTL, confirmée au paiement et remise en
+    vente si le paiement échoue ou est abandonné.
+
+    Pour les tickets très demandés ( plus de HOT_THRESHOLD réservations par HOT_WINDOW secondes ), un compteur Redis
+    rejette les demandes quand le stock est épuisé sans toucher la base. La base reste la seule source de vérité :
+    le compteur n' est mis à jour qu' après le commit des ventes ( `transaction.on_commit` ), une vente annulée
+    ne le consomme donc pas. Il expire après COUNTER_TIMEOUT secondes et est alors réinitialisé depuis la base.
+    """
+
+    HOLD_TTL = timedelta(minutes=15)
+
+    CACHE_KEY_PREFIX = "ticket_inventory:"
+    HOT_WINDOW = 10
+    HOT_THRESHOLD = 20
+    COUNTER_TIMEOUT = 60
+
+    EXPIRY_BATCH_SIZE = 500
+
+    @staticmethod
+    def is_unlimited(ticket) -> bool:
+        return ticket.initial_quantity == -1 or ticket.available_quantity == -1
+
+    @classmethod
+    def _counter_key(cls, ticket_pk) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}counter:{ticket_pk}"
+
+    @classmethod
+    def _rate_key(cls, ticket_pk) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}rate:{ticket_pk}"
+
+    @classmethod
+    def _is_hot(cls, ticket_pk) -> bool:
+        key = cls._rate_key(ticket_pk)
+        try:
+            cache.add(key, 0, cls.HOT_WINDOW)
+            return cache.incr(key) >= cls.HOT_THRESHOLD
+        except Exception as exc:
+            logger.warning(f"Ticket inventory rate not counted: {exc}")
+            return False
+
+    @classmethod
+    def _counter_allows(cls, ticket_pk, quantity: int):
+        """
+        :return: False when the counter says the stock is exhausted, None when there is no usable counter
+        """
+        try:
+            remaining = cache.get(cls._counter_key(ticket_pk))
+        except Exception as exc:
+            logger.warning(f"Ticket inventory counter unavailable: {exc}")
+            return None
+        if remaining is None:
+            return None
+        return remaining >= quantity
+
+    @classmethod
+    def _update_counter(cls, ticket_pk, delta: int, seed: bool = False):
+        """
+            Report a committed stock change to the counter, seeded from the database when it is missing and `seed`.
+        """
+        key = cls._counter_key(ticket_pk)
+        try:
+            try:
+                cache.incr(key, delta)
+            except ValueError:
+                if not seed:
+                    return
+                remaining = Ticket.objects.filter(pk=ticket_pk).values_list("available_quantity", flat=True).first()
+                if remaining is not None:
+                    cache.add(key, remaining, cls.COUNTER_TIMEOUT)
+        except Exception as exc:
+            logger.warning(f"Ticket inventory counter unavailable: {exc}")
+
+    @classmethod
+    def _update_counter_on_commit(cls, ticket_pk, delta: int, seed: bool = False):
+        transaction.on_commit(lambda: cls._update_counter(ticket_pk, delta, seed))
+
+    @classmethod
+    def reset_counter(cls, ticket_pk):
+        cache.delete(cls._counter_key(ticket_pk))
+
+    @staticmethod
+    def decrement(ticket_pk, quantity: int):
+        """
+            Atomically take `quantity` tickets if they are still available.
+        :return: the new available quantity, None when there are not enough tickets
+        """
+        remaining = apply_balance_deltas(
+            Ticket, ticket_pk, {"available_quantity": -quantity}, minimums={"available_quantity": 0}
+        )
+        return None if remaining is None else remaining["available_quantity"]
+
+    @staticmethod
+    def increment(ticket_pk, quantity: int) -> int:
+        return apply_balance_deltas(Ticket, ticket_pk, {"available_quantity": quantity})["available_quantity"]
+
+    @classmethod
+    def take(cls, ticket, quantity: int) -> int:
+        """
+            Take `quantity` tickets out of the inventory, through the Redis counter when the ticket is hot.
+        :return: the new available quantity
+        :raise InsufficientTicketQuantity: when there are not enough tickets
+        """
+        if cls.is_unlimited(ticket):
+            return ticket.available_quantity
+
+        hot = cls._is_hot(ticket.pk)
+        if hot and cls._counter_allows(ticket.pk, quantity) is False:
+            raise InsufficientTicketQuantity(ticket.pk)
+
+        remaining = cls.decrement(ticket.pk, quantity)
+        if remaining is None:
+            if hot:
+                cls._update_counter_on_commit(ticket.pk, 0, seed=True)
+            raise InsufficientTicketQuantity(ticket.pk)
+
+        cls._update_counter_on_commit(ticket.pk, -quantity, seed=hot)
+        return remaining
+
+    @classmethod
+    def give_back(cls, ticket_pk, quantity: int) -> int:
+        remaining = cls.increment(ticket_pk, quantity)
+        cls._update_counter_on_commit(ticket_pk, quantity)
+        return remaining
+
+    @classmethod
+    def reserve(cls, order, ticket, quantity: int):
+        """
+            Hold `quantity` tickets for a submitted order during HOLD_TTL.
+        :return: the TicketHold, None for a ticket without quantity limit
+        :raise InsufficientTicketQuantity: when there are not enough tickets
+        """
+        if cls.is_unlimited(ticket):
+            return None
+        cls.take(ticket, quantity)
+        return TicketHold.objects.create(
+            ticket=ticket, order=order, quantity=quantity, expires_at=timezone.now() + cls.HOLD_TTL,
+        )
+
+    @staticmethod
+    def _transition(hold_pk, status: str) -> bool:
+        # Transition conditionnelle : seul le premier entre paiement, échec et expiration l' emporte
+        return TicketHold.objects.filter(pk=hold_pk, status=TicketHoldStatusEnum.HELD.value).update(
+            status=status, updated=timezone.now()
+        ) == 1
+
+    @classmethod
+    def confirm(cls, order, ticket, quantity: int) -> int:
+        """
+            Turn the hold of a paid order into a sale. When the hold has already expired, the tickets are taken
+            again; a paid order is never refused, the inventory only stops at zero.
+        :return: the new available quantity
+        """
+        if cls.is_unlimited(ticket):
+            return ticket.available_quantity
+
+        hold = TicketHold.objects.filter(order=order).only("pk", "status").first()
+        if hold is not None and cls._transition(hold.pk, TicketHoldStatusEnum.CONFIRMED.value):
+            return Ticket.objects.values_list("available_quantity", flat=True).get(pk=ticket.pk)
+
+        try:
+            remaining = cls.take(ticket, quantity)
+        except InsufficientTicketQuantity:
+            logger.error(f"Order {order.pk} paid after its hold expired, ticket {ticket.pk} is sold out")
+            remaining = Ticket.objects.values_list("available_quantity", flat=True).get(pk=ticket.pk)
+        if hold is not None:
+            TicketHold.objects.filter(pk=hold.pk).update(
+                status=TicketHoldStatusEnum.CONFIRMED.value, updated=timezone.now()
+            )
+        return remaining
+
+    @classmethod
+    def release(cls, hold, status: str = TicketHoldStatusEnum.RELEASED.value) -> bool:
+        """
+            Put the tickets of a hold back on sale, once.
+        """
+        with transaction.atomic():
+            if not cls._transition(hold.pk, status):
+                return False
+            cls.give_back(hold.ticket_id, hold.quantity)
+        return True
+
+    @classmethod
+    def release_for_order(cls, order) -> bool:
+        hold = TicketHold.objects.filter(order=order, status=TicketHoldStatusEnum.HELD.value).first()
+        return hold is not None and cls.release(hold)
+
+    @classmethod
+    def expire_holds(cls) -> int:
+        """
+            Put back on sale the tickets of the orders whose payment has been abandoned.
+        :return: the number of expired holds
+        """
+        holds = TicketHold.objects.filter(
+            status=TicketHoldStatusEnum.HELD.value, expires_at__lte=timezone.now()
+        ).only("pk", "ticket_id", "quantity")
+        expired = 0
+        for hold in holds.iterator(chunk_size=cls.EXPIRY_BATCH_SIZE):
+            expired += cls.release(hold, TicketHoldStatusEnum.EXPIRED.value)
+        return expired
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+
+from django.contrib.gis.db.models import PointField
+from django.db.models import F, FloatField, Func, Q, Value
+
+from apps.utils.managers import (
+    bounding_box_filter, geography_point, has_postgis, spherical_distance_expression,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class InvalidProximityQuery(Exception):
+    pass
+
+
+class KNNDistance(Func):
+    """
+    Opérateur `<->` de PostGIS : distance en mètres entre deux geography, un ORDER BY dessus est servi
+    par l' index GiST ( recherche des plus proches voisins ) au lieu d' un tri de toute la table.
+    """
+    arg_joiner = " <-> "
+    template = "%(expressions)s"
+    output_field = FloatField()
+
+
+class EventProximitySearch:
+    """
+    Recherche des évènements autour d' une position, bornée par un rayon ( en mètres ) ou une bbox.
+
+    Sur PostGIS : `ST_DWithin` puis tri `<->`, tous deux servis par l' index GiST de `location_geography`.
+    Ailleurs : préfiltre rectangle sur les colonnes latitude / longitude puis distance sphérique.
+    Les résultats sont triés par ( distance, pk ), ce qui permet une pagination par curseur.
+    """
+
+    DEFAULT_RADIUS_M = 50_000
+    MAX_RADIUS_M = 500_000
+
+    LOCATION_FIELDS = ("location_lat", "location_long")
+
+    @classmethod
+    def parse_params(cls, params) -> dict:
+        """
+            Read `lat`, `long`, `radius` ( meters ) and `bbox` ( min_long,min_lat,max_long,max_lat ).
+        :raise InvalidProximityQuery: on missing or out of range values
+        """
+        try:
+            latitude = float(params["lat"])
+            longitude = float(params["long"])
+            radius_m = float(params["radius"]) if params.get("radius") else None
+            bbox = [float(value) for value in params["bbox"].split(",")] if params.get("bbox") else None
+        except (KeyError, TypeError, ValueError) as exc:
+            raise InvalidProximityQuery(exc)
+
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise InvalidProximityQuery("location out of range")
+        if radius_m is not None and not (0 < radius_m <= cls.MAX_RADIUS_M):
+            raise InvalidProximityQuery("radius out of range")
+        if bbox is not None and (len(bbox) != 4 or bbox[0] > bbox[2] or bbox[1] > bbox[3]):
+            raise InvalidProximityQuery("invalid bbox")
+        if radius_m is None and bbox is None:
+            radius_m = cls.DEFAULT_RADIUS_M
+        return {"latitude": latitude, "longitude": longitude, "radius_m": radius_m, "bbox": bbox}
+
+    @classmethod
+    def search(cls, queryset, latitude, longitude, radius_m=None, bbox=None):
+        """
+            Restrict `queryset` to the events around the location, annotated with their `distance` in meters
+            and ordered from the nearest.
+        """
+        latitude_field_name, longitude_field_name = cls.LOCATION_FIELDS
+        if bbox is not None:
+            min_long, min_lat, max_long, max_lat = bbox
+            queryset = queryset.filter(**{
+                f"{latitude_field_name}__range": (min_lat, max_lat),
+                f"{longitude_field_name}__range": (min_long, max_long),
+            })
+
+        if has_postgis():
+            point = geography_point(latitude, longitude)
+            if radius_m is not None:
+                queryset = queryset.filter(location_geography__dwithin=(point, radius_m))
+            queryset = queryset.annotate(
+                distance=KNNDistance(
+                    F("location_geography"), Value(point, output_field=PointField(srid=4326, geography=True))
+                )
+            )
+        else:
+            if radius_m is not None:
+                queryset = queryset.filter(
+                    bounding_box_filter(cls.LOCATION_FIELDS, (latitude, longitude), radius_m / 1000)
+                )
+            queryset = queryset.annotate(
+                distance=spherical_distance_expression(
+                    latitude_field_name, longitude_field_name, latitude, longitude
+                ) * 1000
+            )
+            if radius_m is not None:
+                queryset = queryset.filter(distance__lte=radius_m)
+
+        # The manager ordering ( start_datetime ) is replaced: the cursor relies on ( distance, pk )
+        return queryset.order_by("distance", "pk")
+
+    @staticmethod
+    def after(queryset, distance: float, pk):
+        """
+            Keep the events strictly after the ( distance, pk ) cursor.
+        """
+        return queryset.filter(Q(distance__gt=distance) | Q(distance=distance, pk__gt=pk))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import hashlib
+import logging
+from io import BytesIO
+
+import qrcode
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+def render_qr_code_png(qr_code_data) -> bytes:
+    qr = qrcode.make(qr_code_data)
+    buffer = BytesIO()
+    qr.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class QRCodeBatchService:
+    """
+    Génération par lots des QR codes des e-tickets.
+
+    Les PNG sont indexés par l' empreinte de `qr_code_data` : ils sont lus dans le cache partagé, puis
+    ( optionnellement ) dans le stockage, et seuls les manquants sont générés.
+    Le stockage coûte plusieurs allers-retours par QR code : il est réservé au téléchargement des e-tickets,
+    l' envoi des e-tickets d' une commande ne s' appuie que sur le cache.
+    """
+
+    CACHE_KEY_PREFIX = "qr_code:"
+    CACHE_TIMEOUT = 60 * 60 * 24 * 7
+    STORAGE_FOLDER = "e_tickets/qr_codes"
+
+    @staticmethod
+    def digest(qr_code_data) -> str:
+        return hashlib.sha256(qr_code_data.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _cache_key(cls, digest) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}{digest}"
+
+    @classmethod
+    def get_storage_path(cls, digest) -> str:
+        return f"{cls.STORAGE_FOLDER}/{digest[:2]}/{digest}.png"
+
+    @classmethod
+    def _read_storage(cls, digest):
+        path = cls.get_storage_path(digest)
+        try:
+            if default_storage.exists(path):
+                with default_storage.open(path, "rb") as f:
+                    return f.read()
+        except Exception as exc:
+            logger.warning(f"QR code {digest} can not be read from storage: {exc}")
+        return None
+
+    @classmethod
+    def _write_storage(cls, digest, content) -> None:
+        path = cls.get_storage_path(digest)
+        try:
+            if not default_storage.exists(path):
+                default_storage.save(path, ContentFile(content))
+        except Exception as exc:
+            logger.warning(f"QR code {digest} can not be saved to storage: {exc}")
+
+    @classmethod
+    def get_many(cls, qr_code_datas, persist=False) -> dict:
+        """
+            Return the PNG bytes of each QR code data, blank data included ( `qr_code_data` may be blank ).
+
+        :param qr_code_datas: iterable of e-ticket `qr_code_data`
+        :param persist: also look up and save the PNG files in the default storage
+        :return: dict {qr_code_data: png bytes}, with an entry for every given data
+        """
+        qr_code_datas = list(qr_code_datas)
+        digests = {cls.digest(data or ""): data or "" for data in qr_code_datas}
+        results = {}
+
+        try:
+            cached = cache.get_many([cls._cache_key(digest) for digest in digests])
+        except Exception as exc:
+            logger.warning(f"QR codes cache unavailable: {exc}")
+            cached = {}
+        for digest, data in digests.items():
+            content = cached.get(cls._cache_key(digest))
+            if content is not None:
+                results[data] = content
+
+        missing = [digest for digest, data in digests.items() if data not in results]
+        to_cache = {}
+        if persist:
+            for digest in list(missing):
+                content = cls._read_storage(digest)
+                if content is not None:
+                    results[digests[digest]] = content
+                    to_cache[cls._cache_key(digest)] = content
+            missing = [digest for digest in missing if digests[digest] not in results]
+
+        for digest in missing:
+            content = render_qr_code_png(digests[digest])
+            results[digests[digest]] = content
+            to_cache[cls._cache_key(digest)] = content
+            if persist:
+                cls._write_storage(digest, content)
+
+        if to_cache:
+            try:
+                cache.set_many(to_cache, cls.CACHE_TIMEOUT)
+            except Exception as exc:
+                logger.warning(f"QR codes cache unavailable: {exc}")
+
+        logger.info(f"{len(digests)} QR codes served, {len(missing)} generated")
+        return {data: results[data or ""] for data in qr_code_datas}
+
+    @classmethod
+    def get(cls, qr_code_data, persist=False) -> bytes:
+        return cls.get_many([qr_code_data], persist=persist)[qr_code_data]
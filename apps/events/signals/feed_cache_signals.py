@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.events.models import Event, EventHighlighting, Ticket
+from apps.events.services.feed_cache import EventFeedCacheService
+from apps.organizations.models import Subscription
+from apps.organizations.signals.initializers import subscription_status_changed
+
+# Champs modifiés à chaque consultation, sans effet sur le contenu des listes
+FEED_NEUTRAL_FIELDS = {"views", "dynamic_link"}
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_feed_on_event_change(sender, instance: Event, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= FEED_NEUTRAL_FIELDS:
+        return
+    EventFeedCacheService.invalidate_event(instance)
+
+
+def invalidate_feed_of_related_event(instance):
+    try:
+        event = instance.event
+    except Event.DoesNotExist:
+        # Supprimé avec son évènement, déjà invalidé par celui-ci
+        return
+    EventFeedCacheService.invalidate_event(event)
+
+
+@receiver(post_save, sender=EventHighlighting)
+@receiver(post_delete, sender=EventHighlighting)
+def invalidate_feed_on_highlighting_change(sender, instance: EventHighlighting, **kwargs):
+    invalidate_feed_of_related_event(instance)
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def invalidate_feed_on_ticket_change(sender, instance: Ticket, **kwargs):
+    invalidate_feed_of_related_event(instance)
+
+
+@receiver(post_save, sender=Subscription)
+def invalidate_feed_on_subscription_change(sender, instance: Subscription, **kwargs):
+    # La visibilité de tous les évènements d' une organisation en dépend
+    EventFeedCacheService.invalidate(EventFeedCacheService.GLOBAL_SCOPE)
+
+
+@receiver(subscription_status_changed)
+def invalidate_feed_on_subscription_status_change(sender, **kwargs):
+    # Transitions faites par UPDATE, sans post_save
+    EventFeedCacheService.invalidate(EventFeedCacheService.GLOBAL_SCOPE)
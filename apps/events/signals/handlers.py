@@ -2,6 +2,7 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from apps.events.models import Event, Order, Ticket
+from apps.events.services.inventory import TicketInventoryService
 from apps.events.tasks import eticket_tasks
 from apps.notifications.tasks import notifications_tasks
 from apps.xlib.enums import OrderStatusEnum
@@ -41,6 +42,13 @@ def update_event_expiry_datetime(sender, instance: Ticket, **kwargs):
         event.save(update_fields=['expiry_date'])
 
 
+@receiver(post_save, sender=Ticket)
+def reset_ticket_inventory_counter(sender, instance: Ticket, created: bool, **kwargs):
+    # The quantity may have been edited, the Redis counter is rebuilt from the database on the next sale
+    if not created:
+        TicketInventoryService.reset_counter(instance.pk)
+
+
 @receiver(post_save, sender=Order)
 def finalize_other_process(sender, instance, created, **kwargs):
     if instance.active and instance.tracker.has_changed('status') and instance.tracker.previous(
@@ -9,12 +9,11 @@ Created on September 20 2022
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.db import transaction
-from django.db.models import IntegerField
-from django.db.models.functions import Cast
 
 import apps.notifications.tasks as notification_tasks
 from apps.events.models import ETicket, Order
-from apps.utils.models import Variable
+from apps.events.services.inventory import TicketInventoryService
+from apps.utils.services.variables import VariableRegistry
 from apps.xlib.enums import OrderStatusEnum, VARIABLE_NAMES_ENUM
 
 logger = get_task_logger(__name__)
@@ -25,13 +24,9 @@ def generate_etickets_for_order(order_id):
     logger.warning(f'\n Begin E-Ticket Generation For Order {order_id} \n')
     order = Order.objects.select_related("item", "item__ticket", "item__ticket__event").get(pk=order_id)
 
-    var = Variable.objects.get(
-        name=VARIABLE_NAMES_ENUM.TICKET_NEARLY_SOLD_OUT_PERCENTAGES_FOR_NOTIFICATIONS.value
-    )
-
-    var_values = list(
-        var.possible_values.annotate(value_as_int=Cast("value", IntegerField())).order_by("value_as_int").values_list(
-            "value_as_int", flat=True))
+    var_values = sorted(VariableRegistry.get_list(
+        VARIABLE_NAMES_ENUM.TICKET_NEARLY_SOLD_OUT_PERCENTAGES_FOR_NOTIFICATIONS.value, cast=int
+    ))
 
     notifications = []
     # Process Ticket Generation
@@ -53,22 +48,17 @@ def generate_etickets_for_order(order_id):
             }
             for elmt in var_values
         ]
-        for time in range(int(order_item.quantity)):
-            payload = {
-                'event': event,
-                'ticket': ticket,
-                'related_order_id': order.pk,
-                'expiration_date': ticket.expiry_date
-            }
-            e_ticket = ETicket(**payload)
-            e_ticket.save()
-            e_ticket.generate_qr_code()
-            logger.warning(f'Finished Generation of E-Ticket {e_ticket.name}')
-
-        # Todo try to raise an error when tickets not available
-        if ticket.available_quantity > 0:
-            ticket.available_quantity -= int(order_item.quantity)
-        ticket.save(update_fields=['available_quantity'])
+        e_tickets = ETicket.bulk_generate(
+            event=event,
+            ticket=ticket,
+            related_order=order,
+            quantity=int(order_item.quantity),
+            expiration_date=ticket.expiry_date,
+        )
+        logger.warning(f'Finished Generation of {len(e_tickets)} E-Tickets')
+
+        # The tickets were held at the order submission, the hold becomes a sale
+        ticket.available_quantity = TicketInventoryService.confirm(order, ticket, int(order_item.quantity))
 
         event.participant_count += int(order_item.quantity)
         event.save(update_fields=['participant_count'])
@@ -94,4 +84,16 @@ def generate_etickets_for_order(order_id):
 
     logger.warning(f'\n End E-Ticket Generation For Order {order_id} \n')
 
+
+@shared_task()
+def expire_ticket_holds():
+    expired = TicketInventoryService.expire_holds()
+    logger.info(f'{expired} abandoned ticket holds put back on sale')
+
+
+@shared_task()
+def record_gate_check_ins(event_pk, e_ticket_ids):
+    updated = ETicket.objects.filter(event_id=event_pk, pk__in=e_ticket_ids, active=True).update(active=False)
+    logger.info(f'{updated} E-Tickets checked in at the gate')
+
 # payload = {'event': event, 'related_order_id': 1, 'expiration_date': datetime.combine(event.date, event.hour)}
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Tests de la numérotation des e-tickets ( ETicketSequence ).
+
+Ils vérifient que des attributions concurrentes ne donnent jamais deux fois le même numéro
+et que les numéros d' une commande sont contigus.
+"""
+
+import datetime
+import threading
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TransactionTestCase
+
+from apps.events.models import Event, EventType
+from apps.events.models.e_tickets import ETicketSequence
+from apps.organizations.models import Organization
+
+User = get_user_model()
+
+
+class ETicketSequenceTest(TransactionTestCase):
+    """Suite de tests de l' attribution des numéros d' e-tickets."""
+
+    def setUp(self):
+        """Initialisation des données de test."""
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="User",
+        )
+        self.event_type = EventType.objects.create(
+            name="Concert",
+            description="Concert de musique"
+        )
+        self.organization = Organization.objects.create(
+            name="Test Organization",
+            description="Test Organization Description",
+            email="org@example.com",
+            phone="+22967000000",
+            address="123 Test Street",
+            owner=self.user,
+            phone_number_validated=True,
+            percentage=0.15,
+            percentage_if_discounted=0.10
+        )
+        self.event = Event.objects.create(
+            name="Test Event",
+            description="Test Event Description",
+            type=self.event_type,
+            default_price=Decimal('10.00'),
+            location_name="Test Venue",
+            location_lat=6.3702928,
+            location_long=2.3912362,
+            date=datetime.date.today() + datetime.timedelta(days=30),
+            hour=datetime.time(18, 0),
+            expiry_date=datetime.datetime.now() + datetime.timedelta(days=31),
+            cover_image=SimpleUploadedFile(name='test_image.jpg', content=b'', content_type='image/jpeg'),
+            publisher=self.user,
+            organization=self.organization,
+            valid=True,
+            have_passed_validation=True
+        )
+
+    def test_allocations_are_contiguous(self):
+        """Les numéros suivent ceux déjà attribués."""
+        self.assertEqual(ETicketSequence.allocate(self.event, 3), range(1, 4))
+        self.assertEqual(ETicketSequence.allocate(self.event, 2), range(4, 6))
+        self.assertEqual(ETicketSequence.allocate(self.event, 0), range(0))
+
+    def test_concurrent_allocations_never_share_a_number(self):
+        """Des commandes simultanées reçoivent des numéros distincts, sans trou."""
+        workers, quantity = 8, 5
+        numbers, errors = [], []
+        barrier = threading.Barrier(workers)
+
+        def allocate():
+            try:
+                barrier.wait()
+                numbers.extend(ETicketSequence.allocate(self.event, quantity))
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=allocate) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(numbers), list(range(1, workers * quantity + 1)))
+        self.assertEqual(ETicketSequence.objects.get(event=self.event).last_number, workers * quantity)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""Tests de la réservation des tickets ( TicketInventoryService ).
+
+Ils vérifient que :
+
+1. Une réservation retire le stock et qu' on ne réserve jamais plus que le stock
+2. Une réservation expirée remet les tickets en vente, une seule fois
+3. Un paiement reçu après l' expiration reprend les tickets sans passer sous zéro
+4. Des réservations simultanées ne survendent pas
+5. Le compteur Redis des tickets très demandés ne suit que les ventes validées
+"""
+
+import datetime
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from apps.events.models import Event, EventType, Order, OrderItem, Ticket, TicketCategory, TicketHold
+from apps.events.services.inventory import InsufficientTicketQuantity, TicketInventoryService
+from apps.organizations.models import Organization
+from apps.xlib.enums import OrderStatusEnum, TicketHoldStatusEnum
+
+User = get_user_model()
+
+LOCAL_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class InventoryDataMixin:
+    """Données communes : un ticket de 10 places."""
+
+    def setUp(self):
+        """Initialisation des données de test."""
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="User",
+        )
+        self.event_type = EventType.objects.create(
+            name="Concert",
+            description="Concert de musique"
+        )
+        self.organization = Organization.objects.create(
+            name="Test Organization",
+            description="Test Organization Description",
+            email="org@example.com",
+            phone="+22967000000",
+            address="123 Test Street",
+            owner=self.user,
+            phone_number_validated=True,
+            percentage=0.15,
+            percentage_if_discounted=0.10
+        )
+        self.event = Event.objects.create(
+            name="Test Event",
+            description="Test Event Description",
+            type=self.event_type,
+            default_price=Decimal('10.00'),
+            location_name="Test Venue",
+            location_lat=6.3702928,
+            location_long=2.3912362,
+            date=datetime.date.today() + datetime.timedelta(days=30),
+            hour=datetime.time(18, 0),
+            expiry_date=datetime.datetime.now() + datetime.timedelta(days=31),
+            cover_image=SimpleUploadedFile(name='test_image.jpg', content=b'', content_type='image/jpeg'),
+            publisher=self.user,
+            organization=self.organization,
+            valid=True,
+            have_passed_validation=True
+        )
+        self.ticket_category = TicketCategory.objects.create(
+            event=self.event,
+            name="Standard",
+            description="Catégorie standard",
+            organization=self.organization
+        )
+        self.ticket = Ticket.objects.create(
+            event=self.event,
+            name="Test Ticket",
+            description="Ticket standard",
+            category=self.ticket_category,
+            price=Decimal("10.00"),
+            available_quantity=10,
+            initial_quantity=10,
+            organization=self.organization,
+            expiry_date=datetime.datetime.now() + datetime.timedelta(days=30)
+        )
+
+    def create_order(self, quantity: int) -> Order:
+        order_item = OrderItem.objects.create(
+            ticket=self.ticket,
+            quantity=quantity,
+            line_total=Decimal('10.00') * quantity
+        )
+        return Order.objects.create(
+            user=self.user,
+            item=order_item,
+            name="Test User",
+            email="test@example.com",
+            sex="M",
+            phone="+22967000000",
+            status=OrderStatusEnum.SUBMITTED.value,
+            ip_address="127.0.0.1"
+        )
+
+    def available_quantity(self) -> int:
+        return Ticket.objects.values_list("available_quantity", flat=True).get(pk=self.ticket.pk)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class TicketInventoryServiceTest(InventoryDataMixin, TestCase):
+    """Suite de tests des réservations de tickets."""
+
+    def test_reserve_takes_the_tickets(self):
+        """La réservation retire la quantité du stock."""
+        hold = TicketInventoryService.reserve(self.create_order(4), self.ticket, 4)
+
+        self.assertEqual(hold.status, TicketHoldStatusEnum.HELD.value)
+        self.assertEqual(self.available_quantity(), 6)
+
+    def test_reserve_beyond_the_stock_is_refused(self):
+        """Une réservation plus grande que le stock est refusée sans toucher au stock."""
+        order = self.create_order(11)
+        with self.assertRaises(InsufficientTicketQuantity):
+            TicketInventoryService.reserve(order, self.ticket, 11)
+
+        self.assertEqual(self.available_quantity(), 10)
+        self.assertFalse(TicketHold.objects.filter(order=order).exists())
+
+    def test_expired_hold_returns_the_tickets_once(self):
+        """Une réservation abandonnée remet ses tickets en vente une seule fois."""
+        hold = TicketInventoryService.reserve(self.create_order(4), self.ticket, 4)
+        TicketInventoryService.reserve(self.create_order(2), self.ticket, 2)
+        TicketHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - datetime.timedelta(minutes=1))
+
+        self.assertEqual(TicketInventoryService.expire_holds(), 1)
+        self.assertEqual(TicketInventoryService.expire_holds(), 0)
+        self.assertEqual(self.available_quantity(), 8)
+        hold.refresh_from_db()
+        self.assertEqual(hold.status, TicketHoldStatusEnum.EXPIRED.value)
+
+    def test_confirm_keeps_the_held_tickets(self):
+        """Le paiement confirme la réservation sans reprendre de tickets."""
+        order = self.create_order(4)
+        hold = TicketInventoryService.reserve(order, self.ticket, 4)
+
+        self.assertEqual(TicketInventoryService.confirm(order, self.ticket, 4), 6)
+        self.assertFalse(TicketInventoryService.release(hold))
+        self.assertEqual(self.available_quantity(), 6)
+
+    def test_confirm_after_expiry_takes_the_tickets_again(self):
+        """Un paiement reçu après l' expiration reprend les tickets remis en vente."""
+        order = self.create_order(4)
+        hold = TicketInventoryService.reserve(order, self.ticket, 4)
+        TicketHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - datetime.timedelta(minutes=1))
+        TicketInventoryService.expire_holds()
+
+        self.assertEqual(TicketInventoryService.confirm(order, self.ticket, 4), 6)
+        hold.refresh_from_db()
+        self.assertEqual(hold.status, TicketHoldStatusEnum.CONFIRMED.value)
+
+    def test_confirm_after_expiry_never_goes_below_zero(self):
+        """Si le stock a été revendu entre temps, le paiement est accepté et le stock reste à zéro."""
+        order = self.create_order(4)
+        hold = TicketInventoryService.reserve(order, self.ticket, 4)
+        TicketHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - datetime.timedelta(minutes=1))
+        TicketInventoryService.expire_holds()
+        TicketInventoryService.reserve(self.create_order(10), self.ticket, 10)
+
+        self.assertEqual(TicketInventoryService.confirm(order, self.ticket, 4), 0)
+        self.assertEqual(self.available_quantity(), 0)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+@mock.patch.object(TicketInventoryService, "HOT_THRESHOLD", 1)
+class TicketInventoryCounterTest(InventoryDataMixin, TestCase):
+    """Compteur Redis d' un ticket très demandé."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.counter_key = TicketInventoryService._counter_key(self.ticket.pk)
+
+    def test_committed_sales_update_the_counter(self):
+        """Le compteur est initialisé depuis la base puis suit les ventes validées."""
+        with self.captureOnCommitCallbacks(execute=True):
+            TicketInventoryService.take(self.ticket, 4)
+        self.assertEqual(cache.get(self.counter_key), 6)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TicketInventoryService.take(self.ticket, 2)
+        self.assertEqual(cache.get(self.counter_key), 4)
+
+    def test_rolled_back_sale_does_not_consume_the_counter(self):
+        """Une vente annulée avec sa transaction rend le stock sans toucher au compteur."""
+        cache.set(self.counter_key, 10)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    TicketInventoryService.take(self.ticket, 4)
+                    raise RuntimeError("e-tickets generation failed")
+
+        self.assertEqual(self.available_quantity(), 10)
+        self.assertEqual(cache.get(self.counter_key), 10)
+
+    def test_exhausted_counter_rejects_without_query(self):
+        """Un compteur épuisé refuse la demande sans interroger la base."""
+        cache.set(self.counter_key, 1)
+        with self.assertNumQueries(0):
+            with self.assertRaises(InsufficientTicketQuantity):
+                TicketInventoryService.take(self.ticket, 2)
+        self.assertEqual(self.available_quantity(), 10)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class TicketInventoryConcurrencyTest(InventoryDataMixin, TransactionTestCase):
+    """Réservations simultanées du même ticket."""
+
+    def test_concurrent_reservations_never_oversell(self):
+        """Sur 8 acheteurs de 2 tickets pour 10 places, seuls 5 obtiennent leur réservation."""
+        orders = [self.create_order(2) for _ in range(8)]
+        held, refused = [], []
+        barrier = threading.Barrier(len(orders))
+
+        def reserve(order):
+            try:
+                barrier.wait()
+                TicketInventoryService.reserve(order, self.ticket, 2)
+                held.append(order.pk)
+            except InsufficientTicketQuantity:
+                refused.append(order.pk)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=reserve, args=(order,)) for order in orders]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(held), 5)
+        self.assertEqual(len(refused), 3)
+        self.assertEqual(self.available_quantity(), 0)
+        self.assertEqual(TicketHold.objects.filter(ticket=self.ticket).count(), 5)
@@ -9,7 +9,7 @@ from django.conf import settings
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 
-from apps.events.utils.tickets import generate_e_ticket_pdf
+from apps.events.utils.tickets import TicketPdfRenderer
 from apps.utils.utils.codes.utils import format_to_money_string
 
 
@@ -30,20 +30,26 @@ def send_e_tickets_email_for_order(order_id: str, user_email: str, user_full_nam
     )
     email.content_subtype = "html"
 
-    # Attach all tickets
+    # Attach all tickets, one renderer per event so that the logo and the static layout are shared
+    renderers = {}
+    attachments = []
     for ticket_number, e_ticket in enumerate(e_tickets, start=1):
-        # with e_ticket.event.cover_image.open(mode='rb') as event_image_file:
-        pdf_buffer = generate_e_ticket_pdf(
-            logo_url=logo_url,
-            # event_image=event_image_file,
-            event_name=e_ticket.event.name,
-            location=e_ticket.event.location_name,
-            qrcode_data=e_ticket.qr_code_data,
-            ticket_name=e_ticket.ticket.name,
-            ticket_price=format_to_money_string(e_ticket.ticket.price),  # e_ticket.price,
-            ticket_number=ticket_number,
-            order_code=order_id
-        )
+        event = e_ticket.event
+        if event.pk not in renderers:
+            renderers[event.pk] = (TicketPdfRenderer(logo_url, event.name, event.location_name), [])
+        renderers[event.pk][1].append({
+            "qrcode_data": e_ticket.qr_code_data,
+            "ticket_name": e_ticket.ticket.name,
+            "ticket_price": format_to_money_string(e_ticket.ticket.price),  # e_ticket.price,
+            "ticket_number": ticket_number,
+            "order_code": order_id,
+        })
+
+    for renderer, tickets in renderers.values():
+        for ticket, pdf_buffer in zip(tickets, renderer.render_many(tickets)):
+            attachments.append((ticket["ticket_number"], pdf_buffer))
+
+    for ticket_number, pdf_buffer in sorted(attachments, key=lambda attachment: attachment[0]):
         email.attach(f"Ticket_N°{ticket_number}_Commande_{order_id}.pdf", pdf_buffer.read(), 'application/pdf')
 
     email.send()
@@ -5,14 +5,19 @@ Created on 12/05/2025
 @author:
     Wesley Eliel MONTCHO, alias DevBackend7
 """
+import hashlib
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from io import BytesIO
 
-import qrcode
 import requests
+from PIL import Image
 from django.conf import settings
+from django.core.cache import cache
 from reportlab.lib.colors import black, blue
 from reportlab.lib.pagesizes import A6
 from reportlab.lib.units import cm
@@ -21,6 +26,8 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
+from apps.events.services.qr_codes import QRCodeBatchService
+
 logger = logging.getLogger(__name__)
 
 font_path_bold = os.path.join(settings.BASE_DIR, 'assets', 'fonts', 'Montserrat-Bold.ttf')
@@ -32,8 +39,280 @@ pdfmetrics.registerFont(TTFont('Montserrat', font_path_regular))
 pdfmetrics.registerFont(TTFont('Montserrat-MediumItalic', font_path_medium_italic))
 
 
+LOGO_REQUEST_TIMEOUT = 10
+LOGO_CACHE_TIMEOUT = 60 * 60 * 24
+LOGO_CACHE_KEY_PREFIX = "ticket_logo:"
+LOGO_LOCAL_CACHE_SIZE = 64
+LOGO_LOCAL_CACHE_TIMEOUT = 60 * 10
+
+LOGO_WIDTH = 3.5 * cm
+LOGO_HEIGHT = 2 * cm
+LOGO_PRINT_DPI = 300
+
+
+class _LocalTimedCache:
+    """
+    Cache LRU borné, propre au processus, dont les entrées expirent après `timeout` secondes.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+# Logos ready to be drawn ( ImageReader scaled to the printed size ), False when unavailable
+_logos = _LocalTimedCache(max_size=LOGO_LOCAL_CACHE_SIZE, timeout=LOGO_LOCAL_CACHE_TIMEOUT)
+
+
+def prepare_logo(content):
+    """
+    Scale a logo down to its printed size, so that each document encodes a small image.
+
+    :param content: the logo bytes
+    :return: an ImageReader with its pixels already decoded, or None when the image is not readable
+    """
+    try:
+        image = Image.open(BytesIO(content))
+        image.thumbnail((round(LOGO_WIDTH / 72 * LOGO_PRINT_DPI), round(LOGO_HEIGHT / 72 * LOGO_PRINT_DPI)))
+        if image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA")
+        reader = ImageReader(image)
+        reader.getRGBData()
+        return reader
+    except Exception as e:
+        logger.info(f"Error reading logo: {e}")
+        return None
+
+
+def get_logo(logo_url):
+    """
+    Logo of the tickets, prepared once per process and kept LOGO_LOCAL_CACHE_TIMEOUT seconds.
+
+    :param logo_url:
+    :return: an ImageReader, or None when the logo can not be downloaded or read
+    """
+    if not logo_url:
+        return None
+    logo = _logos.get(logo_url)
+    if logo is None:
+        content = fetch_logo(logo_url)
+        logo = (prepare_logo(content) if content else None) or False
+        _logos.set(logo_url, logo)
+    return logo or None
+
+
+def fetch_logo(logo_url):
+    """
+    Download a logo once per cluster through the shared cache.
+
+    :param logo_url:
+    :return: the logo bytes, or None when it can not be downloaded
+    """
+    if not logo_url:
+        return None
+
+    cache_key = f"{LOGO_CACHE_KEY_PREFIX}{hashlib.md5(logo_url.encode('utf-8')).hexdigest()}"
+    try:
+        content = cache.get(cache_key)
+    except Exception as e:
+        logger.warning(f"Logo cache unavailable: {e}")
+        content = None
+    if content is not None:
+        return content
+
+    try:
+        logo_resp = requests.get(logo_url, timeout=LOGO_REQUEST_TIMEOUT)
+        if logo_resp.status_code != 200:
+            return None
+        content = logo_resp.content
+    except Exception as e:
+        logger.info(f"Error loading logo: {e}")
+        return None
+
+    try:
+        cache.set(cache_key, content, LOGO_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Logo cache unavailable: {e}")
+    return content
+
+
+class TicketPdfRenderer:
+    """
+    Render e-tickets of a same event.
+
+    The positions of the layout are computed once per renderer, and the logo is decoded and scaled to its printed
+    size once per process, so that it is cheap to embed in each document.
+    Each ticket is a dict with the keys: qrcode_data, ticket_name, ticket_price, ticket_number, order_code
+    and optionally qrcode_png, the QR codes missing it are fetched in batch from QRCodeBatchService.
+    """
+
+    def __init__(self, logo_url, event_name, location, persist_qr_codes=False):
+        self.logo_url = logo_url
+        self.persist_qr_codes = persist_qr_codes
+        self.event_name = event_name
+        self.location = location or ""
+        self.width, self.height = A6
+        self.margin = 0.8 * cm
+        self._layout = None
+
+    @property
+    def logo(self):
+        return get_logo(self.logo_url)
+
+    @property
+    def layout(self):
+        if self._layout is None:
+            y = self.height - self.margin - 0.3 * cm
+            layout = {"title_y": y}
+            y -= 1.0 * cm
+
+            if self.logo:
+                layout["logo_y"] = y - LOGO_HEIGHT
+                y -= LOGO_HEIGHT + 0.3 * cm
+
+            qr_size = 3.5 * cm
+            layout["qr_y"] = y - qr_size
+            y -= qr_size + 1 * cm
+
+            layout["infos_y"] = y
+            y -= 1 * cm
+
+            layout["event_name_y"] = y
+            y -= 0.7 * cm
+
+            layout["location_y"] = y
+            location_lines = self.location.split('\n') if '\n' in self.location else [self.location]
+            y -= 0.5 * cm * len(location_lines)
+
+            y -= 1.2 * cm
+            layout["footer_y"] = y
+            self._layout = layout
+        return self._layout
+
+    def _draw_static(self, c):
+        width, height, margin = self.width, self.height, self.margin
+        layout = self.layout
+
+        # Draw border
+        c.setStrokeColor(blue)
+        c.rect(margin / 2, margin / 2, width - margin, height - margin)
+
+        # Logo
+        logo = self.logo
+        if logo:
+            c.drawImage(logo, (width - LOGO_WIDTH) / 2, layout["logo_y"],
+                        width=LOGO_WIDTH, height=LOGO_HEIGHT, preserveAspectRatio=True, mask='auto')
+
+        c.setFillColor(black)
+
+        # Event Name
+        c.setFont("Montserrat-Bold", 11)
+        c.drawCentredString(width / 2, layout["event_name_y"], self.event_name[:35])
+
+        # Location
+        y = layout["location_y"]
+        c.setFont("Montserrat", 10)
+        location_lines = self.location.split('\n') if '\n' in self.location else [self.location]
+        for line in location_lines:
+            c.drawCentredString(width / 2, y, line[:40])
+            y -= 0.5 * cm
+
+        # Final Text
+        y = layout["footer_y"]
+        c.setFont("Montserrat", 9)
+        c.drawCentredString(width / 2, y, "Faites scanner ce code pour accéder à l'événement")
+        y -= 0.4 * cm
+        c.drawCentredString(width / 2, y, "Contactez-nous au +229 01 91 11 43 43")
+
+        # Generation date
+        c.setFont("Montserrat-MediumItalic", 8)
+        generated_on = datetime.now().strftime("Généré le %d/%m/%Y à %Hh%M")
+        c.drawCentredString(width / 2, y - 1.2 * cm, generated_on)
+
+    def _draw_ticket(self, c, ticket):
+        width = self.width
+        layout = self.layout
+
+        # Title: Ticket N° X – Commande Y
+        c.setFillColor(black)
+        c.setFont("Montserrat", 11)
+        title = f"Ticket N° {ticket['ticket_number']} – Commande {ticket['order_code']}"
+        c.drawCentredString(width / 2, layout["title_y"], title)
+
+        # QR Code
+        qr_size = 3.5 * cm
+        qr_img = ImageReader(BytesIO(ticket["qrcode_png"]))
+        c.drawImage(qr_img, (width - qr_size) / 2, layout["qr_y"],
+                    width=qr_size, height=qr_size)
+
+        # Ticket Infos
+        c.setFillColor(blue)
+        c.setFont("Montserrat-Bold", 10)
+        c.drawCentredString(width / 2, layout["infos_y"], f"{ticket['ticket_name'][:35]} | {ticket['ticket_price']}")
+
+        # Reset color
+        c.setFillColor(black)
+
+    def with_qr_codes(self, tickets):
+        missing = [ticket["qrcode_data"] for ticket in tickets if not ticket.get("qrcode_png")]
+        if not missing:
+            return tickets
+        pngs = QRCodeBatchService.get_many(missing, persist=self.persist_qr_codes)
+        return [
+            ticket if ticket.get("qrcode_png") else {**ticket, "qrcode_png": pngs[ticket["qrcode_data"]]}
+            for ticket in tickets
+        ]
+
+    def render_one(self, ticket):
+        """
+        Render one ticket as a pdf
+
+        :param ticket: ticket dict
+        :return: buffer ( the generated pdf buffer )
+        """
+        ticket, = self.with_qr_codes([ticket])
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer, pagesize=A6)
+        self._draw_static(c)
+        self._draw_ticket(c, ticket)
+        c.showPage()
+        c.save()
+        buffer.seek(0)
+        return buffer
+
+    def render_many(self, tickets):
+        """
+        Render each ticket in its own pdf, with the QR codes fetched in one batch.
+
+        :param tickets: list of ticket dicts
+        :return: list of buffers, in the same order as the tickets
+        """
+        return [self.render_one(ticket) for ticket in self.with_qr_codes(tickets)]
+
+
 def generate_e_ticket_pdf(logo_url, event_name, location, qrcode_data, ticket_name, ticket_price, ticket_number,
-                          order_code):
+                          order_code, persist_qr_code=False):
     """
     Use to generate a ticket as pdf from ticket information
 
@@ -45,85 +324,15 @@ def generate_e_ticket_pdf(logo_url, event_name, location, qrcode_data, ticket_na
     :param ticket_price:
     :param ticket_number:
     :param order_code:
+    :param persist_qr_code: keep the QR code in the default storage, for the e-tickets downloaded again and again
     :return: buffer ( the generated pdf buffer )
     """
-
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A6)
-    width, height = A6
-
-    margin = 0.8 * cm
-    y = height - margin - 0.3 * cm
-
-    # Draw border
-    c.setStrokeColor(blue)
-    c.rect(margin / 2, margin / 2, width - margin, height - margin)
-
-    # Title: Ticket N° X – Commande Y
-    c.setFont("Montserrat", 11)
-    title = f"Ticket N° {ticket_number} – Commande {order_code}"
-    c.drawCentredString(width / 2, y, title)
-    y -= 1.0 * cm
-
-    # Logo
-    if logo_url:
-        try:
-            logo_resp = requests.get(logo_url)
-            if logo_resp.status_code == 200:
-                logo_img = ImageReader(BytesIO(logo_resp.content))
-                logo_width = 3.5 * cm
-                logo_height = 2 * cm
-                c.drawImage(logo_img, (width - logo_width) / 2, y - logo_height,
-                            width=logo_width, height=logo_height, preserveAspectRatio=True, mask='auto')
-                y -= logo_height + 0.3 * cm
-        except Exception as e:
-            logger.info(f"Error loading logo: {e}")
-
-    # QR Code
-    qr_size = 3.5 * cm
-    qr = qrcode.make(qrcode_data)
-    qr_buffer = BytesIO()
-    qr.save(qr_buffer, format='PNG')
-    qr_buffer.seek(0)
-    qr_img = ImageReader(qr_buffer)
-    c.drawImage(qr_img, (width - qr_size) / 2, y - qr_size,
-                width=qr_size, height=qr_size)
-    y -= qr_size + 1 * cm
-
-    # Ticket Infos
-    c.setFillColor(blue)
-    c.setFont("Montserrat-Bold", 10)
-    c.drawCentredString(width / 2, y, f"{ticket_name[:35]} | {ticket_price}")
-    y -= 1 * cm
-
-    # Reset color
-    c.setFillColor(black)
-
-    # Event Name
-    c.setFont("Montserrat-Bold", 11)
-    c.drawCentredString(width / 2, y, event_name[:35])
-    y -= 0.7 * cm
-
-    # Location
-    c.setFont("Montserrat", 10)
-    location_lines = location.split('\n') if '\n' in location else [location]
-    for line in location_lines:
-        c.drawCentredString(width / 2, y, line[:40])
-        y -= 0.5 * cm
-
-    # Final Text
-    y -= 1.2 * cm
-    c.setFont("Montserrat", 9)
-    c.drawCentredString(width / 2, y, "Faites scanner ce code pour accéder à l'événement")
-    y -= 0.4 * cm
-    c.drawCentredString(width / 2, y, "Contactez-nous au +229 01 91 11 43 43")
-
-    # Generation date
-    c.setFont("Montserrat-MediumItalic", 8)
-    generated_on = datetime.now().strftime("Généré le %d/%m/%Y à %Hh%M")
-    c.drawCentredString(width / 2, y - 1.2 * cm, generated_on)
-
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer
+    return TicketPdfRenderer(logo_url, event_name, location, persist_qr_codes=persist_qr_code).render_one(
+        {
+            "qrcode_data": qrcode_data,
+            "ticket_name": ticket_name,
+            "ticket_price": ticket_price,
+            "ticket_number": ticket_number,
+            "order_code": order_code,
+        }
+    )
@@ -9,16 +9,14 @@ Created on 25/07/2023
 import datetime
 import logging
 
-from django.contrib.gis.db.models.functions import Distance
-from django.contrib.gis.geos import Point
 from django.db import IntegrityError
 from django.utils.decorators import method_decorator
-from django.utils.timezone import now, make_aware, get_default_timezone
+from django.utils.timezone import now, localdate, make_aware, get_default_timezone
 from django_filters.utils import translate_validation
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema, OpenApiParameter, extend_schema_view
+from drf_spectacular.utils import extend_schema, OpenApiParameter, extend_schema_view, inline_serializer
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from rest_framework.parsers import JSONParser, FormParser
@@ -27,7 +25,7 @@ from rest_framework.response import Response
 
 from apps.events.filters import EventOrdering, EventSearch, EventFilter
 from apps.events.models import Event
-from apps.events.paginator import EventPagination
+from apps.events.paginator import EventDistanceCursorPagination, EventPagination
 from apps.events.parsers import MultiPartFormParser
 from apps.events.permissions import OrganizationIsObjectCreator, IsPasswordConfirmed
 from apps.events.serializers import (
@@ -36,6 +34,8 @@ from apps.events.serializers import (
     LightEventSerializer,
 )
 from apps.events.services.events import get_event_participants
+from apps.events.services.feed_cache import EventFeedCacheService
+from apps.events.services.proximity import EventProximitySearch, InvalidProximityQuery
 from apps.events.views.utils import WriteOnlyNestedModelViewSet, ReadOnlyModelViewSet
 from apps.organizations.models import Organization
 from apps.organizations.permissions import (
@@ -482,7 +482,6 @@ class WriteOnlyEventViewSet(WriteOnlyNestedModelViewSet):
         return Response(serializer.data)
 
 
-# Todo: Cache
 @method_decorator(
     name="list",
     decorator=swagger_auto_schema(
@@ -576,15 +575,8 @@ class ReadOnlyEventViewSet(ReadOnlyModelViewSet):
                 )
 
         else:
-            current_datetime = now()
-            organizations_with_valid_subscription = Organization.objects.filter(
-                subscriptions__start_date__lte=current_datetime,
-                subscriptions__end_date__gte=current_datetime,
-                subscriptions__active_status=True,
-            ).values_list("pk", flat=True)
-
             queryset = self.object_class.objects.filter(
-                organization_id__in=list(organizations_with_valid_subscription),
+                organization__active_subscription_until__gte=localdate(),
                 have_passed_validation=True,
                 valid=True,
                 active=True,
@@ -629,6 +621,22 @@ class ReadOnlyEventViewSet(ReadOnlyModelViewSet):
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
+    def get_cached_response(self, scope, get_queryset):
+        if not EventFeedCacheService.is_cacheable(self.request):
+            return self.format_response(get_queryset())
+
+        cache_key = EventFeedCacheService.build_key(self.action, scope, self.request)
+        if cache_key is None:
+            return self.format_response(get_queryset())
+
+        data = EventFeedCacheService.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        response = self.format_response(get_queryset())
+        EventFeedCacheService.set(cache_key, response.data)
+        return response
+
     @extend_schema(
         description="Endpoint to get events list",
         parameters=[
@@ -677,8 +685,10 @@ class ReadOnlyEventViewSet(ReadOnlyModelViewSet):
         ],
     )
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_next_events().filter(private=False))
-        return self.format_response(queryset)
+        return self.get_cached_response(
+            EventFeedCacheService.LIST_SCOPE,
+            lambda: self.filter_queryset(self.get_next_events().filter(private=False)),
+        )
 
     @custom_paginated_response(
         name="CustomEventListPaginatedResponseSerializer",
@@ -689,28 +699,91 @@ class ReadOnlyEventViewSet(ReadOnlyModelViewSet):
     @action(methods=["GET"], detail=False, url_path="by-type")
     def get_events_by_type(self, request, *args, **kwargs):
         eventy_type_pk = request.GET.get("event_type_pk", None)
-        queryset = self.filter_queryset(
-            self.get_next_events().filter(type__pk=eventy_type_pk)
+        return self.get_cached_response(
+            EventFeedCacheService.type_scope(eventy_type_pk),
+            lambda: self.filter_queryset(
+                self.get_next_events().filter(type__pk=eventy_type_pk)
+            ),
         )
-        return self.format_response(queryset)
 
-    @custom_paginated_response(
-        name="CustomEventListPaginatedResponseSerializer",
-        description="Retrieve Events List By Location",
-        code=200,
-        serializer_class=EventSerializer,
+    @extend_schema(
+        description="Retrieve the events around a location, from the nearest, paginated by cursor",
+        parameters=[
+            OpenApiParameter("lat", OpenApiTypes.NUMBER, location=OpenApiParameter.QUERY, required=True),
+            OpenApiParameter("long", OpenApiTypes.NUMBER, location=OpenApiParameter.QUERY, required=True),
+            OpenApiParameter(
+                "radius",
+                OpenApiTypes.NUMBER,
+                location=OpenApiParameter.QUERY,
+                description=f"Search radius in meters ( default {EventProximitySearch.DEFAULT_RADIUS_M} when no bbox,"
+                            f" at most {EventProximitySearch.MAX_RADIUS_M} )",
+            ),
+            OpenApiParameter(
+                "bbox",
+                OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Bounding box: min_long,min_lat,max_long,max_lat",
+            ),
+            OpenApiParameter(
+                "cursor",
+                OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Cursor of the next page, given by the `next` link",
+            ),
+            OpenApiParameter(
+                EventPagination.page_query_param,
+                OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Not supported anymore: any page but 1 answers 400 PAGE_NUMBER_NOT_SUPPORTED, use `cursor`",
+                deprecated=True,
+            ),
+        ],
+        responses={
+            200: inline_serializer(
+                name="CustomEventListCursorPaginatedResponseSerializer",
+                fields={
+                    "next": serializers.CharField(),
+                    "previous": serializers.CharField(),
+                    "results": EventSerializer(many=True),
+                },
+            )
+        },
     )
     @action(methods=["GET"], detail=False, url_path="by-location")
     def get_events_by_location(self, request, *args, **kwargs):
-        longitude = float(request.GET.get("long", 0))
-        latitude = float(request.GET.get("lat", 0))
-        location = Point(longitude, latitude, srid=4326)
-        queryset = self.filter_queryset(
-            self.get_next_events()
-                .annotate(distance=Distance("location", location))
-                .order_by("distance")
-        )
-        return self.format_response(queryset)
+        paginator = EventDistanceCursorPagination()
+        # Paginated by page number ( p ) before, a client asking for the page 2 would get the first page again
+        if request.GET.get(EventPagination.page_query_param, "1") != "1":
+            raise ValidationError(
+                ErrorUtil.get_error_detail(ErrorEnum.PAGE_NUMBER_NOT_SUPPORTED),
+                code=ErrorEnum.PAGE_NUMBER_NOT_SUPPORTED.value,
+            )
+        try:
+            params = EventProximitySearch.parse_params(request.GET)
+        except InvalidProximityQuery as exc:
+            logger.info(f"Invalid proximity query: {exc}")
+            raise ValidationError(
+                ErrorUtil.get_error_detail(ErrorEnum.INVALID_LOCATION),
+                code=ErrorEnum.INVALID_LOCATION.value,
+            )
+        try:
+            cursor = paginator.get_cursor(request)
+        except ValueError:
+            raise ValidationError(
+                ErrorUtil.get_error_detail(ErrorEnum.INVALID_CURSOR),
+                code=ErrorEnum.INVALID_CURSOR.value,
+            )
+
+        filterset = EventFilter(request.GET, queryset=self.filter_queryset(self.get_next_events()))
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        queryset = EventProximitySearch.search(filterset.qs, **params)
+        if cursor is not None:
+            queryset = EventProximitySearch.after(queryset, *cursor)
+
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @custom_paginated_response(
         name="CustomEventListPaginatedResponseSerializer",
@@ -738,8 +811,10 @@ class ReadOnlyEventViewSet(ReadOnlyModelViewSet):
                 code=ErrorEnum.INVALID_DATE_FORMAT.value,
             )
 
-        queryset = self.filter_queryset(self.get_next_events().filter(date=date))
-        return self.format_response(queryset)
+        return self.get_cached_response(
+            EventFeedCacheService.date_scope(date),
+            lambda: self.filter_queryset(self.get_next_events().filter(date=date)),
+        )
 
     @custom_paginated_response(
         name="CustomEventListPaginatedResponseSerializer",
@@ -781,11 +856,13 @@ class ReadOnlyEventViewSet(ReadOnlyModelViewSet):
     )
     @action(methods=["GET"], detail=False, url_path="highlighted")
     def get_highlighted_events(self, request, *args, **kwargs):
-        _now = datetime.datetime.now()
-        base_queryset = self.get_next_events().filter(
-            highlight__active_status=True,
-            highlight__start_date__lte=_now,
-            highlight__end_date__gte=_now,
-        )
-        queryset = self.filter_queryset(base_queryset)
-        return self.format_response(queryset)
+        def get_queryset():
+            _now = datetime.datetime.now()
+            base_queryset = self.get_next_events().filter(
+                highlight__active_status=True,
+                highlight__start_date__lte=_now,
+                highlight__end_date__gte=_now,
+            )
+            return self.filter_queryset(base_queryset)
+
+        return self.get_cached_response(EventFeedCacheService.HIGHLIGHTED_SCOPE, get_queryset)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.notifications.dispatch import OutboundDispatcher
+from apps.notifications.models import Notification
+from apps.xlib.enums import NOTIFICATION_STATUS_ENUM
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class AsyncTokenBucket:
+    """
+    Limiteur de débit pour la boucle asyncio : `rate` requêtes par seconde, rafales de `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = float(rate)
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncDeliveryWorker:
+    """
+    Livraison asynchrone des notifications en attente ( statut PENDING ).
+
+    Un seul processus garde jusqu' à `concurrency` requêtes courier en vol sur un client httpx partagé.
+    Les notifications sont réservées par lots ( `claim_due`, SKIP LOCKED : plusieurs workers peuvent tourner ),
+    et leurs statuts sont écrits en fin de lot, une requête par statut.
+    """
+
+    COURIER_SEND_URL = "https://api.courier.com/send"
+    RETRIES = 3
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 20
+
+    def __init__(self, concurrency: int = 500, batch_size: int = 1000, rate: float = None, idle_sleep: float = 2):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.idle_sleep = idle_sleep
+        self.bucket = AsyncTokenBucket(rate, max(1, int(rate))) if rate else None
+        self.semaphore = None
+
+    def make_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {settings.COURIER_AUTH_TOKEN}"},
+            timeout=httpx.Timeout(getattr(settings, "COURIER_TIMEOUT", 30), connect=5),
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+
+    @staticmethod
+    def prepare(notifications) -> list:
+        # Construit hors de la boucle asyncio : les propriétés `target_*` peuvent lire l' utilisateur
+        return [
+            (notification.pk, notification.get_courier_message_payload() if notification.is_sendable else None)
+            for notification in notifications
+        ]
+
+    def claim(self) -> list:
+        return self.prepare(Notification.objects.claim_due(self.batch_size))
+
+    async def deliver(self, client: httpx.AsyncClient, pk, payload) -> tuple:
+        if payload is None:
+            return pk, NOTIFICATION_STATUS_ENUM.SUCCESS.value
+
+        async with self.semaphore:
+            for attempt in range(self.RETRIES + 1):
+                if self.bucket:
+                    await self.bucket.acquire()
+                retry_after = None
+                try:
+                    response = await client.post(self.COURIER_SEND_URL, json=payload)
+                    if response.status_code < 400:
+                        return pk, NOTIFICATION_STATUS_ENUM.SUCCESS.value
+                    # A send is not idempotent: only retried when refused unprocessed
+                    if response.status_code not in OutboundDispatcher.UNPROCESSED_STATUS_CODES:
+                        logger.warning(f"Notification {pk} rejected by courier: {response.status_code} {response.text}")
+                        return pk, NOTIFICATION_STATUS_ENUM.FAILED.value
+                    retry_after = response.headers.get("Retry-After")
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as exc:
+                    logger.warning(f"Notification {pk} delivery attempt {attempt + 1} failed: {exc}")
+                except httpx.TransportError as exc:
+                    # The message may have been delivered
+                    logger.warning(f"Notification {pk} delivery failed: {exc}")
+                    return pk, NOTIFICATION_STATUS_ENUM.FAILED.value
+                if attempt < self.RETRIES:
+                    await asyncio.sleep(self.backoff(attempt, retry_after))
+        return pk, NOTIFICATION_STATUS_ENUM.FAILED.value
+
+    @classmethod
+    def backoff(cls, attempt: int, retry_after=None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), cls.BACKOFF_MAX)
+            except ValueError:
+                pass
+        return min(cls.BACKOFF_MAX, cls.BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1)
+
+    @staticmethod
+    def write_back(results) -> dict:
+        pks_by_status = {}
+        for pk, status in results:
+            pks_by_status.setdefault(status, []).append(pk)
+        Notification.objects.set_statuses(pks_by_status)
+        return {status: len(pks) for status, pks in pks_by_status.items()}
+
+    async def run(self, once: bool = False) -> int:
+        """
+            Deliver the pending notifications until stopped, or until none is due when `once` is set.
+        :return: the number of handled notifications
+        """
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        handled = 0
+        async with self.make_client() as client:
+            while True:
+                batch = await sync_to_async(self.claim)()
+                if not batch:
+                    if once:
+                        break
+                    await asyncio.sleep(self.idle_sleep)
+                    continue
+
+                started_at = time.perf_counter()
+                results = await asyncio.gather(*(self.deliver(client, pk, payload) for pk, payload in batch))
+                counts = await sync_to_async(self.write_back)(results)
+                handled += len(results)
+                logger.info(f"{len(results)} notifications delivered in {time.perf_counter() - started_at:.2f} s {counts}")
+        return handled
+
+    def start(self, once: bool = False) -> int:
+        return asyncio.run(self.run(once=once))
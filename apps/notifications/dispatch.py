@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class DispatchError(Exception):
+    def __init__(self, provider: str, message: str, status_code: int = None):
+        super().__init__(f"[{provider}] {message}")
+        self.provider = provider
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """
+    Limiteur de débit : `rate` jetons par seconde, au plus `capacity` consommés d' un coup.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = float(rate)
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class OutboundDispatcher:
+    """
+    Point de passage unique des appels aux fournisseurs de notifications ( OneSignal, Gupshup, Firebase, Courier ).
+
+    Par fournisseur et par processus : une session HTTP avec son pool de connexions, un seau à jetons pour le débit,
+    un nombre borné d' appels simultanés, des délais d' attente et des nouvelles tentatives avec attente exponentielle.
+    Les limites par défaut de PROVIDERS peuvent être surchargées par `settings.NOTIFICATION_PROVIDERS_LIMITS`.
+    """
+
+    PROVIDERS = {
+        "onesignal": {"rate": 50, "burst": 100, "concurrency": 20, "timeout": (3.05, 15), "retries": 3},
+        "gupshup": {"rate": 20, "burst": 40, "concurrency": 10, "timeout": (3.05, 15), "retries": 3},
+        "firebase": {"rate": 20, "burst": 20, "concurrency": 5, "timeout": (3.05, 10), "retries": 2},
+        "courier": {"rate": 30, "burst": 60, "concurrency": 20, "timeout": (3.05, 30), "retries": 3},
+    }
+
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+    # Un envoi ( POST ) n' est pas idempotent : il n' est retenté que s' il n' a pas atteint le fournisseur
+    # ( connexion impossible ) ou que celui-ci l' a refusé sans le traiter
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+    UNPROCESSED_STATUS_CODES = {429, 503}
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 20
+
+    _pid = None
+    _sessions = {}
+    _buckets = {}
+    _executors = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_limits(cls, provider: str) -> dict:
+        overrides = getattr(settings, "NOTIFICATION_PROVIDERS_LIMITS", {}).get(provider, {})
+        return {**cls.PROVIDERS[provider], **overrides}
+
+    @classmethod
+    def _get(cls, registry_name: str, provider: str, factory):
+        # Les processus forkés ( workers celery ) repartent de zéro : sessions et verrous ne se partagent pas
+        if cls._pid != os.getpid():
+            with cls._lock:
+                if cls._pid != os.getpid():
+                    cls._pid = os.getpid()
+                    cls._sessions, cls._buckets, cls._executors = {}, {}, {}
+        registry = getattr(cls, registry_name)
+        if provider not in registry:
+            with cls._lock:
+                if provider not in registry:
+                    registry[provider] = factory(cls.get_limits(provider))
+        return registry[provider]
+
+    @staticmethod
+    def _make_session(limits: dict) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=limits["concurrency"])
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @classmethod
+    def get_session(cls, provider: str) -> requests.Session:
+        return cls._get("_sessions", provider, cls._make_session)
+
+    @classmethod
+    def get_bucket(cls, provider: str) -> TokenBucket:
+        return cls._get("_buckets", provider, lambda limits: TokenBucket(limits["rate"], limits["burst"]))
+
+    @classmethod
+    def get_executor(cls, provider: str) -> ThreadPoolExecutor:
+        return cls._get(
+            "_executors", provider,
+            lambda limits: ThreadPoolExecutor(max_workers=limits["concurrency"], thread_name_prefix=provider),
+        )
+
+    @classmethod
+    def backoff(cls, attempt: int, retry_after=None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), cls.BACKOFF_MAX)
+            except (TypeError, ValueError):
+                pass
+        return min(cls.BACKOFF_MAX, cls.BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1)
+
+    @staticmethod
+    def is_connect_error(exc) -> bool:
+        """
+            True when the request has not been sent, the connection to the provider could not be established.
+        """
+        if isinstance(exc, requests.ConnectTimeout):
+            return True
+        if isinstance(exc, requests.ConnectionError) and exc.args:
+            return isinstance(getattr(exc.args[0], "reason", None), ConnectTimeoutError)
+        return False
+
+    @classmethod
+    def is_retryable_response(cls, method: str, status_code: int) -> bool:
+        if method.upper() in cls.IDEMPOTENT_METHODS:
+            return status_code in cls.RETRY_STATUS_CODES
+        return status_code in cls.UNPROCESSED_STATUS_CODES
+
+    @classmethod
+    def is_retryable_error(cls, method: str, exc) -> bool:
+        return method.upper() in cls.IDEMPOTENT_METHODS or cls.is_connect_error(exc)
+
+    @classmethod
+    def call(cls, provider: str, func, *args, is_retryable=None, **kwargs):
+        """
+            Call `func` under the rate limit of the provider, retrying the failures accepted by `is_retryable`.
+        :raise: the last error once the retries are exhausted
+        """
+        retries = cls.get_limits(provider)["retries"]
+        bucket = cls.get_bucket(provider)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                return func(*args, **kwargs)
+            except Exception as exc:
+                if attempt >= retries or not (is_retryable and is_retryable(exc)):
+                    raise
+                delay = cls.backoff(attempt)
+                logger.warning(f"[{provider}] attempt {attempt + 1} failed ( {exc} ), retry in {delay:.2f} s")
+                time.sleep(delay)
+                attempt += 1
+
+    @classmethod
+    def request(cls, provider: str, method: str, url: str, **kwargs) -> requests.Response:
+        """
+            Send an HTTP request through the pooled session of the provider.
+            Network errors and 429 / 5xx responses are retried, only connection failures and 429 / 503 responses
+            for the non idempotent methods ( POST ); the last response is returned to the caller once the retries
+            are exhausted.
+        :raise DispatchError: when the provider can not be reached
+        """
+        limits = cls.get_limits(provider)
+        session = cls.get_session(provider)
+        bucket = cls.get_bucket(provider)
+        kwargs.setdefault("timeout", limits["timeout"])
+
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt >= limits["retries"] or not cls.is_retryable_error(method, exc):
+                    raise DispatchError(provider, f"Network error: {exc}") from exc
+                delay = cls.backoff(attempt)
+            else:
+                if not cls.is_retryable_response(method, response.status_code) or attempt >= limits["retries"]:
+                    return response
+                delay = cls.backoff(attempt, response.headers.get("Retry-After"))
+            logger.warning(f"[{provider}] {method} {url} attempt {attempt + 1} failed, retry in {delay:.2f} s")
+            time.sleep(delay)
+            attempt += 1
+
+    @classmethod
+    def run_many(cls, provider: str, func, items, is_retryable=None):
+        """
+            Call `func(item)` for every item, at most `concurrency` at a time, without stopping on failures.
+        :return: ( [( item, result )], [( item, error )] )
+        """
+        executor = cls.get_executor(provider)
+        futures = {
+            executor.submit(cls.call, provider, func, item, is_retryable=is_retryable): item
+            for item in items
+        }
+        succeeded, failed = [], []
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                succeeded.append((item, future.result()))
+            except Exception as exc:
+                logger.warning(f"[{provider}] dispatch failed: {exc}")
+                failed.append((item, exc))
+        return succeeded, failed
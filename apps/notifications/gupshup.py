@@ -10,6 +10,8 @@ import requests
 
 from django.conf import settings
 
+from apps.notifications.dispatch import OutboundDispatcher, DispatchError
+
 logger = logging.getLogger(__name__)
 
 class GupshupError(Exception):
@@ -52,8 +54,9 @@ class GupshupWhatsAppClient:
     # ---------- helpers ----------
     def _post_form(self, url: str, data: Dict) -> dict:
         try:
-            resp = requests.post(url, headers=self._headers, data=data, timeout=self.timeout)
-        except requests.RequestException as exc:
+            resp = OutboundDispatcher.request("gupshup", "POST", url, headers=self._headers, data=data,
+                                              timeout=self.timeout)
+        except (DispatchError, requests.RequestException) as exc:
             logger.exception("Gupshup request error")
             raise GupshupError(f"Network error: {exc}") from exc
 
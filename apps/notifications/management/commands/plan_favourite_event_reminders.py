@@ -0,0 +1,29 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.scheduling import FavouriteEventReminderPlanner
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = """
+    Plan the approach reminders of every favourite of the upcoming events, their pending reminders are replaced
+    cmd_sample:
+        pym plan_favourite_event_reminders
+        pym plan_favourite_event_reminders --event <event_pk>
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--event", type=str, default=None)
+
+    def handle(self, **options):
+        self.stdout.write(self.style.SUCCESS("\n \n Start planning ... \n \n "))
+
+        if options["event"]:
+            planned = FavouriteEventReminderPlanner.replan_event(options["event"])
+        else:
+            planned = FavouriteEventReminderPlanner.plan_upcoming()
+
+        self.stdout.write(self.style.SUCCESS(f"\n \n {planned} reminders successfully planned. \n \n "))
@@ -0,0 +1,37 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.delivery import AsyncDeliveryWorker
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = """
+    Run the asyncio delivery worker which sends the pending notifications to courier
+    cmd_sample:
+        pym run_delivery_worker
+        pym run_delivery_worker --concurrency 1000 --batch-size 2000 --rate 300
+        pym run_delivery_worker --once
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=500)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--rate", type=float, default=None, help="Max requests per second, unlimited by default")
+        parser.add_argument("--once", action="store_true", help="Stop when no notification is due anymore")
+
+    def handle(self, **options):
+        self.stdout.write(self.style.SUCCESS("\n \n Start delivering ... \n \n "))
+
+        worker = AsyncDeliveryWorker(
+            concurrency=options["concurrency"], batch_size=options["batch_size"], rate=options["rate"],
+        )
+        try:
+            handled = worker.start(once=options["once"])
+        except KeyboardInterrupt:
+            self.stderr.write("\nDelivery worker stopped.")
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"\n \n {handled} notifications delivered. \n \n "))
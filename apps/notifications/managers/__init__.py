@@ -1,2 +1,2 @@
 from .devices import MobileDeviceManager
-from .notifications import NotificationManager
+from .notifications import NotificationManager, send_notifications
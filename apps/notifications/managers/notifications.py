@@ -1,17 +1,34 @@
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
 
 import courier
+import httpx
+from courier.core import ApiError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from django_softdelete.models import SoftDeleteQuerySet, SoftDeleteManager
 
+from apps.notifications.dispatch import OutboundDispatcher
 from apps.notifications.utils.courier_client import CourierClient
 from apps.xlib.enums import (
     NOTIFICATION_CHANNELS_ENUM,
+    NOTIFICATION_STATUS_ENUM,
     NOTIFICATION_TYPE_TEMPLATE_BY_CHANNEL_ENUM,
 )
 
 logger = logging.getLogger(__name__)
 
+# Recipients per courier message, a failed message only fails its own recipients
+MESSAGE_MAX_RECIPIENTS = 100
+
+
+def is_retryable_courier_error(exc) -> bool:
+    # A send is not idempotent: only retried when it has not reached courier or has been refused unprocessed
+    if isinstance(exc, ApiError):
+        return exc.status_code in OutboundDispatcher.UNPROCESSED_STATUS_CODES
+    return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
 
 def send_courier_message(message):
     client = CourierClient()
@@ -20,88 +37,128 @@ def send_courier_message(message):
     return resp
 
 
+def _send_recipients_message(recipients_message):
+    _, message = recipients_message
+    return send_courier_message(message)
+
+
+SENDABLE_CHANNELS = [
+    NOTIFICATION_CHANNELS_ENUM.EMAIL.value,
+    NOTIFICATION_CHANNELS_ENUM.PUSH.value,
+    NOTIFICATION_CHANNELS_ENUM.SMS.value,
+    NOTIFICATION_CHANNELS_ENUM.WHATSAPP.value,
+]
+
+
+def send_notifications(notifications):
+    """
+    Send the given notifications to courier, template messages of at most MESSAGE_MAX_RECIPIENTS per notification type.
+    Works on any iterable of notifications ( queryset or freshly created instances ), without re-querying them.
+    A failed message does not stop the others, its notifications are marked as FAILED.
+    :return: {"sent": int, "failed": int} notifications count
+    """
+    model = None
+    recipients_by_type = {}
+    for instance in notifications:
+        model = type(instance)
+        if not any(element in instance.channels for element in SENDABLE_CHANNELS):
+            continue
+        _to = {"data": {**instance.extra_data, "data": instance.data}}
+        for channel in instance.channels:
+            match channel:
+                case NOTIFICATION_CHANNELS_ENUM.EMAIL.value:
+                    _to["email"] = instance.target_email
+                case NOTIFICATION_CHANNELS_ENUM.PUSH.value:
+                    _to["user_id"] = instance.target_phone_id
+                case (
+                    NOTIFICATION_CHANNELS_ENUM.SMS.value
+                    | NOTIFICATION_CHANNELS_ENUM.WHATSAPP.value
+                ):
+                    _to["phone_number"] = instance.target_phone
+        recipients_by_type.setdefault(instance.type.name, []).append((instance.pk, _to))
+
+    # Send template messages by type
+    messages = []
+    for type_name, recipients in recipients_by_type.items():
+        for start in range(0, len(recipients), MESSAGE_MAX_RECIPIENTS):
+            chunk = recipients[start:start + MESSAGE_MAX_RECIPIENTS]
+            messages.append((
+                [pk for pk, _ in chunk],
+                courier.TemplateMessage(
+                    template=NOTIFICATION_TYPE_TEMPLATE_BY_CHANNEL_ENUM[type_name].value,
+                    to=[_to for _, _to in chunk],
+                    routing=courier.Routing(
+                        method="all", channels=["email", "push", "sms", "inbox"]
+                    ),
+                ),
+            ))
+
+    sent, failed_pks = 0, []
+    if len(messages) > 0:
+        logger.info("\n\n\n Start Sending Requests to courier \n\n\n")
+
+        succeeded, failed = OutboundDispatcher.run_many(
+            "courier", _send_recipients_message, messages, is_retryable=is_retryable_courier_error
+        )
+        sent = sum(len(pks) for (pks, _), _ in succeeded)
+        failed_pks = [pk for (pks, _), _ in failed for pk in pks]
+        if failed_pks:
+            model.objects.filter(pk__in=failed_pks).update(status=NOTIFICATION_STATUS_ENUM.FAILED.value)
+
+        logger.info(f"\n\n\n End Sending Requests to courier, {sent} sent, {len(failed_pks)} failed \n\n\n")
+
+    return {"sent": sent, "failed": len(failed_pks)}
+
+
 class NotificationQuerySet(SoftDeleteQuerySet):
+    # A worker which died while sending leaves its notifications SENDING, they are claimed again after this delay
+    SENDING_TIMEOUT = timedelta(minutes=10)
+
     def bulk_send(self):
-        # Initialize Courier
-        if self.count() > 0:
-            notifications_types = self.values("type__name").distinct()
-
-            # Send template emails by type
-
-            messages = []
-            for notification_type in notifications_types:
-                related_notifications = (
-                    self.all()
-                    if len(notifications_types) < 2
-                    else self.filter(type__name=notification_type["type__name"])
-                )
-
-                target_template = NOTIFICATION_TYPE_TEMPLATE_BY_CHANNEL_ENUM[
-                    notification_type["type__name"]
-                ].value
-
-                recipients = []
-                # Iterate over each instance of the model
-                for instance in related_notifications:
-                    if any(
-                            element in instance.channels
-                            for element in [
-                                NOTIFICATION_CHANNELS_ENUM.EMAIL.value,
-                                NOTIFICATION_CHANNELS_ENUM.PUSH.value,
-                                NOTIFICATION_CHANNELS_ENUM.SMS.value,
-                                NOTIFICATION_CHANNELS_ENUM.WHATSAPP.value,
-                            ]
-                    ):
-                        _to = {"data": {**instance.extra_data, "data": instance.data}}
-                        for channel in instance.channels:
-                            match channel:
-                                case NOTIFICATION_CHANNELS_ENUM.EMAIL.value:
-                                    _to["email"] = instance.target_email
-                                case NOTIFICATION_CHANNELS_ENUM.PUSH.value:
-                                    _to["user_id"] = instance.target_phone_id
-                                case (
-                                    NOTIFICATION_CHANNELS_ENUM.SMS.value
-                                    | NOTIFICATION_CHANNELS_ENUM.WHATSAPP.value
-                                ):
-                                    _to["phone_number"] = instance.target_phone
-                        recipients.append(_to)
-
-                if len(recipients) > 0:
-                    # Creating the message
-                    messages.append(
-                        courier.TemplateMessage(
-                            template=target_template,
-                            to=recipients,
-                            routing=courier.Routing(
-                                method="all", channels=["email", "push", "sms", "inbox"]
-                            ),
-                        )
-                    )
-            if len(messages) > 0:
-                logger.info("\n\n\n Start Sending Requests to courier \n\n\n")
-
-                with ThreadPoolExecutor(max_workers=20) as executor:
-
-                    futures = {
-                        executor.submit(send_courier_message, message)
-                        for message in messages
-                    }
-                    for future in as_completed(futures):
-                        try:
-                            result = future.result()
-                        except Exception as exc:
-                            logger.warning(f"Generated an exception: {exc}")
-                            raise exc
-
-                logger.info("\n\n\n End Sending Requests to courier \n\n\n")
-
-        return True
+        return send_notifications(self.select_related("type", "user").iterator(chunk_size=500))
+
+    def due(self, now=None):
+        now = now or timezone.now()
+        return self.filter(
+            Q(status=NOTIFICATION_STATUS_ENUM.PENDING.value)
+            | Q(status=NOTIFICATION_STATUS_ENUM.SENDING.value, updated__lte=now - self.SENDING_TIMEOUT)
+        ).filter(Q(scheduled_to_delivery__isnull=True) | Q(scheduled_to_delivery__lte=now))
+
+    def claim_due(self, limit: int) -> list:
+        """
+            Claim at most `limit` notifications due for delivery and mark them SENDING.
+            Rows locked by another worker are skipped, so several workers never claim the same notification.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            pks = list(
+                self.due(now).order_by("timestamp").select_for_update(skip_locked=True)
+                .values_list("pk", flat=True)[:limit]
+            )
+            if not pks:
+                return []
+            self.model.objects.filter(pk__in=pks).update(status=NOTIFICATION_STATUS_ENUM.SENDING.value, updated=now)
+        return list(self.model.objects.filter(pk__in=pks).select_related("type", "user"))
+
+    def set_statuses(self, pks_by_status: dict, batch_size=1000):
+        """
+            Write back delivery statuses, {status: [pk]}, with one update per status and batch.
+        """
+        for status, pks in pks_by_status.items():
+            for start in range(0, len(pks), batch_size):
+                self.model.objects.filter(pk__in=pks[start:start + batch_size]).update(status=status)
 
 
 class NotificationManager(SoftDeleteManager):
     def get_queryset(self):
         return NotificationQuerySet(self.model, self._db).filter(is_deleted=False)
 
+    def claim_due(self, limit: int) -> list:
+        return self.get_queryset().claim_due(limit)
+
+    def set_statuses(self, pks_by_status: dict, batch_size=1000):
+        return self.get_queryset().set_statuses(pks_by_status, batch_size)
+
 # client.send(
 #     message=courier.TemplateMessage(
 #         template="9EDRXFVKYF4947GX0NXD72NPG6ZS",
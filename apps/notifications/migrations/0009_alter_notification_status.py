@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0008_alter_notificationtype_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='status',
+            field=models.CharField(choices=[('FAILED', 'FAILED'), ('SUCCESS', 'SUCCESS'), ('PENDING', 'PENDING'), ('SENDING', 'SENDING')], default='SUCCESS', max_length=10, verbose_name='Statut'),
+        ),
+    ]
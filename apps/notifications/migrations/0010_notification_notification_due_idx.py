@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0009_alter_notification_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['status', 'scheduled_to_delivery'], name='notification_due_idx'),
+        ),
+    ]
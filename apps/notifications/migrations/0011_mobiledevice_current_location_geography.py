@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:00
+
+import django.contrib.gis.db.models.fields
+from django.contrib.gis.geos import Point
+from django.db import migrations, models
+
+
+def fill_current_location_geography(apps, schema_editor):
+    MobileDevice = apps.get_model('notifications', 'MobileDevice')
+    if getattr(schema_editor.connection.ops, 'postgis', False):
+        schema_editor.execute(
+            f"UPDATE {MobileDevice._meta.db_table} "
+            f"SET current_location_geography = "
+            f"ST_SetSRID(ST_MakePoint(current_location_long, current_location_lat), 4326)::geography "
+            f"WHERE current_location_lat IS NOT NULL AND current_location_long IS NOT NULL"
+        )
+        return
+    devices = MobileDevice.objects.filter(current_location_lat__isnull=False, current_location_long__isnull=False)
+    for device in devices.iterator(chunk_size=2000):
+        device.current_location_geography = Point(device.current_location_long, device.current_location_lat, srid=4326)
+        device.save(update_fields=['current_location_geography'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0010_notification_notification_due_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mobiledevice',
+            name='current_location_geography',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, geography=True, null=True, srid=4326, verbose_name='Position ( geography )'),
+        ),
+        migrations.AddIndex(
+            model_name='mobiledevice',
+            index=models.Index(fields=['current_location_lat', 'current_location_long'], name='mobile_device_lat_long_idx'),
+        ),
+        migrations.RunPython(fill_current_location_geography, migrations.RunPython.noop),
+    ]
@@ -14,6 +14,7 @@ from model_utils import FieldTracker
 
 from apps.notifications.managers import MobileDeviceManager
 from apps.notifications.onesignal import Processor
+from apps.utils.managers import geography_point
 from commons.models import AbstractCommonBaseModel
 
 one_signal_processor = Processor()
@@ -48,6 +49,10 @@ class MobileDevice(AbstractCommonBaseModel):
     current_location = gis_model.PointField(
         verbose_name="Lieu de l' évènement", blank=True, null=True, srid=4326
     )
+    # ( longitude, latitude ) en geography : distances en mètres, index GiST pour les recherches de proximité
+    current_location_geography = gis_model.PointField(
+        verbose_name="Position ( geography )", geography=True, blank=True, null=True, srid=4326
+    )
     tracker = FieldTracker()
     objects = MobileDeviceManager()
 
@@ -55,6 +60,9 @@ class MobileDevice(AbstractCommonBaseModel):
         verbose_name = "Appareil Mobile"
         verbose_name_plural = "Appareils Mobile"
         unique_together = ('registration_id', 'token')
+        indexes = [
+            models.Index(fields=["current_location_lat", "current_location_long"], name="mobile_device_lat_long_idx"),
+        ]
 
     def initialize_one_signal_registerer(self):
         return one_signal_processor.Registerer(
@@ -80,6 +88,10 @@ class MobileDevice(AbstractCommonBaseModel):
         self.current_location = Point(
             self.current_location_lat, self.current_location_long, srid=4326
         )
+        self.current_location_geography = geography_point(self.current_location_lat, self.current_location_long)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"current_location_lat", "current_location_long"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"current_location", "current_location_geography"}
         return super().save(*args, **kwargs)
 
     def __str__(self):
@@ -8,11 +8,14 @@ Created on 22/07/2023
 import json
 
 import courier
+import httpx
 from courier.core import ApiError
 from django.db import models
 from django.utils import timezone
 
+from apps.notifications.dispatch import OutboundDispatcher
 from apps.notifications.managers import NotificationManager
+from apps.notifications.managers.notifications import is_retryable_courier_error
 from apps.notifications.models.utils import get_notification_default_data
 from apps.notifications.utils import id2slug
 from apps.notifications.utils.courier_client import CourierClient
@@ -73,9 +76,15 @@ class Notification(AbstractCommonBaseModel):
 
     objects = NotificationManager()
 
+    COURIER_ROUTING_CHANNELS = ["email", "push", "sms", "inbox"]
+
     class Meta:
         verbose_name = "Notification"
         verbose_name_plural = "Notifications"
+        indexes = [
+            # Notifications en attente, par échéance
+            models.Index(fields=["status", "scheduled_to_delivery"], name="notification_due_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} | {self.target_email or self.target_phone}"
@@ -130,55 +139,58 @@ class Notification(AbstractCommonBaseModel):
 
     @staticmethod
     def bulk_insert(objs):
-        from itertools import islice
-
-        batch_size = 100
-        created_objs: list[Notification] = []
-
-        start_index = 0
-
-        while True:
-            end_index = start_index + batch_size
-
-            batch = list(islice(objs, start_index, end_index))
-            if not batch:
-                break
-            created_objs.extend(Notification.objects.bulk_create(batch, batch_size))
-
-            start_index = end_index
-
+        created_objs = Notification.objects.bulk_create(objs, batch_size=100)
         return Notification.objects.filter(uuid__in=[obj.pk for obj in created_objs])
 
+    @property
+    def is_sendable(self) -> bool:
+        return any(element in (self.channels or []) for element in
+                   [NOTIFICATION_CHANNELS_ENUM.EMAIL.value, NOTIFICATION_CHANNELS_ENUM.PUSH.value,
+                    NOTIFICATION_CHANNELS_ENUM.SMS.value, NOTIFICATION_CHANNELS_ENUM.WHATSAPP.value])
+
+    def get_courier_recipient(self) -> dict:
+        _to = {}
+        for channel in self.channels:
+            match channel:
+                case NOTIFICATION_CHANNELS_ENUM.EMAIL.value:
+                    _to["email"] = self.target_email
+                case NOTIFICATION_CHANNELS_ENUM.PUSH.value:
+                    _to["user_id"] = self.target_phone_id
+                case NOTIFICATION_CHANNELS_ENUM.SMS.value | NOTIFICATION_CHANNELS_ENUM.WHATSAPP.value:
+                    _to["phone_number"] = self.target_phone
+        return _to
+
+    def get_courier_message_payload(self) -> dict:
+        """
+            Body of the courier `POST /send` request of this notification, same message as `send`.
+        """
+        return {
+            "message": {
+                "template": NOTIFICATION_TYPE_TEMPLATE_BY_CHANNEL_ENUM[self.type.name].value,
+                "to": self.get_courier_recipient(),
+                "data": {**self.extra_data, "data": json.dumps(self.data)},
+                "routing": {"method": "all", "channels": self.COURIER_ROUTING_CHANNELS},
+            }
+        }
+
     def send(self):
 
-        if any(element in self.channels for element in
-               [NOTIFICATION_CHANNELS_ENUM.EMAIL.value, NOTIFICATION_CHANNELS_ENUM.PUSH.value,
-                NOTIFICATION_CHANNELS_ENUM.SMS.value, NOTIFICATION_CHANNELS_ENUM.WHATSAPP.value]):
+        if self.is_sendable:
 
             client = CourierClient()
             target_template = NOTIFICATION_TYPE_TEMPLATE_BY_CHANNEL_ENUM[self.type.name].value
-            _to = {}
-            for channel in self.channels:
-                match channel:
-                    case NOTIFICATION_CHANNELS_ENUM.EMAIL.value:
-                        _to["email"] = self.target_email
-                    case NOTIFICATION_CHANNELS_ENUM.PUSH.value:
-                        _to["user_id"] = self.target_phone_id
-                    case NOTIFICATION_CHANNELS_ENUM.SMS.value | NOTIFICATION_CHANNELS_ENUM.WHATSAPP.value:
-                        _to["phone_number"] = self.target_phone
 
             message = courier.TemplateMessage(
                 template=target_template,
-                to=_to,
+                to=self.get_courier_recipient(),
                 data={**self.extra_data, "data": json.dumps(self.data)},
-                routing=courier.Routing(method="all", channels=["email", "push", "sms", "inbox"]),
+                routing=courier.Routing(method="all", channels=self.COURIER_ROUTING_CHANNELS),
             )
 
             try:
-                client.send(
-                    message=message
-                )
-            except ApiError as e:
+                OutboundDispatcher.call("courier", client.send, message=message,
+                                        is_retryable=is_retryable_courier_error)
+            except (ApiError, httpx.HTTPError) as e:
                 self.status = NOTIFICATION_STATUS_ENUM.FAILED.value
                 self.save(update_fields=['status'])
         return
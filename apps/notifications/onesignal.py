@@ -1,9 +1,10 @@
 import logging
 
 from django.conf import settings
-from requests import Session
 from rest_framework.status import is_success
 
+from apps.notifications.dispatch import OutboundDispatcher
+
 logger = logging.getLogger(__name__)
 logger.setLevel('INFO')
 
@@ -14,15 +15,17 @@ ONE_SIGNAL_REST_API_KEY = settings.ONE_SIGNAL_REST_API_KEY
 ONE_SIGNAL_NOTIFICATIONS_URL = "https://onesignal.com/api/v1/notifications"
 ONE_SIGNAL_DEVICES_URL = "https://onesignal.com/api/v1/players"
 
-browser = Session()
-browser.verify = False
-browser.headers = {
+ONE_SIGNAL_HEADERS = {
     "Accept": "application/json",
     "Authorization":  f"Basic {ONE_SIGNAL_REST_API_KEY or ''}",  
     "Content-Type": "application/json"
 }
 
 
+def browser(method: str, url: str, **kwargs):
+    return OutboundDispatcher.request("onesignal", method, url, headers=ONE_SIGNAL_HEADERS, **kwargs)
+
+
 class Processor:
     devices_types = {
         "ios": 0, "android": 1, "amazon": 2, "windowsphone": 3, "chrome": 5,
@@ -67,7 +70,7 @@ class Processor:
                 "data": data,
                 "buttons": [{"id": "see", "text": "Voir", "icon": "ic_eye"}, ]
             }
-            response = browser.post(ONE_SIGNAL_NOTIFICATIONS_URL, json=payload)
+            response = browser("POST", ONE_SIGNAL_NOTIFICATIONS_URL, json=payload)
             return Processor.assert_response(response)
 
         def push(self) -> dict:
@@ -90,7 +93,7 @@ class Processor:
                 "big_picture": self.image,
                 "huawei_big_picture": self.image,
             }
-            response = browser.post(ONE_SIGNAL_NOTIFICATIONS_URL, json=payload)
+            response = browser("POST", ONE_SIGNAL_NOTIFICATIONS_URL, json=payload)
             return Processor.assert_response(response)
 
     class Registerer:
@@ -120,7 +123,7 @@ class Processor:
                 "long": self.long,
                 "notification_types": 1
             }
-            response = browser.post(ONE_SIGNAL_DEVICES_URL, json=payload)
+            response = browser("POST", ONE_SIGNAL_DEVICES_URL, json=payload)
             return Processor.assert_response(response)
 
         def edit_device(self, player_id: str):
@@ -136,11 +139,11 @@ class Processor:
                 "lat": self.lat,
                 "long": self.long
             }
-            response = browser.put(
-                f'{ONE_SIGNAL_DEVICES_URL}/{player_id}', json=payload)
+            response = browser(
+                "PUT", f'{ONE_SIGNAL_DEVICES_URL}/{player_id}', json=payload)
             return Processor.assert_response(response)
 
         def delete_device(player_id: str):
-            response = browser.delete(
-                f'{ONE_SIGNAL_DEVICES_URL}/{player_id}', params={"app_id": ONE_SIGNAL_APP_ID})
+            response = browser(
+                "DELETE", f'{ONE_SIGNAL_DEVICES_URL}/{player_id}', params={"app_id": ONE_SIGNAL_APP_ID})
             return Processor.assert_response(response)
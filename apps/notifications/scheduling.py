@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.events.models import Event, FavouriteEvent
+from apps.notifications.models import MobileDevice, Notification, NotificationType
+from apps.utils.services.variables import VariableRegistry
+from apps.utils.utils import replace_english_words
+from apps.xlib.enums import (
+    NOTIFICATION_CHANNELS_ENUM, NOTIFICATION_STATUS_ENUM, NOTIFICATION_TYPES_ENUM, VARIABLE_NAMES_ENUM,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class FavouriteEventReminderPlanner:
+    """
+    Planification des rappels d' approche des évènements favoris.
+
+    Les rappels sont créés PENDING dès la mise en favoris, un par moment de la variable
+    EVENT_APPROACH_NOTIFICATIONS_MOMENTS, avec `scheduled_to_delivery` = début de l' évènement - moment.
+    Ils sont ensuite envoyés à échéance par `dispatch_due_notifications` ou par le worker de livraison.
+    """
+
+    REPLACERS = {
+        "day": "Jour",
+        "days": "Jours",
+        "month": "Mois",
+        "months": "Mois",
+        "year": "Année",
+        "years": "Années",
+    }
+
+    CHUNK_SIZE = 500
+
+    @staticmethod
+    def get_moments() -> list:
+        return sorted(VariableRegistry.get_list(VARIABLE_NAMES_ENUM.EVENT_APPROACH_NOTIFICATIONS_MOMENTS.value, cast=int))
+
+    @classmethod
+    def get_remaining_time(cls, moment: int) -> str:
+        return f"{replace_english_words(cls.REPLACERS, timedelta(seconds=moment).__str__())}"
+
+    @staticmethod
+    def get_event_infos(event, site_base_address) -> dict:
+        from apps.notifications.tasks.notifications_tasks import get_event_image_uri
+
+        return {
+            "eventName": event.name,
+            "eventDate": event.date.strftime('%d/%m/%Y'),
+            "eventTime": event.hour.strftime('%H:%M'),
+            "eventLocation": event.location_name,
+            "eventLink": event.get_dynamic_link(),
+            "image": get_event_image_uri(event.get_cover_image_url, site_base_address),
+        }
+
+    @staticmethod
+    def pending_reminders(event_ids, user_ids=None):
+        reminders = Notification.objects.filter(
+            type__name=NOTIFICATION_TYPES_ENUM.APPROACH_OF_FAVOURED_EVENT.value,
+            status=NOTIFICATION_STATUS_ENUM.PENDING.value,
+            data__entityId__in=[str(pk) for pk in event_ids],
+        )
+        if user_ids is not None:
+            reminders = reminders.filter(user_id__in=user_ids)
+        return reminders
+
+    @classmethod
+    def cancel(cls, event_ids, user_ids=None) -> int:
+        cancelled = cls.pending_reminders(event_ids, user_ids).count()
+        cls.pending_reminders(event_ids, user_ids).delete()
+        return cancelled
+
+    @classmethod
+    def build_reminders(cls, favourites, moments, notification_type, registration_ids, events_infos, now) -> list:
+        reminders = []
+        for favorite_event in favourites:
+            event = favorite_event.event
+            event_infos = events_infos[event.pk]
+
+            _channels = []
+            if favorite_event.receive_news_by_email:
+                _channels.append(NOTIFICATION_CHANNELS_ENUM.EMAIL.value)
+            if favorite_event.user_id in registration_ids:
+                _channels.append(NOTIFICATION_CHANNELS_ENUM.PUSH.value)
+
+            for moment in moments:
+                scheduled_to_delivery = event.start_datetime - timedelta(seconds=moment)
+                if scheduled_to_delivery <= now:
+                    continue
+                remaining_time = cls.get_remaining_time(moment)
+                reminders.append(
+                    Notification(
+                        type=notification_type,
+                        status=NOTIFICATION_STATUS_ENUM.PENDING.value,
+                        scheduled_to_delivery=scheduled_to_delivery,
+                        user=favorite_event.user,
+                        target_phone_id=registration_ids.get(favorite_event.user_id) or "",
+                        channels=_channels,
+                        email=favorite_event.user.email,
+                        message=f"Il reste environ {remaining_time} pour l' évènement {event_infos['eventName']} que vous avez choisi comme favoris",
+                        title="Évènement Favoris en Approche",
+                        data={"entityId": str(event.pk), "remainingTime": remaining_time,
+                              "type": "EVENT",
+                              "logLevel": "info"},
+                        extra_data={
+                            "userName": favorite_event.user.get_full_name(),
+                            "eventName": event_infos["eventName"],
+                            "eventDate": event_infos["eventDate"],
+                            "eventTime": event_infos["eventTime"],
+                            "eventLocation": event_infos["eventLocation"],
+                            "eventLink": event_infos["eventLink"],
+                        },
+                        image=event_infos["image"],
+                    )
+                )
+        return reminders
+
+    @classmethod
+    def plan(cls, favourites_queryset) -> int:
+        """
+            (Re)plan the reminders of the given favourites, their previous pending reminders are replaced.
+        :return: the number of planned reminders
+        """
+        from apps.notifications.tasks.notifications_tasks import get_site_base_address
+
+        now = timezone.now()
+        moments = cls.get_moments()
+        notification_type = NotificationType.get_by_name(
+            name=NOTIFICATION_TYPES_ENUM.APPROACH_OF_FAVOURED_EVENT.value
+        )
+        site_base_address = get_site_base_address()
+
+        favourites_queryset = favourites_queryset.filter(
+            event__valid=True, event__active=True, event__start_datetime__gt=now,
+        ).select_related("event", "user").order_by("pk")
+
+        planned = 0
+        events_infos = {}
+        favourites = []
+        for favorite_event in favourites_queryset.iterator(chunk_size=cls.CHUNK_SIZE):
+            favourites.append(favorite_event)
+            if len(favourites) == cls.CHUNK_SIZE:
+                planned += cls._plan_chunk(favourites, moments, notification_type, site_base_address, events_infos, now)
+                favourites = []
+        if favourites:
+            planned += cls._plan_chunk(favourites, moments, notification_type, site_base_address, events_infos, now)
+        return planned
+
+    @classmethod
+    def _plan_chunk(cls, favourites, moments, notification_type, site_base_address, events_infos, now) -> int:
+        # Dynamic link and image uri are resolved once per event
+        for favorite_event in favourites:
+            if favorite_event.event_id not in events_infos:
+                events_infos[favorite_event.event_id] = cls.get_event_infos(favorite_event.event, site_base_address)
+
+        # One device per user, fetched in one query
+        users_ids = {favorite_event.user_id for favorite_event in favourites}
+        registration_ids = {}
+        for user_id, registration_id in MobileDevice.objects.filter(user_id__in=users_ids).order_by(
+                "pk").values_list("user_id", "registration_id"):
+            registration_ids.setdefault(user_id, registration_id)
+
+        reminders = cls.build_reminders(favourites, moments, notification_type, registration_ids, events_infos, now)
+        # Previous pending reminders of exactly these ( event, user ) couples, in one query
+        couples = Q()
+        for favorite_event in favourites:
+            couples |= Q(data__entityId=str(favorite_event.event_id), user_id=favorite_event.user_id)
+        with transaction.atomic():
+            cls.pending_reminders({favorite_event.event_id for favorite_event in favourites}).filter(couples).delete()
+            Notification.objects.bulk_create(reminders, batch_size=cls.CHUNK_SIZE)
+        return len(reminders)
+
+    @classmethod
+    def plan_favourite(cls, favourite_id) -> int:
+        return cls.plan(FavouriteEvent.objects.filter(pk=favourite_id))
+
+    @classmethod
+    def replan_event(cls, event_id) -> int:
+        """
+            Replace the pending reminders of an event, after a change of its start or of its validity.
+        """
+        with transaction.atomic():
+            cls.cancel([event_id])
+            return cls.plan(FavouriteEvent.objects.filter(event_id=event_id))
+
+    @classmethod
+    def plan_upcoming(cls) -> int:
+        """
+            Plan the reminders of every favourite of the upcoming events ( initial backfill ).
+        """
+        upcoming_events = Event.objects.filter(valid=True, active=True, start_datetime__gt=timezone.now())
+        return cls.plan(FavouriteEvent.objects.filter(event__in=upcoming_events))
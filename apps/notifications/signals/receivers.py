@@ -1,15 +1,42 @@
 import json
 
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from apps.events.models import Event, FavouriteEvent
 from apps.notifications.signals.initializers import send_email_signal
-from apps.notifications.tasks import send_in_app_email_task
+from apps.notifications.tasks import send_in_app_email_task, notifications_tasks
 
 
 @receiver(send_email_signal)
 def process_email(sender, instance, email_data: dict, *args, **kwargs):
     send_in_app_email_task.delay(json.dumps(email_data))
 
+
+@receiver(post_save, sender=FavouriteEvent)
+def plan_favourite_event_reminders(sender, instance: FavouriteEvent, **kwargs):
+    if instance.is_deleted:
+        transaction.on_commit(lambda: notifications_tasks.cancel_favourite_event_reminders.delay(
+            str(instance.event_id), str(instance.user_id)))
+    else:
+        transaction.on_commit(lambda: notifications_tasks.plan_favourite_event_reminders.delay(str(instance.pk)))
+
+
+@receiver(post_delete, sender=FavouriteEvent)
+def cancel_favourite_event_reminders(sender, instance: FavouriteEvent, **kwargs):
+    transaction.on_commit(lambda: notifications_tasks.cancel_favourite_event_reminders.delay(
+        str(instance.event_id), str(instance.user_id)))
+
+
+@receiver(post_save, sender=Event)
+def replan_event_reminders(sender, instance: Event, created: bool, **kwargs):
+    # The reminders follow the start of the event and its publication
+    if not created and any(
+            instance.tracker.has_changed(field) for field in ("start_datetime", "valid", "active", "is_deleted")
+    ):
+        transaction.on_commit(lambda: notifications_tasks.replan_event_reminders.delay(str(instance.pk)))
+
 #
 # @receiver(post_save, sender=MobileDevice)
 # def handle_one_signal_devices(sender, instance, created, **kwargs):
@@ -2,12 +2,16 @@ from .notifications_tasks import *
 
 __all__ = [
     'send_in_app_email_task',
+    'send_notifications_chunk',
     'create_notification_for_those_that_near_by',
     'create_notification_for_those_that_favoured_this_type_of_event',
     'create_notification_for_zoi_containing_event_location',
     'create_notification_for_poi_near_by_event_location',
     'create_notification_for_event_publisher_followers',
-    'notify_users_about_the_approach_of_favourite_event',
+    'dispatch_due_notifications',
+    'plan_favourite_event_reminders',
+    'cancel_favourite_event_reminders',
+    'replan_event_reminders',
     'notify_user_about_transaction_issue',
     'notify_users_about_end_of_order_processing',
 ]
@@ -6,19 +6,20 @@ Created on August 17, 2022
     Wesley Eliel MONTCHO, alias DevBackend7
 """
 
-import itertools
 import json
 import time
 from datetime import timedelta
 
 from celery import shared_task
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from django.db import transaction
-from django.db.models import F, IntegerField
-from django.db.models.functions import Cast
+from django.db.models import F, Q
+from django.utils import timezone
 
-from apps.events.models import FavouriteEvent, FavouriteEventType, Event, Order, EventHighlighting
+from apps.events.models import FavouriteEventType, Event, Order, EventHighlighting
 from apps.events.utils.orders import send_e_tickets_email_for_order
+from apps.notifications.managers import send_notifications
 from apps.notifications.models import (
     MobileDevice,
     NotificationType,
@@ -26,33 +27,99 @@ from apps.notifications.models import (
     SubscriptionToNotificationType,
 )
 from apps.notifications.onesignal import Processor
+from apps.notifications.scheduling import FavouriteEventReminderPlanner
 from apps.organizations.models import Withdraw, Subscription, OrganizationMembership
 from apps.users.business_logics.users import get_app_admins
 from apps.users.models import User, ZoneOfInterest, PointOfInterest, Transaction
-from apps.utils.models import Variable
-from apps.utils.utils import replace_english_words
-from apps.xlib.enums import NOTIFICATION_TYPES_ENUM, NOTIFICATION_CHANNELS_ENUM, VARIABLE_NAMES_ENUM
+from apps.utils.models import VariableValue
+from apps.utils.services.variables import VariableRegistry
+from apps.xlib.enums import NOTIFICATION_TYPES_ENUM, NOTIFICATION_CHANNELS_ENUM, NOTIFICATION_STATUS_ENUM, \
+    VARIABLE_NAMES_ENUM
 
 logger = get_task_logger(__name__)
 
 
-def get_event_image_uri(ressource_url):
-    site_variable = Variable.objects.get(
-        name=VARIABLE_NAMES_ENUM.CURRENT_SITE_BASE_ADDRESS.value
-    )
-    image_url = "https://i.ibb.co/pdzKtq4/Wulo-Events-Logo.png"
+def get_site_base_address():
     try:
-        site_variable_value = site_variable.format_value(
-            site_variable.possible_values.first().value
-        )
-        if ressource_url:
-            image_url = f"{site_variable_value}{ressource_url}"
-    except Exception as exc:
+        return VariableRegistry.get(VARIABLE_NAMES_ENUM.CURRENT_SITE_BASE_ADDRESS.value)
+    except VariableValue.DoesNotExist as exc:
         logger.info(exc)
-        pass
+    return None
+
+
+def get_event_image_uri(ressource_url, site_base_address=None):
+    """
+    :param ressource_url:
+    :param site_base_address: already resolved site base address, looked up when not given
+    """
+    image_url = "https://i.ibb.co/pdzKtq4/Wulo-Events-Logo.png"
+    site_variable_value = site_base_address or get_site_base_address()
+    if site_variable_value and ressource_url:
+        image_url = f"{site_variable_value}{ressource_url}"
     return image_url
 
 
+FAN_OUT_CHUNK_SIZE = 500
+
+# Rayon de la notification des appareils proches d' un nouvel évènement
+NEAR_BY_RADIUS_M = 7000
+
+
+def fan_out_notifications(devices, notification_type, **template):
+    """
+    Stream the recipients devices through a server side cursor and dispatch them by fixed size chunks
+    to `send_notifications_chunk` subtasks, so that the memory stays flat whatever the audience size.
+
+    :param devices: MobileDevice queryset of the recipients
+    :param notification_type: NotificationType of the notifications
+    :param template: Notification fields shared by all the recipients ( json serializable )
+    :return: the number of dispatched recipients
+    """
+    dispatched = 0
+    chunk = []
+    rows = devices.values_list("user_id", "registration_id", "user__email")
+    for user_id, registration_id, email in rows.iterator(chunk_size=FAN_OUT_CHUNK_SIZE):
+        chunk.append((str(user_id) if user_id else None, registration_id or "", email or ""))
+        if len(chunk) >= FAN_OUT_CHUNK_SIZE:
+            send_notifications_chunk.delay(str(notification_type.pk), chunk, template)
+            dispatched += len(chunk)
+            chunk = []
+    if chunk:
+        send_notifications_chunk.delay(str(notification_type.pk), chunk, template)
+        dispatched += len(chunk)
+    logger.info(f"{dispatched} {notification_type.name} notifications dispatched")
+    return dispatched
+
+
+@shared_task()
+def send_notifications_chunk(notification_type_id, recipients, template):
+    """
+    Insert and send the notifications of one fan-out chunk.
+
+    :param notification_type_id:
+    :param recipients: list of ( user_id, registration_id, email )
+    :param template: Notification fields shared by all the recipients
+    """
+    notification_type = NotificationType.objects.get(pk=notification_type_id)
+    # In async delivery mode, the notifications are left PENDING to the delivery workers
+    async_delivery = settings.NOTIFICATIONS_DELIVERY_MODE == "async"
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            type=notification_type,
+            user_id=user_id,
+            target_phone_id=registration_id,
+            email=email,
+            **({"status": NOTIFICATION_STATUS_ENUM.PENDING.value} if async_delivery else {}),
+            **template,
+        ) for user_id, registration_id, email in recipients
+    ])
+    if async_delivery:
+        logger.info(f"{len(notifications)} {notification_type.name} notifications queued for delivery")
+        return
+    result = send_notifications(notifications)
+    logger.info(f"Notifications chunk of {notification_type.name}: {result['sent']} sent, {result['failed']} failed")
+
+
 @shared_task()
 def send_in_app_email_task(data):
     """
@@ -128,62 +195,45 @@ def send_in_app_email_task(data):
 # Implementation OK
 @shared_task()
 def create_notification_for_those_that_near_by(event_id):
-    with transaction.atomic():
-        event = Event.objects.get(pk=event_id)
-        devices_near_by = (
-            MobileDevice.objects.annotate_spherical_distance(
-                ("current_location_lat", "current_location_long"),
-                (event.location_lat, event.location_long),
-            ).select_related("user").distinct('user')
-            # .filter(
-            #     ~Q(
-            #         notifications_history__notification__data__eventId=event_id,
-            #         notifications_history__timestamp__gte=datetime.now() - timedelta(hours=1),
-            #     ),
-            #     spherical_distance__lte=7,
-            # ).distinct()
-        )
-        if not devices_near_by.exists():
-            return False
+    event = Event.objects.get(pk=event_id)
+    devices_near_by = MobileDevice.objects.filter_near_by(
+        "current_location_geography",
+        ("current_location_lat", "current_location_long"),
+        (event.location_lat, event.location_long),
+        NEAR_BY_RADIUS_M,
+    ).distinct('user')
 
-        notification_type = NotificationType.get_by_name(
-            name=NOTIFICATION_TYPES_ENUM.EVENT_NEAR_BY_USER_LAST_LOCATION.value
-        )
-        subscription_to_this_notification_type_users_ids = (
-            SubscriptionToNotificationType.objects.filter(
-                notification_type=notification_type
-            ).values_list("user_id", flat=True)
-        )
-        user_not_subscribed_to_notification_type = User.objects.exclude(
-            id__in=subscription_to_this_notification_type_users_ids
-        ).values_list("pk", flat=True)
-        devices_near_by = devices_near_by.exclude(
-            user_id__in=user_not_subscribed_to_notification_type
-        )
-        if len(devices_near_by) > 0:
-            # Todo: Create related courier template
-            notifications = Notification.bulk_insert([
-                Notification(
-                    user=device.user,
-                    type=notification_type,
-                    target_phone_id=device.registration_id,
-                    channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value],
-                    message="Cet évènement aura lieu près de vous. Veuillez Vérifier !",
-                    title=f"{event.name} nouvellement publié",
-                    data={"entityId": event_id, "entityLink": event.get_dynamic_link(), "type": "EVENT",
-                          "logLevel": "info"},
-                    extra_data={
-                        "eventName": event.name,
-                        "eventDate": event.date.strftime('%d/%m/%Y'),
-                        "eventTime": event.hour.strftime('%H:%M'),
-                        "eventLocation": event.location_name,
-                        "eventLink": event.get_dynamic_link(),
-                    },
-                    image=get_event_image_uri(event.get_cover_image_url),
+    notification_type = NotificationType.get_by_name(
+        name=NOTIFICATION_TYPES_ENUM.EVENT_NEAR_BY_USER_LAST_LOCATION.value
+    )
+    subscription_to_this_notification_type_users_ids = (
+        SubscriptionToNotificationType.objects.filter(
+            notification_type=notification_type
+        ).values_list("user_id", flat=True)
+    )
+    devices_near_by = devices_near_by.filter(
+        Q(user__isnull=True) | Q(user_id__in=subscription_to_this_notification_type_users_ids)
+    )
 
-                ) for device in devices_near_by]
-            )
-            notifications.bulk_send()
+    # Todo: Create related courier template
+    event_link = event.get_dynamic_link()
+    return fan_out_notifications(
+        devices_near_by,
+        notification_type,
+        channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value],
+        message="Cet évènement aura lieu près de vous. Veuillez Vérifier !",
+        title=f"{event.name} nouvellement publié",
+        data={"entityId": event_id, "entityLink": event_link, "type": "EVENT",
+              "logLevel": "info"},
+        extra_data={
+            "eventName": event.name,
+            "eventDate": event.date.strftime('%d/%m/%Y'),
+            "eventTime": event.hour.strftime('%H:%M'),
+            "eventLocation": event.location_name,
+            "eventLink": event_link,
+        },
+        image=get_event_image_uri(event.get_cover_image_url),
+    )
 
 
 # Todo: test
@@ -232,149 +282,118 @@ def create_notification_for_admins_about_event_creation(event_id):
 # Implementation OK
 @shared_task()
 def create_notification_for_those_that_favoured_this_type_of_event(event_id):
-    with transaction.atomic():
-        event = Event.objects.get(pk=event_id)
-        users_ids = FavouriteEventType.objects.filter(event_type=event.type).values_list(
-            "user_id", flat=True
-        )
-
-        if len(users_ids) < 0:
-            return False
+    event = Event.objects.select_related("type").get(pk=event_id)
+    users_ids = FavouriteEventType.objects.filter(event_type=event.type).values_list(
+        "user_id", flat=True
+    )
 
-        related_devices = MobileDevice.objects.select_related("user").filter(
-            # ~Q(
-            #     notifications_history__notification__data__eventId=event_id,
-            #     notifications_history__timestamp__gte=datetime.now() - timedelta(hours=1),
-            # ),
-            user_id__in=users_ids,
-        )
-        notification_type = NotificationType.get_by_name(
-            name=NOTIFICATION_TYPES_ENUM.NEW_EVENT_CREATION_IN_FAVORED_CATEGORY.value
-        )
-        subscription_to_this_notification_type_users_ids = (
-            SubscriptionToNotificationType.objects.filter(
-                notification_type=notification_type
-            ).values_list("user_id", flat=True)
-        )
-        user_not_subscribed_to_notification_type = User.objects.exclude(
-            id__in=subscription_to_this_notification_type_users_ids
-        ).values_list("pk", flat=True)
+    related_devices = MobileDevice.objects.filter(
+        # ~Q(
+        #     notifications_history__notification__data__eventId=event_id,
+        #     notifications_history__timestamp__gte=datetime.now() - timedelta(hours=1),
+        # ),
+        user_id__in=users_ids,
+    )
+    notification_type = NotificationType.get_by_name(
+        name=NOTIFICATION_TYPES_ENUM.NEW_EVENT_CREATION_IN_FAVORED_CATEGORY.value
+    )
+    subscription_to_this_notification_type_users_ids = (
+        SubscriptionToNotificationType.objects.filter(
+            notification_type=notification_type
+        ).values_list("user_id", flat=True)
+    )
+    user_not_subscribed_to_notification_type = User.objects.exclude(
+        id__in=subscription_to_this_notification_type_users_ids
+    ).values_list("pk", flat=True)
 
-        related_devices = related_devices.filter(
-            user_id__in=user_not_subscribed_to_notification_type
-        )
-        if len(related_devices) > 0:
-            notifications = Notification.bulk_insert(
-                [
-                    Notification(
-                        user=device.user,
-                        type=notification_type,
-                        target_phone_id=device.registration_id,
-                        email=device.user.email,
-                        channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value, NOTIFICATION_CHANNELS_ENUM.INBOX.value],
-                        message=f'Un évènement a été publié dans la catégorie "{event.type.name}"'
-                                f' que vous avez choisi comme favori. Veuillez Vérifier !',
-                        title=f"{event.name} nouvellement publié",
-                        data={"entityId": event_id, "entityLink": event.get_dynamic_link(), "type": "EVENT",
-                              "logLevel": "info"},
-                        extra_data={
-                            "eventImage": get_event_image_uri(event.get_cover_image_url),
-                            "categoryName": event.type.name,
-                            "eventLink": event.get_dynamic_link(),
-                        },
-                        image=get_event_image_uri(event.get_cover_image_url),
-                    ) for device in related_devices
-                ]
-            )
-            notifications.bulk_send()
+    related_devices = related_devices.filter(
+        user_id__in=user_not_subscribed_to_notification_type
+    )
+    event_link = event.get_dynamic_link()
+    event_image = get_event_image_uri(event.get_cover_image_url)
+    return fan_out_notifications(
+        related_devices,
+        notification_type,
+        channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value, NOTIFICATION_CHANNELS_ENUM.INBOX.value],
+        message=f'Un évènement a été publié dans la catégorie "{event.type.name}"'
+                f' que vous avez choisi comme favori. Veuillez Vérifier !',
+        title=f"{event.name} nouvellement publié",
+        data={"entityId": event_id, "entityLink": event_link, "type": "EVENT",
+              "logLevel": "info"},
+        extra_data={
+            "eventImage": event_image,
+            "categoryName": event.type.name,
+            "eventLink": event_link,
+        },
+        image=event_image,
+    )
 
 
 @shared_task()
 def create_notification_for_zoi_containing_event_location(event_id):
-    with transaction.atomic():
-        time.sleep(10)
-        event = Event.objects.get(pk=event_id)
-        users_ids = ZoneOfInterest.objects.filter(
-            geofence__contains=event.location
-        ).values_list("user_id", flat=True)
-
-        if len(users_ids) < 0:
-            return False
-
-        related_devices = MobileDevice.objects.select_related("user").filter(
-            # ~Q(
-            #     notifications_history__notification__data__eventId=event_id,
-            #     notifications_history__timestamp__gte=datetime.now() - timedelta(hours=1),
-            # ),
-            user_id__in=users_ids,
-        )
-        if len(related_devices) > 0:
-            notification_type = NotificationType.get_by_name(
-                name=NOTIFICATION_TYPES_ENUM.EVENT_LOCATION_INSIDE_ZONE_OF_INTEREST.value
-            )
-            notifications = Notification.bulk_insert(
-                [
-                    Notification(
-                        user=device.user,
-                        target_phone_id=device.registration_id,
-                        email=device.user.email,
-                        channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value, NOTIFICATION_CHANNELS_ENUM.INBOX.value],
-                        type=notification_type,
-                        message="Un évènement aura lieu près d' une zone d' intérêt que vous "
-                                "avez créé. Veuillez Vérifier !",
-                        title="Nouvel Évènement Publié",
-                        data={"entityId": event_id, "entityLink": event.get_dynamic_link(), "type": "EVENT",
-                              "logLevel": "info"},
-                        image=get_event_image_uri(event.get_cover_image_url)
-                    ) for device in related_devices]
-            )
-            notifications.bulk_send()
+    time.sleep(10)
+    event = Event.objects.get(pk=event_id)
+    users_ids = ZoneOfInterest.objects.filter(
+        geofence__contains=event.location
+    ).values_list("user_id", flat=True)
+
+    related_devices = MobileDevice.objects.filter(
+        # ~Q(
+        #     notifications_history__notification__data__eventId=event_id,
+        #     notifications_history__timestamp__gte=datetime.now() - timedelta(hours=1),
+        # ),
+        user_id__in=users_ids,
+    )
+    notification_type = NotificationType.get_by_name(
+        name=NOTIFICATION_TYPES_ENUM.EVENT_LOCATION_INSIDE_ZONE_OF_INTEREST.value
+    )
+    return fan_out_notifications(
+        related_devices,
+        notification_type,
+        channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value, NOTIFICATION_CHANNELS_ENUM.INBOX.value],
+        message="Un évènement aura lieu près d' une zone d' intérêt que vous "
+                "avez créé. Veuillez Vérifier !",
+        title="Nouvel Évènement Publié",
+        data={"entityId": event_id, "entityLink": event.get_dynamic_link(), "type": "EVENT",
+              "logLevel": "info"},
+        extra_data={},
+        image=get_event_image_uri(event.get_cover_image_url),
+    )
 
 
 @shared_task()
 def create_notification_for_poi_near_by_event_location(event_id):
-    with transaction.atomic():
-        event = Event.objects.get(pk=event_id)
-        users_ids = (
-            PointOfInterest.objects.annotate_spherical_distance(
-                ("location_lat", "location_long"), (event.location_lat, event.location_long)
-            )
-            .filter(spherical_distance__lte=F("approximate_distance"))
-            .values_list("user_id", flat=True)
-        )
-
-        if len(users_ids) < 0:
-            return False
-
-        related_devices = MobileDevice.objects.select_related("user").filter(
-            # ~Q(
-            #     notifications_history__notification__data__eventId=event_id,
-            #     notifications_history__timestamp__gte=datetime.now() - timedelta(hours=1),
-            # ),
-            user_id__in=users_ids,
-        )
-        if len(related_devices) > 0:
-            notification_type = NotificationType.get_by_name(
-                name=NOTIFICATION_TYPES_ENUM.EVENT_LOCATION_NEAR_BY_USER_POI.value
-            )
-            notifications = Notification.bulk_insert(
-                [
-                    Notification(
-                        user=device.user,
-                        target_phone_id=device.registration_id,
-                        email=device.user.email,
-                        channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value, NOTIFICATION_CHANNELS_ENUM.INBOX.value],
-                        type=notification_type,
-                        title=f"{event.name} nouvellement publié.",
-                        message="Cet évènement aura lieu près d' un point d' intérêt que vous "
-                                "avez choisi. Veuillez Vérifier !",
-                        data={"entityId": event_id, "entityLink": event.get_dynamic_link(), "type": "EVENT",
-                              "logLevel": "info"},
-                        image=get_event_image_uri(event.get_cover_image_url))
-                    for device in related_devices
-                ]
-            )
-            notifications.bulk_send()
+    event = Event.objects.get(pk=event_id)
+    # `approximate_distance` is the radius of each point of interest, in meters
+    users_ids = PointOfInterest.objects.filter_near_by(
+        "location_geography",
+        ("location_lat", "location_long"),
+        (event.location_lat, event.location_long),
+        F("approximate_distance"),
+    ).values_list("user_id", flat=True)
+
+    related_devices = MobileDevice.objects.filter(
+        # ~Q(
+        #     notifications_history__notification__data__eventId=event_id,
+        #     notifications_history__timestamp__gte=datetime.now() - timedelta(hours=1),
+        # ),
+        user_id__in=users_ids,
+    )
+    notification_type = NotificationType.get_by_name(
+        name=NOTIFICATION_TYPES_ENUM.EVENT_LOCATION_NEAR_BY_USER_POI.value
+    )
+    return fan_out_notifications(
+        related_devices,
+        notification_type,
+        channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value, NOTIFICATION_CHANNELS_ENUM.INBOX.value],
+        title=f"{event.name} nouvellement publié.",
+        message="Cet évènement aura lieu près d' un point d' intérêt que vous "
+                "avez choisi. Veuillez Vérifier !",
+        data={"entityId": event_id, "entityLink": event.get_dynamic_link(), "type": "EVENT",
+              "logLevel": "info"},
+        extra_data={},
+        image=get_event_image_uri(event.get_cover_image_url),
+    )
 
 
 @shared_task()
@@ -426,43 +445,29 @@ def create_notification_for_event_publisher_about_event_validation(event_id):
 # Implementation
 @shared_task()
 def create_notification_for_event_publisher_followers(event_id):
-    with transaction.atomic():
-        event = Event.objects.get(pk=event_id)
-        users_ids = event.organization.users_followings_me.values_list(
-            "follower", flat=True
-        )
-        if len(users_ids) < 0:
-            return False
-        related_devices = MobileDevice.objects.filter(
-            user_id__in=users_ids,
-        )
-        if len(related_devices) > 0:
-            notification_type = NotificationType.get_by_name(
-                name=NOTIFICATION_TYPES_ENUM.FOLLOWED_EVENT_PUBLISHER.value
-            )
-
-            notifications = Notification.bulk_insert(
-                [
-                    Notification(
-                        user=device.user,
-                        target_phone_id=device.registration_id,
-                        email=device.user.email,
-                        type=notification_type,
-                        # channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value, NOTIFICATION_CHANNELS_ENUM.INBOX.value],
-                        channels=[NOTIFICATION_CHANNELS_ENUM.INBOX.value],
-                        message=f"L' Organisation {event.organization.name} que vous suivez vient de publier un "
-                                "évènement. Veuillez Vérifier !",
-                        title=f"{event.name} nouvellement publié",
-                        data={"entityId": event_id, "entityLink": event.get_dynamic_link(), "type": "EVENT",
-                              "logLevel": "info"},
-                        extra_data={
-
-                        },
-                        image=get_event_image_uri(event.get_cover_image_url))
-                    for device in related_devices
-                ]
-            )
-            notifications.bulk_send()
+    event = Event.objects.select_related("organization").get(pk=event_id)
+    users_ids = event.organization.users_followings_me.values_list(
+        "follower", flat=True
+    )
+    related_devices = MobileDevice.objects.filter(
+        user_id__in=users_ids,
+    )
+    notification_type = NotificationType.get_by_name(
+        name=NOTIFICATION_TYPES_ENUM.FOLLOWED_EVENT_PUBLISHER.value
+    )
+    return fan_out_notifications(
+        related_devices,
+        notification_type,
+        # channels=[NOTIFICATION_CHANNELS_ENUM.PUSH.value, NOTIFICATION_CHANNELS_ENUM.INBOX.value],
+        channels=[NOTIFICATION_CHANNELS_ENUM.INBOX.value],
+        message=f"L' Organisation {event.organization.name} que vous suivez vient de publier un "
+                "évènement. Veuillez Vérifier !",
+        title=f"{event.name} nouvellement publié",
+        data={"entityId": event_id, "entityLink": event.get_dynamic_link(), "type": "EVENT",
+              "logLevel": "info"},
+        extra_data={},
+        image=get_event_image_uri(event.get_cover_image_url),
+    )
 
 
 # Implementation OK
@@ -563,106 +568,47 @@ def notify_users_about_nearly_sold_out_of_ticket_event(event_id, ticket_name, pe
         logger.info("\n Finished Notifications About Nearly Sold Out of Ticket \n")
 
 
-# Implementation OK
-@shared_task()
-def notify_users_about_the_approach_of_favourite_event():
-    with transaction.atomic():
-        # Todo: Review the usage of time before start logic here
-        events = Event.objects.filter(time_before_start__gte=0)
-
-        event_approach_notification_moments_variable = Variable.objects.get(
-            name=VARIABLE_NAMES_ENUM.EVENT_APPROACH_NOTIFICATIONS_MOMENTS.value
-        )
-        # event_approach_notification_moments_variable_values_as_list  ====== eanmvval
-        eanmvval = list(
-            event_approach_notification_moments_variable.possible_values.annotate(
-                value_as_int=Cast("value", IntegerField())
-            )
-            .order_by("value_as_int")
-            .values_list("value_as_int", flat=True)
-        )
-        eanmvval_preceded_by_zero = eanmvval.copy()
-        eanmvval_preceded_by_zero[:0] = [0]
-        intervals = list(itertools.zip_longest(eanmvval_preceded_by_zero, eanmvval))[:-1]
-        replacers = {
-            "day": "Jour",
-            "days": "Jours",
-            "month": "Mois",
-            "months": "Mois",
-            "year": "Année",
-            "years": "Années",
-        }
+DUE_NOTIFICATIONS_BATCH_SIZE = 500
+DUE_NOTIFICATIONS_MAX_BATCHES = 20
 
-        logger.info("\n Begin Notifications About Favourite Event Task \n")
 
-        notifications_list = []
-
-        for interval in intervals:
+@shared_task()
+def dispatch_due_notifications():
+    """
+    Send the PENDING notifications whose delivery time has come, by claimed batches ( SKIP LOCKED ), so that
+    several workers can run it at the same time. In async delivery mode, the delivery workers do it.
+    """
+    if settings.NOTIFICATIONS_DELIVERY_MODE == "async":
+        return
+    for _ in range(DUE_NOTIFICATIONS_MAX_BATCHES):
+        notifications = Notification.objects.claim_due(DUE_NOTIFICATIONS_BATCH_SIZE)
+        if not notifications:
+            break
+        result = send_notifications(notifications)
+        # Failed ones are already marked FAILED by send_notifications
+        Notification.objects.filter(
+            pk__in=[notification.pk for notification in notifications],
+            status=NOTIFICATION_STATUS_ENUM.SENDING.value,
+        ).update(status=NOTIFICATION_STATUS_ENUM.SUCCESS.value)
+        logger.info(f"Due notifications: {result['sent']} sent, {result['failed']} failed")
 
-            events_in_interval = events.filter(
-                valid=True,
-                active=True,
-                time_before_start__gte=interval[0],
-                time_before_start__lte=interval[1],
-            )
 
-            related_favourite_events = FavouriteEvent.objects.select_related("user").select_related("event").filter(
-                event__pk__in=list(events_in_interval.values_list("pk", flat=True))
-            )
+@shared_task()
+def plan_favourite_event_reminders(favourite_event_id):
+    planned = FavouriteEventReminderPlanner.plan_favourite(favourite_event_id)
+    logger.info(f"{planned} reminders planned for favourite {favourite_event_id}")
 
-            for favorite_event in related_favourite_events:
-                remaining_time = f"{replace_english_words(replacers, timedelta(seconds=interval[1]).__str__())}"
-                mobile_device = MobileDevice.objects.filter(user__pk=favorite_event.user_id).first()
 
-                notification_type = NotificationType.get_by_name(
-                    name=NOTIFICATION_TYPES_ENUM.APPROACH_OF_FAVOURED_EVENT.value
-                )
+@shared_task()
+def cancel_favourite_event_reminders(event_id, user_id):
+    cancelled = FavouriteEventReminderPlanner.cancel([event_id], [user_id])
+    logger.info(f"{cancelled} reminders cancelled for event {event_id} and user {user_id}")
 
-                if not Notification.objects.filter(
-                        type=notification_type,
-                        data__entityId=str(favorite_event.event_id),
-                        data__remainingTime=remaining_time,
-                        user_id=favorite_event.user_id
-                ).only('pk').exists():
-                    _channels = []
-                    if favorite_event.receive_news_by_email:
-                        _channels.append(NOTIFICATION_CHANNELS_ENUM.EMAIL.value)
-
-                    if mobile_device:
-                        _channels.append(NOTIFICATION_CHANNELS_ENUM.PUSH.value)
-                    # Todo: x
-
-                    notifications_list.append(
-                        Notification(
-                            type=notification_type,
-                            user=favorite_event.user,
-                            target_phone_id=mobile_device.registration_id if mobile_device else "",
-                            channels=_channels,
-                            email=favorite_event.user.email,
-                            message=f"Il reste environ {remaining_time} pour l' évènement {favorite_event.event.name} que vous avez choisi comme favoris",
-                            title="Évènement Favoris en Approche",
-                            data={"entityId": str(favorite_event.event_id), "remainingTime": remaining_time,
-                                  "type": "EVENT",
-                                  "logLevel": "info"},
-                            # Todo: add precision about the remaining time before event starts ( On the template also )
-                            extra_data={
-                                "userName": favorite_event.user.get_full_name(),
-                                "eventName": favorite_event.event.name,
-                                "eventDate": favorite_event.event.date.strftime('%d/%m/%Y'),
-                                "eventTime": favorite_event.event.hour.strftime('%H:%M'),
-                                "eventLocation": favorite_event.event.location_name,
-                                "eventLink": favorite_event.event.get_dynamic_link(),
-                            },
-                            image=get_event_image_uri(favorite_event.event.get_cover_image_url),
-                        )
-                    )
-        if len(notifications_list) > 0:
-            notifications = Notification.bulk_insert(
-                notifications_list
-            )
-            notifications.bulk_send()
 
-        logger.info("\n Finished Notifications About Event Tas \n")
+@shared_task()
+def replan_event_reminders(event_id):
+    planned = FavouriteEventReminderPlanner.replan_event(event_id)
+    logger.info(f"{planned} reminders planned again for event {event_id}")
 
 
 @shared_task()
@@ -8,5 +8,7 @@ class CourierClient(Courier, metaclass=Singleton):
 
     def __init__(self):
         super(CourierClient, self).__init__(
-            authorization_token=settings.COURIER_AUTH_TOKEN
+            authorization_token=settings.COURIER_AUTH_TOKEN,
+            # Le client httpx du singleton garde son pool de connexions pour tout le processus
+            timeout=getattr(settings, "COURIER_TIMEOUT", 30),
         )
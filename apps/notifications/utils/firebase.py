@@ -6,9 +6,9 @@ Created on August 20 2024
     Wesley Eliel MONTCHO, alias DevBackend7
 """
 
-import requests
 from django.conf import settings
 
+from apps.notifications.dispatch import OutboundDispatcher
 from helpers.singleton import Singleton
 
 
@@ -43,7 +43,7 @@ class FirebaseDynamicLinkGenerator(metaclass=Singleton):
         }
 
         ## request firebase dynamic link
-        response = requests.post(self.api_url, json=payload)
+        response = OutboundDispatcher.request("firebase", "POST", self.api_url, json=payload)
 
         data = response.json()
 
@@ -10,7 +10,8 @@ from django.contrib import admin
 
 # Register your models here.
 from apps.organizations.models import Role, Organization, OrganizationFinancialAccount, OrganizationMembership, \
-    OrganizationFollow, Subscription, SubscriptionType, Withdraw
+    OrganizationFollow, Subscription, SubscriptionType, Withdraw, OrganizationSalesRollup, FinancialAccountEntry, \
+    FinancialAccountShard
 from commons.admin import BaseModelAdmin
 
 
@@ -39,6 +40,21 @@ class OrganizationFinancialAccountAdmin(BaseModelAdmin):
     pass
 
 
+@admin.register(FinancialAccountEntry)
+class FinancialAccountEntryAdmin(BaseModelAdmin):
+    list_filter = ('kind', 'account')
+
+
+@admin.register(FinancialAccountShard)
+class FinancialAccountShardAdmin(BaseModelAdmin):
+    pass
+
+
+@admin.register(OrganizationSalesRollup)
+class OrganizationSalesRollupAdmin(BaseModelAdmin):
+    list_filter = ('organization', 'day')
+
+
 @admin.register(OrganizationMembership)
 class OrganizationMembershipAdmin(BaseModelAdmin):
     list_filter = ('organization', 'organization__owner')
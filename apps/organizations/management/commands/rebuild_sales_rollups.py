@@ -0,0 +1,29 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.organizations.models import OrganizationSalesRollup
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = """
+    Rebuild the organizations sales rollups from the finished orders
+    cmd_sample:
+        pym rebuild_sales_rollups
+        pym rebuild_sales_rollups --organization <organization_pk>
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--organization", type=str, default=None)
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, **options):
+        self.stdout.write(self.style.SUCCESS("\n \n Start rebuilding ... \n \n "))
+
+        rebuilt = OrganizationSalesRollup.rebuild(
+            organization_id=options["organization"], chunk_size=options["chunk_size"]
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"\n \n {rebuilt} sales rollups successfully rebuilt. \n \n "))
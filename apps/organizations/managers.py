@@ -8,18 +8,13 @@ Created on April 26 2022
 
 import logging
 
-from django.db import connection
-from django.db.models import Q
+from django.db.models import Max, OuterRef, Q, Subquery
 from django_softdelete.models import SoftDeleteManager
 
 logger = logging.getLogger(__name__)
 logger.setLevel('INFO')
 
 
-def update_subscription_status(object):
-    return object.active
-
-
 class OrganisationManager(SoftDeleteManager):
 
     def list_by_user(self, user):
@@ -30,19 +25,34 @@ class OrganisationManager(SoftDeleteManager):
     def get_queryset(self):
         return super().get_queryset().prefetch_related('owner')
 
+    def refresh_active_subscription_until(self, organization_ids) -> int:
+        """
+        Store the end of the active subscriptions of the given organizations, NULL when they have none.
+        """
+        from apps.organizations.models import Subscription
 
-class SubscriptionManager(SoftDeleteManager):
+        active_until = Subscription.objects.filter(
+            organization_id=OuterRef("pk"), active_status=True
+        ).order_by().values("organization_id").annotate(until=Max("end_date")).values("until")
+        return super().get_queryset().filter(pk__in=organization_ids).update(
+            active_subscription_until=Subquery(active_until)
+        )
 
-    def update_status(self):
-        from multiprocessing import cpu_count
-        from multiprocessing.dummy import Pool as ThreadPool
 
-        objects = super().get_queryset()
-        all_tables = connection.introspection.table_names()
-        if len(all_tables) > 0 and 'organizations_subscription' in all_tables:
-            pool = ThreadPool(cpu_count())
-            results = pool.map(update_subscription_status, objects)
-            pool.close()
-            pool.join()
+class SubscriptionManager(SoftDeleteManager):
 
-        return objects
+    def to_activate(self, today):
+        """
+        Paid subscriptions whose validity period covers `today` but still inactive.
+        """
+        return super().get_queryset().filter(
+            active_status=False, paid=True, start_date__lte=today, end_date__gte=today
+        )
+
+    def to_deactivate(self, today):
+        """
+        Active subscriptions which are over, not started yet or no longer paid.
+        """
+        return super().get_queryset().filter(active_status=True).filter(
+            Q(end_date__lt=today) | Q(start_date__gt=today) | Q(paid=False)
+        )
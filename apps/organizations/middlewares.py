@@ -12,6 +12,7 @@ import re
 from django.utils.deprecation import MiddlewareMixin
 
 from apps.organizations.models import Organization
+from apps.organizations.services.access import OrganizationAccessContext
 from backend.commons import custom_get_object_or_404 as get_object_or_404
 
 logger = logging.getLogger(__name__)
@@ -29,3 +30,5 @@ class OrganizationAuthentication(MiddlewareMixin):
         except Exception as exc:
             logger.debug(exc)
         request.organization = organization
+        # Partagé par les permissions et les vues : `parent_obj` est cette même instance
+        request.organization_context = OrganizationAccessContext.of(organization) if organization else None
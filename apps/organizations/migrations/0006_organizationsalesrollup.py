@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-17 11:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0028_eticketsequence'),
+        ('organizations', '0005_historicalorganization_organization_type_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationSalesRollup',
+            fields=[
+                ('is_deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True, verbose_name="Date d' ajout")),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('active', models.BooleanField(default=True, verbose_name="Désigne si l' instance est active")),
+                ('day', models.DateField(verbose_name='Jour')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Quantité vendue')),
+                ('gross', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Montant brut')),
+                ('discounted_gross', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Montant brut après réductions')),
+                ('net_earn', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name="Revenu net de l' organisation")),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='events.event', verbose_name='Évènement')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='organizations.organization', verbose_name='Organisation')),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='events.ticket', verbose_name='Ticket')),
+            ],
+            options={
+                'verbose_name': 'Agrégat de ventes',
+                'verbose_name_plural': 'Agrégats de ventes',
+                'indexes': [models.Index(fields=['organization', 'day'], name='org_sales_rollup_day_idx')],
+                'unique_together': {('organization', 'event', 'ticket', 'day')},
+            },
+        ),
+    ]
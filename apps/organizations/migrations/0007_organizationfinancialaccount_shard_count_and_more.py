@@ -0,0 +1,60 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:05
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0006_organizationsalesrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organizationfinancialaccount',
+            name='shard_count',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Nombre de sous-soldes'),
+        ),
+        migrations.CreateModel(
+            name='FinancialAccountEntry',
+            fields=[
+                ('is_deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True, verbose_name="Date d' ajout")),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('active', models.BooleanField(default=True, verbose_name="Désigne si l' instance est active")),
+                ('kind', models.CharField(choices=[('ORDER_INCOME', "Revenu d' une commande"), ('WITHDRAW', 'Retrait'), ('ADJUSTMENT', 'Ajustement')], max_length=20, verbose_name='Nature')),
+                ('amount', models.DecimalField(decimal_places=2, help_text='Positif pour crédit, négatif pour débit', max_digits=12, verbose_name='Montant')),
+                ('reference', models.CharField(blank=True, max_length=255, verbose_name='Référence')),
+                ('shard', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Sous-solde crédité')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='organizations.organizationfinancialaccount', verbose_name='Compte financier')),
+            ],
+            options={
+                'verbose_name': 'Écriture de compte financier',
+                'verbose_name_plural': 'Écritures de comptes financiers',
+                'indexes': [models.Index(fields=['account', '-timestamp'], name='org_account_entry_idx'), models.Index(fields=['reference'], name='org_account_entry_ref_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='FinancialAccountShard',
+            fields=[
+                ('is_deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True, verbose_name="Date d' ajout")),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('active', models.BooleanField(default=True, verbose_name="Désigne si l' instance est active")),
+                ('index', models.PositiveSmallIntegerField(verbose_name='Index')),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Solde')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shards', to='organizations.organizationfinancialaccount', verbose_name='Compte financier')),
+            ],
+            options={
+                'verbose_name': 'Sous-solde de compte financier',
+                'verbose_name_plural': 'Sous-soldes de comptes financiers',
+                'unique_together': {('account', 'index')},
+            },
+        ),
+    ]
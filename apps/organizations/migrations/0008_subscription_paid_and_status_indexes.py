@@ -0,0 +1,59 @@
+# Generated by Django 5.2.1 on 2026-10-17 20:00
+
+import uuid
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def fill_paid(apps, schema_editor):
+    Subscription = apps.get_model('organizations', 'Subscription')
+    Transaction = apps.get_model('users', 'Transaction')
+
+    paid_ids = []
+    for entity_id in Transaction.objects.filter(
+            type='SUBSCRIPTION', status__in=['PAID', 'RESOLVED']
+    ).values_list('entity_id', flat=True).iterator(chunk_size=2000):
+        try:
+            paid_ids.append(uuid.UUID(str(entity_id)))
+        except ValueError:
+            continue
+    for start in range(0, len(paid_ids), 2000):
+        Subscription.objects.filter(pk__in=paid_ids[start:start + 2000]).update(paid=True)
+
+    today = timezone.localdate()
+    Subscription.objects.filter(paid=True, start_date__lte=today, end_date__gte=today).update(active_status=True)
+    Subscription.objects.filter(
+        Q(paid=False) | Q(start_date__gt=today) | Q(end_date__lt=today)
+    ).update(active_status=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0007_organizationfinancialaccount_shard_count_and_more'),
+        ('users', '0008_pointofinterest_location_geography'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscription',
+            name='paid',
+            field=models.BooleanField(default=False, verbose_name='Payé'),
+        ),
+        migrations.AddField(
+            model_name='historicalsubscription',
+            name='paid',
+            field=models.BooleanField(default=False, verbose_name='Payé'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['active_status', 'end_date'], name='subscription_status_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['active_status', 'start_date'], name='subscription_status_start_idx'),
+        ),
+        migrations.RunPython(fill_paid, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-17 20:30
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def fill_active_subscription_until(apps, schema_editor):
+    Organization = apps.get_model('organizations', 'Organization')
+    Subscription = apps.get_model('organizations', 'Subscription')
+
+    active_until = Subscription.objects.filter(
+        organization_id=OuterRef('pk'), active_status=True, is_deleted=False
+    ).order_by().values('organization_id').annotate(until=Max('end_date')).values('until')
+    Organization.objects.update(active_subscription_until=Subquery(active_until))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0008_subscription_paid_and_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='active_subscription_until',
+            field=models.DateField(blank=True, db_index=True, editable=False, null=True, verbose_name="Abonnement actif jusqu' au"),
+        ),
+        migrations.AddField(
+            model_name='historicalorganization',
+            name='active_subscription_until',
+            field=models.DateField(blank=True, db_index=True, editable=False, null=True, verbose_name="Abonnement actif jusqu' au"),
+        ),
+        migrations.RunPython(fill_active_subscription_until, migrations.RunPython.noop),
+    ]
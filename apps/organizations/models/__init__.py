@@ -6,4 +6,5 @@ from apps.organizations.models.roles import *
 from apps.organizations.models.subscriptions import *
 from apps.organizations.models.withdraws import *
 from apps.events.models.seller import *
-from apps.events.models.ticket_stock import *
\ No newline at end of file
+from apps.events.models.ticket_stock import *
+from apps.organizations.models.sales_rollups import *
@@ -7,10 +7,14 @@ Created on July 13, 2023
 """
 
 import logging
+import random
+from decimal import Decimal
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Sum
 
 from apps.organizations.models.organizations import Organization
+from commons.balances import apply_balance_deltas
 from commons.models import AbstractCommonBaseModel
 
 # Create your models here.
@@ -23,6 +27,9 @@ class OrganizationFinancialAccount(AbstractCommonBaseModel):
                                         related_name='financial_account')
     balance = models.DecimalField(
         verbose_name='Solde', default=0, max_digits=12, decimal_places=2)
+    # Les comptes très sollicités répartissent leurs crédits sur plusieurs sous-soldes pour ne plus verrouiller
+    # une seule ligne à chaque vente, le solde réel est la somme du solde et des sous-soldes
+    shard_count = models.PositiveSmallIntegerField(verbose_name="Nombre de sous-soldes", default=0)
 
     # percentage = models.DecimalField(
     #    verbose_name="Pourcentage sur vente par ticket", max_digits=15, decimal_places=5, default=3.0)
@@ -30,13 +37,114 @@ class OrganizationFinancialAccount(AbstractCommonBaseModel):
     def __str__(self) -> str:
         return str("Compte financier de " + self.organization.name)
 
+    def get_balance(self) -> Decimal:
+        if not self.shard_count:
+            return self.balance
+        shards_balance = self.shards.aggregate(total=Sum("balance"))["total"] or Decimal("0")
+        return self.balance + shards_balance
+
     def can_withdraw_amount(self, amount: int) -> bool:
-        return self.organization.active and self.balance > amount
+        return self.organization.active and self.get_balance() > amount
+
+    def credit(self, amount, kind: str, reference: str = "") -> "FinancialAccountEntry":
+        """
+            Add an amount to the account without locking the account row when it is sharded.
+        """
+        amount = Decimal(amount)
+        with transaction.atomic():
+            shard_index = random.randrange(self.shard_count) if self.shard_count else None
+            entry = FinancialAccountEntry.objects.create(
+                account=self, kind=kind, amount=amount, reference=reference, shard=shard_index
+            )
+            if shard_index is None:
+                self.balance = apply_balance_deltas(OrganizationFinancialAccount, self.pk, {"balance": amount})["balance"]
+            elif not FinancialAccountShard.objects.filter(account=self, index=shard_index).update(
+                    balance=F("balance") + amount):
+                FinancialAccountShard.objects.get_or_create(account=self, index=shard_index)
+                FinancialAccountShard.objects.filter(account=self, index=shard_index).update(
+                    balance=F("balance") + amount)
+        return entry
+
+    def debit(self, amount, kind: str, reference: str = "", allow_overdraft: bool = False) -> "FinancialAccountEntry":
+        """
+            Remove an amount from the account, in one guarded statement.
+        :raise ValueError: when the balance is not sufficient and the overdraft is not allowed
+        """
+        amount = Decimal(amount)
+        with transaction.atomic():
+            if self.shard_count:
+                self.consolidate()
+            values = apply_balance_deltas(
+                OrganizationFinancialAccount, self.pk, {"balance": -amount},
+                minimums=None if allow_overdraft else {"balance": 0},
+            )
+            if values is None:
+                raise ValueError(f"Solde insuffisant. Demandé: {amount} F CFA")
+            self.balance = values["balance"]
+            return FinancialAccountEntry.objects.create(account=self, kind=kind, amount=-amount, reference=reference)
+
+    def consolidate(self) -> Decimal:
+        """
+            Move the sub-balances into the main balance.
+        """
+        with transaction.atomic():
+            shards = list(FinancialAccountShard.objects.select_for_update().filter(account=self).exclude(balance=0))
+            total = sum((shard.balance for shard in shards), Decimal("0"))
+            if shards:
+                FinancialAccountShard.objects.filter(pk__in=[shard.pk for shard in shards]).update(balance=0)
+                self.balance = apply_balance_deltas(OrganizationFinancialAccount, self.pk, {"balance": total})["balance"]
+        return total
 
     class Meta:
         verbose_name = 'Compte financier'
         verbose_name_plural = 'Comptes financiers'
 
 
+class FinancialAccountShard(AbstractCommonBaseModel):
+    account = models.ForeignKey(OrganizationFinancialAccount, on_delete=models.CASCADE, related_name='shards',
+                                verbose_name='Compte financier')
+    index = models.PositiveSmallIntegerField(verbose_name='Index')
+    balance = models.DecimalField(verbose_name='Solde', default=0, max_digits=12, decimal_places=2)
+
+    def __str__(self) -> str:
+        return f"Sous-solde {self.index} du {self.account}"
+
+    class Meta:
+        verbose_name = 'Sous-solde de compte financier'
+        verbose_name_plural = 'Sous-soldes de comptes financiers'
+        unique_together = ('account', 'index')
+
+
+class FinancialAccountEntry(AbstractCommonBaseModel):
+    ORDER_INCOME = 'ORDER_INCOME'
+    WITHDRAW = 'WITHDRAW'
+    ADJUSTMENT = 'ADJUSTMENT'
+
+    ENTRY_KINDS = (
+        (ORDER_INCOME, "Revenu d' une commande"),
+        (WITHDRAW, 'Retrait'),
+        (ADJUSTMENT, 'Ajustement'),
+    )
+
+    account = models.ForeignKey(OrganizationFinancialAccount, on_delete=models.CASCADE, related_name='entries',
+                                verbose_name='Compte financier')
+    kind = models.CharField(max_length=20, choices=ENTRY_KINDS, verbose_name='Nature')
+    amount = models.DecimalField(verbose_name='Montant', max_digits=12, decimal_places=2,
+                                 help_text="Positif pour crédit, négatif pour débit")
+    reference = models.CharField(max_length=255, blank=True, verbose_name='Référence')
+    shard = models.PositiveSmallIntegerField(verbose_name='Sous-solde crédité', blank=True, null=True)
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} | {self.amount} F CFA | {self.account}"
+
+    class Meta:
+        verbose_name = 'Écriture de compte financier'
+        verbose_name_plural = 'Écritures de comptes financiers'
+        indexes = [
+            models.Index(fields=['account', '-timestamp'], name='org_account_entry_idx'),
+            models.Index(fields=['reference'], name='org_account_entry_ref_idx'),
+        ]
+
+
 Organization.get_financial_account = property(
     lambda o: OrganizationFinancialAccount.objects.get_or_create(organization=o)[0])
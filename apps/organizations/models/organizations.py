@@ -10,11 +10,12 @@ import datetime
 import logging
 
 from django.db import models
+from django.utils import timezone
 from simple_history.models import HistoricalRecords
 
 from apps.events.models.super_seller_profile import OrganizationType
 from apps.organizations.managers import OrganisationManager
-from apps.utils.models import Variable
+from apps.utils.services.variables import VariableRegistry
 from apps.utils.utils import _upload_to
 from apps.utils.validators import PhoneNumberValidator
 from apps.xlib.enums import VARIABLE_NAMES_ENUM
@@ -67,6 +68,10 @@ class Organization(AbstractCommonBaseModel):
         on_delete=models.SET_NULL,
     )
     subscribe_until = models.DateField(null=True, blank=True)
+    # Fin de l' abonnement actif, tenue à jour par les transitions de SubscriptionStatusEngine
+    active_subscription_until = models.DateField(
+        verbose_name="Abonnement actif jusqu' au", null=True, blank=True, db_index=True, editable=False
+    )
     objects = OrganisationManager()
     phone_number_validated = models.BooleanField(default=False)
     percentage = models.FloatField(
@@ -93,13 +98,10 @@ class Organization(AbstractCommonBaseModel):
 
     @property
     def have_active_subscription(self):
-        now = datetime.datetime.now()
-        return self.subscriptions.filter(
-            start_date__lte=now, end_date__gte=now, active_status=True
-        ).exists()
+        return self.active_subscription_until is not None and self.active_subscription_until >= timezone.localdate()
 
     def is_owner(self, user):
-        return user == self.owner
+        return user is not None and user.pk is not None and user.pk == self.owner_id
 
     def set_subscribe_until(self, end_date_or_timestamp):
         if isinstance(end_date_or_timestamp, int):
@@ -126,13 +128,7 @@ class Organization(AbstractCommonBaseModel):
             else "PERCENTAGE_ABOUT_A_TICKET_SELLING"
         )
 
-        percentage_variable = Variable.objects.get(
-            name=VARIABLE_NAMES_ENUM[percentage_variable_name].value
-        )
-        percentage_value = percentage_variable.format_value(
-            percentage_variable.possible_values.first().value
-        )
-        return percentage_value
+        return VariableRegistry.get(VARIABLE_NAMES_ENUM[percentage_variable_name].value)
 
     @property
     def is_owner_verified(self):
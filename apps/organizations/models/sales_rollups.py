@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.organizations.models.organizations import Organization
+from commons.models import AbstractCommonBaseModel
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class OrganizationSalesRollup(AbstractCommonBaseModel):
+    """
+    Ventes agrégées par organisation, évènement, ticket et jour ( date de la commande ).
+    Alimentée à chaque commande terminée, reconstructible avec la commande `rebuild_sales_rollups`.
+    """
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="sales_rollups",
+                                     verbose_name="Organisation")
+    event = models.ForeignKey(to="events.Event", on_delete=models.CASCADE, related_name="sales_rollups",
+                              verbose_name="Évènement")
+    ticket = models.ForeignKey(to="events.Ticket", on_delete=models.CASCADE, related_name="sales_rollups",
+                               verbose_name="Ticket")
+    day = models.DateField(verbose_name="Jour")
+    quantity = models.PositiveIntegerField(default=0, verbose_name="Quantité vendue")
+    gross = models.DecimalField(default=0, max_digits=14, decimal_places=2, verbose_name="Montant brut")
+    discounted_gross = models.DecimalField(default=0, max_digits=14, decimal_places=2,
+                                           verbose_name="Montant brut après réductions")
+    net_earn = models.DecimalField(default=0, max_digits=14, decimal_places=2,
+                                   verbose_name="Revenu net de l' organisation")
+
+    class Meta:
+        verbose_name = "Agrégat de ventes"
+        verbose_name_plural = "Agrégats de ventes"
+        unique_together = ("organization", "event", "ticket", "day")
+        indexes = [
+            models.Index(fields=["organization", "day"], name="org_sales_rollup_day_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.organization_id} | {self.ticket_id} | {self.day}"
+
+    @staticmethod
+    def get_order_amounts(quantity, line_total, potential_discount_data, applied_percentage):
+        """
+        :return: ( quantity, gross, discounted_gross, net_earn ) of an order
+        """
+        potential_discount_data = potential_discount_data or {}
+        gross = Decimal(line_total)
+        discounted_gross = (
+            Decimal(potential_discount_data.get("reduced_amount"))
+            if potential_discount_data.get("use_coupon", False) else gross
+        )
+        net_earn = (Decimal(1 - (applied_percentage or 0)) * discounted_gross).quantize(Decimal("0.01"))
+        return quantity, gross, discounted_gross, net_earn
+
+    @classmethod
+    def record_order(cls, order):
+        """
+            Add a finished order to the rollup of its day.
+        """
+        order_item = order.item
+        ticket = order_item.ticket
+        quantity, gross, discounted_gross, net_earn = cls.get_order_amounts(
+            order_item.quantity, order_item.line_total, order_item.potential_discount_data, order.applied_percentage
+        )
+        with transaction.atomic():
+            rollup, _ = cls.global_objects.get_or_create(
+                organization_id=ticket.event.organization_id,
+                event_id=ticket.event_id,
+                ticket_id=ticket.pk,
+                day=timezone.localdate(order.timestamp),
+            )
+            cls.global_objects.filter(pk=rollup.pk).update(
+                quantity=F("quantity") + quantity,
+                gross=F("gross") + gross,
+                discounted_gross=F("discounted_gross") + discounted_gross,
+                net_earn=F("net_earn") + net_earn,
+            )
+
+    @classmethod
+    def rebuild(cls, organization_id=None, chunk_size=2000) -> int:
+        """
+            Recompute the rollups from the finished orders, for one organization or all of them.
+        :return: the number of rollups created
+        """
+        from apps.events.models import Order
+        from apps.xlib.enums import OrderStatusEnum
+
+        orders = Order.objects.filter(status=OrderStatusEnum.FINISHED.value, item__isnull=False)
+        rollups = cls.global_objects.all()
+        if organization_id:
+            orders = orders.filter(item__ticket__event__organization_id=organization_id)
+            rollups = rollups.filter(organization_id=organization_id)
+
+        totals = {}
+        rows = orders.values_list(
+            "item__ticket__event__organization_id", "item__ticket__event_id", "item__ticket_id", "timestamp",
+            "item__quantity", "item__line_total", "item__potential_discount_data", "applied_percentage",
+        )
+        for organization_pk, event_pk, ticket_pk, order_timestamp, *amounts in rows.iterator(chunk_size=chunk_size):
+            key = (organization_pk, event_pk, ticket_pk, timezone.localdate(order_timestamp))
+            previous = totals.get(key, (0, Decimal("0"), Decimal("0"), Decimal("0")))
+            totals[key] = tuple(a + b for a, b in zip(previous, cls.get_order_amounts(*amounts)))
+
+        with transaction.atomic():
+            # Suppression réelle, la contrainte d' unicité s' applique aussi aux lignes supprimées logiquement
+            models.QuerySet.delete(rollups)
+            cls.objects.bulk_create(
+                [
+                    cls(organization_id=organization_pk, event_id=event_pk, ticket_id=ticket_pk, day=day,
+                        quantity=quantity, gross=gross, discounted_gross=discounted_gross, net_earn=net_earn)
+                    for (organization_pk, event_pk, ticket_pk, day), (quantity, gross, discounted_gross, net_earn)
+                    in totals.items()
+                ],
+                batch_size=chunk_size,
+            )
+        logger.info(f"{len(totals)} sales rollups rebuilt")
+        return len(totals)
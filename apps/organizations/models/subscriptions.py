@@ -6,15 +6,12 @@ Created on July 13, 2023
     Wesley Eliel MONTCHO, alias DevBackend7
 """
 
-import datetime
 import logging
 
 from django.db import models
 from simple_history.models import HistoricalRecords
 
 from apps.organizations.managers import SubscriptionManager
-from apps.users.models import Transaction
-from apps.xlib.enums import TransactionKindEnum
 from commons.models import AbstractCommonBaseModel
 
 # Create your models here.
@@ -73,7 +70,9 @@ class Subscription(AbstractCommonBaseModel):
     updated = models.DateTimeField(
         verbose_name="Date de modification", auto_now_add=False, auto_now=True
     )
+    # Tenu à jour par SubscriptionStatusEngine : payé et dans sa période de validité
     active_status = models.BooleanField(default=False)
+    paid = models.BooleanField(verbose_name="Payé", default=False)
 
     objects = SubscriptionManager()
     history = HistoricalRecords()
@@ -103,29 +102,19 @@ class Subscription(AbstractCommonBaseModel):
 
     @property
     def active(self):
-        subscription_paid = False
-        try:
-            related_subscription_transaction = Transaction.objects.get(type=TransactionKindEnum.SUBSCRIPTION.value,
-                                                                       entity_id=self.pk)
-            subscription_paid = related_subscription_transaction.paid
-
-        except Exception as exc:
-            logger.info(exc.__str__())
-
-        now = datetime.datetime.now()
-
-        computed_status = (
-                subscription_paid and self.start_date <= now.date() <= self.end_date
-        )
-        if computed_status != self.active_status:
-            self.active_status = computed_status
-            self.save()
-
         return self.active_status
 
+    def is_active_on(self, date) -> bool:
+        return self.paid and self.start_date <= date <= self.end_date
+
     def save(self, *args, **kwargs) -> None:
         return super().save(*args, **kwargs)
 
     class Meta:
         verbose_name = "Abonnement"
         verbose_name_plural = "Abonnements"
+        indexes = [
+            # Bornes des transitions : seules les lignes qui changent d' état sont lues
+            models.Index(fields=["active_status", "end_date"], name="subscription_status_end_idx"),
+            models.Index(fields=["active_status", "start_date"], name="subscription_status_start_idx"),
+        ]
@@ -14,6 +14,7 @@ from model_utils import FieldTracker
 from rest_framework.exceptions import APIException
 from simple_history.models import HistoricalRecords
 
+from apps.organizations.models.financial_accounts import FinancialAccountEntry
 from apps.users.transactions.withdraws import WithdrawAdapter
 from apps.utils.validators import PhoneNumberValidator
 from apps.xlib.enums import (
@@ -115,8 +116,9 @@ class Withdraw(AbstractCommonBaseModel):
 
     def update_user_financial_account(self):
         financial_account = self.organization.get_financial_account
-        financial_account.balance -= Decimal(self.amount)
-        financial_account.save()
+        financial_account.debit(
+            Decimal(self.amount), kind=FinancialAccountEntry.WITHDRAW, reference=str(self.pk), allow_overdraft=True
+        )
 
     def __str__(self) -> str:
         return f"Retrait du compte financier de l' organisation {self.organization.__str__()}"
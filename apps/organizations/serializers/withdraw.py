@@ -16,7 +16,7 @@ from apps.organizations.models import (
     Withdraw, Organization
 )
 from apps.users.serializers.transactions import TransactionSerializer
-from apps.utils.models import Variable
+from apps.utils.services.variables import VariableRegistry
 from apps.xlib.enums import (
     TransactionStatusEnum, TransactionKindEnum, VARIABLE_NAMES_ENUM,
 )
@@ -51,12 +51,7 @@ class WithdrawSerializer(serializers.ModelSerializer):
         amount = data.get("amount")
         # Minimal amount of withdraw
 
-        minimal_amount_variable = Variable.objects.get(
-            name=VARIABLE_NAMES_ENUM.MINIMAL_AMOUNT_REQUIRED_FOR_WITHDRAW.value
-        )
-        minimal_amount_value = minimal_amount_variable.format_value(
-            minimal_amount_variable.possible_values.first().value
-        )
+        minimal_amount_value = VariableRegistry.get(VARIABLE_NAMES_ENUM.MINIMAL_AMOUNT_REQUIRED_FOR_WITHDRAW.value)
 
         if int(amount) < minimal_amount_value:
             raise ValidationError(
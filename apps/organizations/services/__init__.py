@@ -1,9 +1,7 @@
 # -*- coding: utf-8 -*-
 """
-Created on April 26 2022
+Created on 17/10/2026
 
 @author:
     Wesley Eliel MONTCHO, alias DevBackend7
 """
-
-# Create your tests here.
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+from django.db.models import Q, Sum
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class OrganizationAccessContext:
+    """
+    Rôle des utilisateurs dans une organisation, résolu une fois par requête.
+
+    Le contexte est porté par l' instance de l' organisation ( `request.organization`, `view.parent_obj` ) :
+    middleware, permissions, sérialiseurs et vues de la même requête le partagent.
+    Le poids des rôles d' un membre est aussi gardé CACHE_TIMEOUT secondes dans le cache partagé ; les
+    changements d' adhésion le suppriment, ceux des rôles changent la version de toutes les clés.
+    """
+
+    CACHE_KEY_PREFIX = "organization_access:"
+    CACHE_TIMEOUT = 60
+    NO_MEMBERSHIP = -1
+
+    ATTRIBUTE_NAME = "_access_context"
+
+    MEMBER_WEIGHT = 1
+    COORDINATOR_WEIGHT = 2
+
+    def __init__(self, organization):
+        self.organization = organization
+        self._weights = {}
+
+    @classmethod
+    def of(cls, organization) -> "OrganizationAccessContext":
+        context = getattr(organization, cls.ATTRIBUTE_NAME, None)
+        if context is None:
+            context = cls(organization)
+            setattr(organization, cls.ATTRIBUTE_NAME, context)
+        return context
+
+    @classmethod
+    def _version_key(cls) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}version"
+
+    @classmethod
+    def get_version(cls) -> int:
+        try:
+            return cache.get_or_set(cls._version_key(), time.time_ns, None)
+        except Exception as exc:
+            logger.warning(f"Organization access cache unavailable: {exc}")
+            return 0
+
+    @classmethod
+    def _weight_key(cls, organization_id, user_id) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}{cls.get_version()}:{organization_id}:{user_id}"
+
+    @classmethod
+    def invalidate(cls, organization_id, user_id):
+        try:
+            cache.delete(cls._weight_key(organization_id, user_id))
+        except Exception as exc:
+            logger.warning(f"Organization access cache unavailable: {exc}")
+
+    @classmethod
+    def invalidate_all(cls):
+        try:
+            cache.set(cls._version_key(), time.time_ns(), None)
+        except Exception as exc:
+            logger.warning(f"Organization access cache unavailable: {exc}")
+
+    @classmethod
+    def load_weight(cls, organization_id, user_id) -> int:
+        """
+        :return: the total weight of the roles of the membership, NO_MEMBERSHIP without membership
+        """
+        from apps.organizations.models import OrganizationMembership
+
+        # Soft-deleted roles grant nothing, a membership without role keeps a weight of 0
+        weights = list(
+            OrganizationMembership.objects.filter(organization_id=organization_id, user_id=user_id)
+            .annotate(weight=Sum("roles__weight", filter=Q(roles__is_deleted=False)))
+            .values_list("weight", flat=True)
+        )
+        if not weights:
+            return cls.NO_MEMBERSHIP
+        return sum(int(weight) for weight in weights if weight is not None)
+
+    def get_weight(self, user) -> int:
+        if user.pk in self._weights:
+            return self._weights[user.pk]
+
+        key = self._weight_key(self.organization.pk, user.pk)
+        weight = None
+        try:
+            weight = cache.get(key)
+        except Exception as exc:
+            logger.warning(f"Organization access cache unavailable: {exc}")
+        if weight is None:
+            weight = self.load_weight(self.organization.pk, user.pk)
+            try:
+                cache.set(key, weight, self.CACHE_TIMEOUT)
+            except Exception as exc:
+                logger.warning(f"Organization access cache unavailable: {exc}")
+
+        self._weights[user.pk] = weight
+        return weight
+
+    def is_owner(self, user) -> bool:
+        return user is not None and user.pk is not None and self.organization.owner_id == user.pk
+
+    def has_access(self, user, role: str = "MEMBER") -> bool:
+        weight = self.get_weight(user)
+        if weight == self.NO_MEMBERSHIP:
+            return False
+        if role == "MEMBER":
+            return weight >= self.MEMBER_WEIGHT
+        if role == "COORDINATOR":
+            return weight >= self.COORDINATOR_WEIGHT
+        return False
+
+    def get_role(self, user):
+        if self.is_owner(user):
+            return "OWNER"
+        weight = self.get_weight(user)
+        if weight == self.NO_MEMBERSHIP:
+            return None
+        return "COORDINATOR" if weight >= self.COORDINATOR_WEIGHT else "MEMBER"
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.organizations.models import Subscription
+from apps.organizations.signals.initializers import subscription_status_changed
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class SubscriptionStatusEngine:
+    """
+    Tenue à jour de `Subscription.active_status` ( payé et dans sa période de validité ).
+
+    Seules les transitions sont calculées : les abonnements dont une borne ( start_date, end_date ) vient d' être
+    franchie et ceux dont le paiement vient d' aboutir. Chaque transition est un UPDATE ensembliste, sans
+    ligne d' historique, suivi d' un signal `subscription_status_changed`.
+    """
+
+    @staticmethod
+    def today():
+        return timezone.localdate()
+
+    @staticmethod
+    def _flip(queryset, active_status: bool) -> list:
+        """
+        :return: [( pk, organization_id )] of the switched subscriptions
+        """
+        rows = list(queryset.select_for_update(skip_locked=True).values_list("pk", "organization_id"))
+        if rows:
+            Subscription.objects.filter(pk__in=[pk for pk, _ in rows]).update(
+                active_status=active_status, updated=timezone.now()
+            )
+        return rows
+
+    @staticmethod
+    def _emit(activated: list, deactivated: list):
+        if not activated and not deactivated:
+            return
+        subscription_status_changed.send(
+            sender=Subscription,
+            activated=[pk for pk, _ in activated],
+            deactivated=[pk for pk, _ in deactivated],
+            organization_ids={organization_id for _, organization_id in activated + deactivated},
+        )
+
+    @classmethod
+    def refresh(cls, today=None) -> dict:
+        """
+            Apply the transitions due at `today` ( start or end of the validity periods ).
+        :return: {"activated": int, "deactivated": int}
+        """
+        today = today or cls.today()
+        with transaction.atomic():
+            deactivated = cls._flip(Subscription.objects.to_deactivate(today), False)
+            activated = cls._flip(Subscription.objects.to_activate(today), True)
+        cls._emit(activated, deactivated)
+        return {"activated": len(activated), "deactivated": len(deactivated)}
+
+    @classmethod
+    def record_payment(cls, subscription_pk, paid: bool) -> bool:
+        """
+            Store the payment result of a subscription and apply its transition right away.
+        :return: the new active status
+        """
+        today = cls.today()
+        with transaction.atomic():
+            Subscription.objects.filter(pk=subscription_pk).update(paid=paid, updated=timezone.now())
+            deactivated = cls._flip(Subscription.objects.to_deactivate(today).filter(pk=subscription_pk), False)
+            activated = cls._flip(Subscription.objects.to_activate(today).filter(pk=subscription_pk), True)
+        cls._emit(activated, deactivated)
+        return Subscription.objects.filter(pk=subscription_pk, active_status=True).exists()
@@ -1,9 +1,12 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from apps.events.models import Order
 from apps.notifications import tasks as notification_tasks
-from apps.organizations.models import Withdraw, OrganizationMembership
-from apps.xlib.enums import WithdrawStatusEnum
+from apps.organizations.models import Organization, Withdraw, OrganizationMembership, OrganizationSalesRollup, Role
+from apps.organizations.services.access import OrganizationAccessContext
+from apps.organizations.signals.initializers import subscription_status_changed
+from apps.xlib.enums import WithdrawStatusEnum, OrderStatusEnum
 
 
 @receiver(post_save, sender=Withdraw)
@@ -25,3 +28,42 @@ def handle_membership_creation(sender, instance, created, **kwargs):
 
     if created:
         notification_tasks.notify_users_about_new_membership_creation.delay(str(instance.pk))
+
+
+@receiver(post_save, sender=Order)
+def record_finished_order_sales(sender, instance, created, **kwargs):
+    if not isinstance(instance, Order) or instance.item_id is None:
+        return
+
+    if instance.status == OrderStatusEnum.FINISHED.value and (
+            created or (instance.tracker.has_changed('status')
+                        and instance.tracker.previous('status') != OrderStatusEnum.FINISHED.value)):
+        OrganizationSalesRollup.record_order(instance)
+
+
+@receiver(subscription_status_changed)
+def refresh_organizations_active_subscription(sender, organization_ids, **kwargs):
+    Organization.objects.refresh_active_subscription_until(organization_ids)
+
+
+@receiver(post_save, sender=OrganizationMembership)
+@receiver(post_delete, sender=OrganizationMembership)
+def invalidate_membership_access(sender, instance, **kwargs):
+    OrganizationAccessContext.invalidate(instance.organization_id, instance.user_id)
+
+
+@receiver(m2m_changed, sender=OrganizationMembership.roles.through)
+def invalidate_membership_roles_access(sender, instance, action, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, OrganizationMembership):
+        OrganizationAccessContext.invalidate(instance.organization_id, instance.user_id)
+    else:
+        # Modification depuis le rôle : tous les membres peuvent être concernés
+        OrganizationAccessContext.invalidate_all()
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_roles_access(sender, instance, **kwargs):
+    OrganizationAccessContext.invalidate_all()
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Envoyé après chaque passe de SubscriptionStatusEngine qui a changé des statuts :
+#   activated / deactivated: pk des abonnements concernés, organization_ids: leurs organisations
+subscription_status_changed = Signal()
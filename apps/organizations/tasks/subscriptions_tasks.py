@@ -9,7 +9,7 @@ Created on December 12 2022
 from celery import shared_task
 from celery.utils.log import get_task_logger
 
-from apps.organizations.models import Subscription
+from apps.organizations.services.subscriptions import SubscriptionStatusEngine
 
 logger = get_task_logger(__name__)
 
@@ -18,8 +18,7 @@ logger = get_task_logger(__name__)
 def update_subscriptions_active_status():
     logger.info('\n Begin Update Subscription Status Task \n')
     try:
-        subscription = Subscription.objects.update_status()
-        logger.info(subscription)
+        logger.info(SubscriptionStatusEngine.refresh())
     except Exception as exc:
         logger.exception(exc.__str__())
     logger.info('\n Finish Update Subscription Status Task \n')
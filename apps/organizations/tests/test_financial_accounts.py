@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Tests des mouvements du compte financier d' une organisation.
+
+Ils vérifient qu' un débit ne rend jamais le solde négatif, même avec des sous-soldes
+ou des débits simultanés, et que chaque mouvement laisse une écriture.
+"""
+
+import threading
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from apps.organizations.models import FinancialAccountEntry, Organization, OrganizationFinancialAccount
+
+User = get_user_model()
+
+
+class FinancialAccountDataMixin:
+    """Données communes : une organisation et son compte financier."""
+
+    def setUp(self):
+        """Initialisation des données de test."""
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="User",
+        )
+        self.organization = Organization.objects.create(
+            name="Test Organization",
+            description="Test Organization Description",
+            email="org@example.com",
+            phone="+22967000000",
+            address="123 Test Street",
+            owner=self.user,
+            phone_number_validated=True,
+            percentage=0.15,
+            percentage_if_discounted=0.10
+        )
+        self.account = self.organization.get_financial_account
+
+    def stored_balance(self) -> Decimal:
+        return OrganizationFinancialAccount.objects.get(pk=self.account.pk).get_balance()
+
+
+class OrganizationFinancialAccountTest(FinancialAccountDataMixin, TestCase):
+    """Suite de tests des crédits et débits."""
+
+    def test_credit_then_debit(self):
+        """Le solde suit les mouvements et chacun laisse une écriture."""
+        self.account.credit(1000, FinancialAccountEntry.ORDER_INCOME, "order-1")
+        self.account.debit(400, FinancialAccountEntry.WITHDRAW, "withdraw-1")
+
+        self.assertEqual(self.stored_balance(), Decimal("600"))
+        self.assertEqual(
+            list(self.account.entries.order_by("timestamp").values_list("amount", flat=True)),
+            [Decimal("1000"), Decimal("-400")],
+        )
+
+    def test_overdraft_is_refused(self):
+        """Un débit supérieur au solde est refusé sans écriture."""
+        self.account.credit(300, FinancialAccountEntry.ORDER_INCOME, "order-1")
+
+        with self.assertRaises(ValueError):
+            self.account.debit(301, FinancialAccountEntry.WITHDRAW, "withdraw-1")
+        self.assertEqual(self.stored_balance(), Decimal("300"))
+        self.assertFalse(self.account.entries.filter(kind=FinancialAccountEntry.WITHDRAW).exists())
+
+    def test_allowed_overdraft(self):
+        """Un ajustement peut explicitement rendre le solde négatif."""
+        self.account.debit(50, FinancialAccountEntry.ADJUSTMENT, "adjustment-1", allow_overdraft=True)
+
+        self.assertEqual(self.stored_balance(), Decimal("-50"))
+
+    def test_debit_counts_the_sub_balances(self):
+        """Les crédits répartis sur les sous-soldes sont disponibles au débit."""
+        OrganizationFinancialAccount.objects.filter(pk=self.account.pk).update(shard_count=4)
+        self.account.refresh_from_db()
+        for index in range(5):
+            self.account.credit(100, FinancialAccountEntry.ORDER_INCOME, f"order-{index}")
+
+        self.account.debit(500, FinancialAccountEntry.WITHDRAW, "withdraw-1")
+        self.assertEqual(self.stored_balance(), Decimal("0"))
+        with self.assertRaises(ValueError):
+            self.account.debit(1, FinancialAccountEntry.WITHDRAW, "withdraw-2")
+
+
+class OrganizationFinancialAccountConcurrencyTest(FinancialAccountDataMixin, TransactionTestCase):
+    """Débits simultanés du même compte."""
+
+    def test_concurrent_debits_never_overdraw(self):
+        """Sur 8 retraits de 200 pour un solde de 1000, seuls 5 passent."""
+        self.account.credit(1000, FinancialAccountEntry.ORDER_INCOME, "order-1")
+        workers = 8
+        debited, refused = [], []
+        barrier = threading.Barrier(workers)
+
+        def debit(index):
+            try:
+                account = OrganizationFinancialAccount.objects.get(pk=self.account.pk)
+                barrier.wait()
+                account.debit(200, FinancialAccountEntry.WITHDRAW, f"withdraw-{index}")
+                debited.append(index)
+            except ValueError:
+                refused.append(index)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=debit, args=(index,)) for index in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(debited), 5)
+        self.assertEqual(len(refused), 3)
+        self.assertEqual(self.stored_balance(), Decimal("0"))
+        self.assertEqual(self.account.entries.filter(kind=FinancialAccountEntry.WITHDRAW).count(), 5)
@@ -6,7 +6,11 @@ from apps.organizations.views import (
     OrganizationFollowedView,
     OrganizationFollowView, 
     OrganizationUnFollowView,
-    ScanETicketView
+    ScanETicketView,
+    OpenGateView,
+    GateScanView,
+    GateManifestView,
+    GateCheckInsView,
 )
 from apps.organizations.views.ephemeral_event_views import (
     EphemeralEventCreateAPIView,
@@ -25,6 +29,14 @@ urlpatterns = [
          OrganizationUnFollowView.as_view()),
     path("organizations/<str:organization_pk>/scann-eticket/",
          ScanETicketView.as_view()),
+    path("organizations/<str:organization_pk>/events/<str:event_pk>/gate/",
+         OpenGateView.as_view()),
+    path("organizations/<str:organization_pk>/events/<str:event_pk>/gate/scans/",
+         GateScanView.as_view()),
+    path("organizations/<str:organization_pk>/events/<str:event_pk>/gate/manifest/",
+         GateManifestView.as_view()),
+    path("organizations/<str:organization_pk>/events/<str:event_pk>/gate/check-ins/",
+         GateCheckInsView.as_view()),
 
     
     # Création d'événement éphémère
@@ -1,15 +1,24 @@
 import logging
 
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import extend_schema, inline_serializer
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
-from rest_framework.exceptions import APIException
+from rest_framework.exceptions import APIException, NotFound
 from rest_framework.permissions import IsAuthenticated, OR, IsAdminUser
 from rest_framework.response import Response
+from rest_framework import serializers
 from rest_framework.views import APIView
 
-from apps.events.models import ETicket
-from apps.events.serializers import ScanETicketSerializer
+from apps.events.models import ETicket, Event
+from apps.events.serializers import (
+    ScanETicketSerializer,
+    GateScanBatchSerializer,
+    GateScanResultSerializer,
+    GateCheckInsSerializer,
+)
+from apps.events.services.gate_manifest import GateManifestService
+from apps.events.services.gate_scan import GateScanService
 from apps.organizations.mixings import CheckParentPermissionMixin
 from apps.organizations.models import Organization
 from apps.organizations.permissions import IsOrganizationMember
@@ -80,7 +89,8 @@ class ScanETicketView(CheckParentPermissionMixin, APIView):
                 ErrorUtil.get_error_detail(ErrorEnum.INVALID_TICKET),
                 code=ErrorEnum.INVALID_TICKET.value,
             )
-        if not instance.active:
+        # The used key is shared with the gates, whose database writes may still be pending
+        if not instance.active or not GateScanService.reserve_check_in(instance.event_id, instance.pk):
             logger.warning("Error: End process with 'Not active ticket'")
             raise APIException(
                 ErrorUtil.get_error_detail(ErrorEnum.ALREADY_USED_TICKET),
@@ -92,3 +102,147 @@ class ScanETicketView(CheckParentPermissionMixin, APIView):
 
         logger.info('########### Finish scanning ticket, with success ##############')
         return Response(status=status.HTTP_202_ACCEPTED)
+
+
+class BaseGateView(CheckParentPermissionMixin, APIView):
+    permission_classes = [
+        IsAuthenticated,
+        OR(
+            IsOrganizationMember(),
+            OR(
+                IsAdminUser(),
+                HasAppAdminPermissionFor("Admin-Operation-Scan-ETicket")
+            ))
+    ]
+
+    parent_queryset = Organization.objects.all()
+    parent_lookup_field = "pk"
+    parent_lookup_url_kwarg = "organization_pk"
+
+    def get_permissions(self):
+        def get_permission_function(instance):
+            try:
+                return instance()
+            except TypeError:
+                return instance
+
+        return [get_permission_function(permission) for permission in self.permission_classes]
+
+    def get_event(self):
+        event = Event.admin_objects.filter(
+            pk=self.kwargs.get("event_pk"), organization_id=self.parent_obj.pk
+        ).only("pk", "organization_id").first()
+        if event is None:
+            raise NotFound(
+                ErrorUtil.get_error_detail(ErrorEnum.EVENT_NOT_FOUND),
+                code=ErrorEnum.EVENT_NOT_FOUND.value,
+            )
+        return event
+
+
+class OpenGateView(BaseGateView):
+
+    @swagger_auto_schema(
+        operation_id="Admin-Operation-Open-Event-Gate",
+        operation_description="Ouvrir les portes d' un évènement ( préchargement des e-tickets pour le scan )",
+        operation_summary="ETicket"
+    )
+    @extend_schema(
+        request=None,
+        responses={
+            200: inline_serializer(
+                name="OpenGateResponseSerializer",
+                fields={
+                    "loaded": serializers.IntegerField(),
+                },
+            )
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        loaded = GateScanService.open_doors(self.get_event())
+        return Response({"loaded": loaded}, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_id="Admin-Operation-Close-Event-Gate",
+        operation_description="Fermer les portes d' un évènement",
+        operation_summary="ETicket"
+    )
+    def delete(self, request, *args, **kwargs):
+        GateScanService.close_doors(self.get_event())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class GateScanView(BaseGateView):
+    serializer_class = GateScanBatchSerializer
+
+    @swagger_auto_schema(
+        operation_id="Admin-Operation-Gate-Scan-ETickets",
+        operation_description="Scanner un lot d' e-tickets à l' entrée d' un évènement",
+        operation_summary="ETicket"
+    )
+    @extend_schema(
+        request=GateScanBatchSerializer,
+        responses={200: GateScanResultSerializer(many=True)},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        event_pk = self.kwargs.get("event_pk")
+        if GateScanService.get_gate_organization(event_pk) != str(self.parent_obj.pk):
+            event_pk = self.get_event().pk
+        results = GateScanService.scan(event_pk, serializer.validated_data["scans"])
+        return Response(GateScanResultSerializer(results, many=True).data, status=status.HTTP_200_OK)
+
+
+class GateManifestView(BaseGateView):
+
+    @swagger_auto_schema(
+        operation_id="Admin-Operation-Event-Gate-Manifest",
+        operation_description="Télécharger le manifeste signé des e-tickets d' un évènement pour le scan hors ligne",
+        operation_summary="ETicket"
+    )
+    @extend_schema(responses={(200, "application/octet-stream"): bytes})
+    def get(self, request, *args, **kwargs):
+        event = self.get_event()
+        response = StreamingHttpResponse(
+            GateManifestService.stream(event), content_type="application/octet-stream"
+        )
+        response["Content-Disposition"] = 'attachment; filename="%s"' % GateManifestService.get_filename(event)
+        return response
+
+
+class GateCheckInsView(BaseGateView):
+    serializer_class = GateCheckInsSerializer
+
+    @swagger_auto_schema(
+        operation_id="Admin-Operation-Event-Gate-Check-Ins",
+        operation_description="Synchroniser les passages enregistrés hors ligne par un scanner",
+        operation_summary="ETicket"
+    )
+    @extend_schema(
+        request=GateCheckInsSerializer,
+        responses={
+            202: inline_serializer(
+                name="GateCheckInsResponseSerializer",
+                fields={
+                    "accepted": serializers.IntegerField(),
+                },
+            )
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        event = self.get_event()
+        e_ticket_ids = [
+            e_ticket_id
+            for e_ticket_id in map(GateScanService.decode_id64, serializer.validated_data["checked_in"])
+            if e_ticket_id
+        ]
+        # Only the e-tickets of this event are checked in
+        e_ticket_ids = [
+            str(pk) for pk in ETicket.objects.filter(event_id=event.pk, pk__in=e_ticket_ids).values_list("pk", flat=True)
+        ] if e_ticket_ids else []
+        if e_ticket_ids:
+            GateScanService.record_check_ins(event.pk, e_ticket_ids)
+        return Response({"accepted": len(e_ticket_ids)}, status=status.HTTP_202_ACCEPTED)
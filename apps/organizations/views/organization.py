@@ -30,7 +30,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.events.filters import EventOrdering, EventSearch
-from apps.events.models import Event, ETicket, Ticket, Order
+from apps.events.models import Event, Ticket
 from apps.events.parsers import MultiPartFormParser
 from apps.events.permissions import IsPasswordConfirmed
 from apps.events.services.events import generate_stats_for_events
@@ -40,6 +40,7 @@ from apps.organizations.models import (
     OrganizationFollow,
     Role,
     OrganizationMembership,
+    OrganizationSalesRollup,
 )
 from apps.organizations.permissions import (
     IsOrganizationCoordinator,
@@ -64,11 +65,11 @@ from apps.organizations.serializers.extras import (
 )
 from apps.users.permissions import HasAppAdminPermissionFor
 from apps.users.serializers import UserSerializerLight
-from apps.utils.models import Variable
+from apps.utils.services.variables import VariableRegistry
 from apps.utils.paginator import Pagination
 from apps.utils.utils.baseviews import BaseModelsViewSet, BaseGenericViewSet
 from apps.xlib.custom_decorators import custom_paginated_response
-from apps.xlib.enums import WithdrawStatusEnum, VARIABLE_NAMES_ENUM, OrderStatusEnum
+from apps.xlib.enums import WithdrawStatusEnum, VARIABLE_NAMES_ENUM
 from apps.xlib.error_util import ErrorUtil, ErrorEnum
 
 User = get_user_model()
@@ -570,7 +571,7 @@ class OrganizationStatsViewSet(CheckParentPermissionMixin, BaseGenericViewSet):
                 )
 
         organization_financial_account = organization.get_financial_account
-        organization_balance = organization_financial_account.balance
+        organization_balance = organization_financial_account.get_balance()
 
         withdraws_list_serializer = WithdrawSerializer(
             organization.withdraws.filter(
@@ -592,51 +593,23 @@ class OrganizationStatsViewSet(CheckParentPermissionMixin, BaseGenericViewSet):
                         timestamp__range=(start_date, end_date)
                     ),
                 )
-            )
-                .prefetch_related(
-                Prefetch(
-                    "tickets__e_tickets",
-                    queryset=ETicket.objects.filter(
-                        timestamp__range=(start_date, end_date)
-                    ),
-                )
             )
                 .filter(Q(organization=organization))
         )
 
-        aggregated_data = Order.objects.select_related('item', 'item__ticket', 'item__ticket__event') \
-            .filter(timestamp__range=(start_date, end_date)) \
-            .filter(status=OrderStatusEnum.FINISHED.value, item__ticket__event__in=organization_events) \
-            .values(
-            "item__quantity",
-            "item__line_total",
-            "item__ticket__name",
-            "item__ticket__event__name",
-            "item__potential_discount_data__use_coupon"
-        )
+        aggregated_data = OrganizationSalesRollup.objects.filter(
+            organization_id=organization.pk, day__gte=start_date, day__lt=end_date
+        ).values("event__name", "ticket__name").annotate(number=Sum("quantity"), total_earn=Sum("net_earn"))
 
         event_stats = defaultdict(lambda: {})
+        total_ticket_sold = 0
 
         for entry in aggregated_data:
-            event_name = entry["item__ticket__event__name"]
-            ticket_name = entry["item__ticket__name"]
-            has_been_discounted = entry["item__potential_discount_data__use_coupon"]
-            ticket_stats = {
-                "number": entry["item__quantity"],
-                # "total_sold": entry["item__line_total"],
-                "total_earn": Decimal(entry["item__line_total"] * Decimal(
-                    1 - organization.get_retribution_percentage(has_been_discounted))).quantize(Decimal("0.01")),
+            event_stats[entry["event__name"]][entry["ticket__name"]] = {
+                "number": entry["number"],
+                "total_earn": entry["total_earn"].quantize(Decimal("0.01")),
             }
-
-            # Check if the ticket already exists in the dictionary for the event
-            if ticket_name in event_stats[event_name]:
-                # Update the existing stats
-                event_stats[event_name][ticket_name]["number"] += ticket_stats["number"]
-                # event_stats[event_name][ticket_name]["total_sold"] += ticket_stats["total_sold"]
-                event_stats[event_name][ticket_name]["total_earn"] += ticket_stats["total_earn"]
-            else:
-                # Add new ticket stats
-                event_stats[event_name][ticket_name] = ticket_stats
+            total_ticket_sold += entry["number"]
 
         data = {
             "organization_balance": organization_balance,
@@ -652,7 +625,7 @@ class OrganizationStatsViewSet(CheckParentPermissionMixin, BaseGenericViewSet):
                 "events_views": generate_stats_for_events(
                     organization, organization_events
                 ),
-                "total_ticket_sold": aggregated_data.aggregate(Sum("item__quantity"))["item__quantity__sum"],
+                "total_ticket_sold": total_ticket_sold if aggregated_data else None,
                 "ticket_sold_grouped_by_event": dict(event_stats),
             },
         }
@@ -706,14 +679,11 @@ class OrganizationStatsViewSet(CheckParentPermissionMixin, BaseGenericViewSet):
                     code=ErrorEnum.INVALID_DATE_FORMAT.value,
                 )
 
-        minimal_amount_variable = Variable.objects.get(
-            name=VARIABLE_NAMES_ENUM.MINIMAL_AMOUNT_REQUIRED_FOR_WITHDRAW.value
-        )
-        minimal_amount_valueminimal_amount_value = minimal_amount_variable.format_value(
-            minimal_amount_variable.possible_values.first().value
+        minimal_amount_valueminimal_amount_value = VariableRegistry.get(
+            VARIABLE_NAMES_ENUM.MINIMAL_AMOUNT_REQUIRED_FOR_WITHDRAW.value
         )
         data = {
-            "available_balance": financial_account.balance,
+            "available_balance": financial_account.get_balance(),
             "minimal_amount_required": minimal_amount_valueminimal_amount_value,
         }
         return Response(data, status=status.HTTP_200_OK)
@@ -9,6 +9,7 @@ from decimal import Decimal
 from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.utils import timezone
+from commons.balances import apply_balance_deltas
 from commons.models import AbstractCommonBaseModel
 
 logger = logging.getLogger(__name__)
@@ -94,6 +95,19 @@ class SellerWallet(AbstractCommonBaseModel):
     def __str__(self):
         return f"Wallet de {self.seller.user.get_full_name()} - {self.balance} F CFA"
     
+    def _apply(self, deltas: dict, minimums: dict = None, assignments: dict = None) -> bool:
+        """
+        Applique les variations de soldes en base dans un seul UPDATE ... RETURNING et
+        met à jour l' instance avec les valeurs retournées.
+        Retourne False si un des minimums n' est pas respecté ( rien n' est modifié ).
+        """
+        values = apply_balance_deltas(SellerWallet, self.pk, deltas, minimums=minimums, assignments=assignments)
+        if values is None:
+            return False
+        for field_name, value in values.items():
+            setattr(self, field_name, value)
+        return True
+    
     @transaction.atomic
     def credit(self, amount: Decimal, transaction_type: str, 
                reference: str = None, metadata: dict = None):
@@ -112,11 +126,12 @@ class SellerWallet(AbstractCommonBaseModel):
         if amount <= 0:
             raise ValueError("Le montant doit être supérieur à 0")
         
-        # Mettre à jour le solde
-        self.balance += amount
-        self.total_earned += amount
+        # Mettre à jour le solde ( une seule requête atomique, sans lecture préalable )
         self.last_transaction_at = timezone.now()
-        self.save(update_fields=["balance", "total_earned", "last_transaction_at"])
+        self._apply(
+            {"balance": amount, "total_earned": amount},
+            assignments={"last_transaction_at": self.last_transaction_at},
+        )
         
         # Créer la transaction
         wallet_transaction = WalletTransaction.objects.create(
@@ -156,22 +171,19 @@ class SellerWallet(AbstractCommonBaseModel):
         if amount <= 0:
             raise ValueError("Le montant doit être supérieur à 0")
         
-        if self.balance < amount:
+        # Mettre à jour le solde, uniquement si le solde reste positif
+        deltas = {"balance": -amount}
+        if transaction_type == WalletTransactionType.WITHDRAWAL:
+            deltas["total_withdrawn"] = amount
+        self.last_transaction_at = timezone.now()
+        if not self._apply(deltas, minimums={"balance": 0},
+                           assignments={"last_transaction_at": self.last_transaction_at}):
+            self.refresh_from_db(fields=["balance"])
             raise ValueError(
                 f"Solde insuffisant. Disponible: {self.balance} F CFA, "
                 f"Demandé: {amount} F CFA"
             )
         
-        # Mettre à jour le solde
-        self.balance -= amount
-        self.last_transaction_at = timezone.now()
-        
-        if transaction_type == WalletTransactionType.WITHDRAWAL:
-            self.total_withdrawn += amount
-            self.save(update_fields=["balance", "total_withdrawn", "last_transaction_at"])
-        else:
-            self.save(update_fields=["balance", "last_transaction_at"])
-        
         # Créer la transaction
         wallet_transaction = WalletTransaction.objects.create(
             wallet=self,
@@ -195,13 +207,9 @@ class SellerWallet(AbstractCommonBaseModel):
         Réserve un montant pour un retrait en cours.
         Le montant passe du balance au pending_balance.
         """
-        if self.balance < amount:
+        if not self._apply({"balance": -amount, "pending_balance": amount}, minimums={"balance": 0}):
             raise ValueError("Solde insuffisant pour réserver ce montant")
         
-        self.balance -= amount
-        self.pending_balance += amount
-        self.save(update_fields=["balance", "pending_balance"])
-        
         logger.info(
             f"Wallet {self.seller.pk}: {amount} F CFA réservé pour retrait "
             f"(balance: {self.balance}, pending: {self.pending_balance})"
@@ -213,13 +221,9 @@ class SellerWallet(AbstractCommonBaseModel):
         Libère un montant du pending_balance vers le balance.
         Utilisé en cas d'échec de retrait.
         """
-        if self.pending_balance < amount:
+        if not self._apply({"pending_balance": -amount, "balance": amount}, minimums={"pending_balance": 0}):
             raise ValueError("Montant pending insuffisant")
         
-        self.pending_balance -= amount
-        self.balance += amount
-        self.save(update_fields=["balance", "pending_balance"])
-        
         logger.info(
             f"Wallet {self.seller.pk}: {amount} F CFA libéré du pending "
             f"(balance: {self.balance}, pending: {self.pending_balance})"
@@ -231,13 +235,10 @@ class SellerWallet(AbstractCommonBaseModel):
         Confirme un retrait en diminuant le pending_balance.
         Le montant sort définitivement du wallet.
         """
-        if self.pending_balance < amount:
+        if not self._apply({"pending_balance": -amount, "total_withdrawn": amount},
+                           minimums={"pending_balance": 0}):
             raise ValueError("Montant pending insuffisant")
         
-        self.pending_balance -= amount
-        self.total_withdrawn += amount
-        self.save(update_fields=["pending_balance", "total_withdrawn"])
-        
         logger.info(
             f"Wallet {self.seller.pk}: retrait de {amount} F CFA confirmé "
             f"(pending: {self.pending_balance}, total retiré: {self.total_withdrawn})"
@@ -15,6 +15,7 @@ from django.core.exceptions import ValidationError
 
 from apps.events.models import Ticket, ETicket, Order, OrderItem
 from apps.events.models.tickets import Ticket as TicketModel
+from apps.events.services.inventory import TicketInventoryService, InsufficientTicketQuantity
 from apps.events.models.ticket_stock import TicketStock, StockTransaction, StockTransactionType
 from apps.users.models import Transaction
 from apps.xlib.enums import PAYMENT_METHOD, TransactionKindEnum, OrderStatusEnum, TransactionStatusEnum
@@ -58,12 +59,12 @@ def sell_tickets_by_seller(
     if stock.available_quantity < quantity:
         raise SellerSaleError("Stock insuffisant chez le vendeur.")
 
-    # Verrouille aussi le ticket/event pour décrément
-    locked_ticket = TicketModel.objects.select_for_update().get(pk=ticket.pk)
-
-    if locked_ticket.initial_quantity != -1:
-        if locked_ticket.available_quantity < quantity:
-            raise SellerSaleError("Stock insuffisant côté événement.")
+    # Décrément conditionnel du stock de l'événement, sans verrou sur la ligne du ticket
+    locked_ticket = TicketModel.objects.select_related("event").get(pk=ticket.pk)
+    try:
+        locked_ticket.available_quantity = TicketInventoryService.take(locked_ticket, quantity)
+    except InsufficientTicketQuantity:
+        raise SellerSaleError("Stock insuffisant côté événement.")
 
     # 1) OrderItem + Order
     order_item = OrderItem.objects.create(
@@ -132,34 +133,25 @@ def sell_tickets_by_seller(
         notes=notes or f"Vente par vendeur {seller.pk} / tx={tx.pk}",
     )
 
-    # 4) Stock de l'événement
-    if locked_ticket.initial_quantity != -1:
-        locked_ticket.available_quantity = F("available_quantity") - quantity
-        locked_ticket.save(update_fields=["available_quantity"])
-        locked_ticket.refresh_from_db()
-
-    # 5) Participant count
+    # 4) Participant count
     event = locked_ticket.event
     Event.objects.filter(pk=event.pk).update(
         participant_count=F("participant_count") + quantity
     )
-    # 6) Génération ETickets immédiate (QR inclus)
-    e_tickets = []
-    for i in range(quantity):
-        e = ETicket.objects.create(
-            event=event,
-            ticket=locked_ticket,
-            related_order=order,
-            expiration_date=locked_ticket.expiry_date,
-        )
-        e.generate_qr_code()
-        e_tickets.append(e)
+    # 5) Génération ETickets immédiate (QR inclus)
+    e_tickets = ETicket.bulk_generate(
+        event=event,
+        ticket=locked_ticket,
+        related_order=order,
+        quantity=quantity,
+        expiration_date=locked_ticket.expiry_date,
+    )
 
-    # 7) Order terminé
+    # 6) Order terminé
     order.status = OrderStatusEnum.FINISHED.value
     order.save(update_fields=["status"])
 
-    # 8) Crédit du wallet du vendeur (commission)
+    # 7) Crédit du wallet du vendeur (commission)
     try:
         from apps.super_sellers.services.wallet import SellerWalletService
         
@@ -186,7 +178,7 @@ def sell_tickets_by_seller(
     except Exception as e:
         logger.exception(f"Erreur lors du crédit wallet vendeur {seller.pk}: {e}")
 
-    # 9) Envoi des billets par email
+    # 8) Envoi des billets par email
     if order.email:
         try:
             # ✅ Si c'est une tâche Celery asynchrone
@@ -33,18 +33,14 @@ class SellerWalletService:
         """
         # Tenter de récupérer depuis les variables en DB
         try:
-            from apps.utils.models import Variable, VariableValue
+            from apps.utils.services.variables import VariableRegistry
             from apps.xlib.enums import VARIABLE_NAMES_ENUM
             
             # Commission vendeur
-            seller_var = Variable.objects.filter(
-                name=VARIABLE_NAMES_ENUM.PERCENTAGE_ABOUT_A_TICKET_SELLING.value
-            ).first()
-            
-            if seller_var:
-                seller_rate = Decimal(seller_var.possible_values.first().value)
-            else:
-                seller_rate = SellerWalletService.SELLER_COMMISSION_RATE
+            seller_rate = VariableRegistry.get_decimal(
+                VARIABLE_NAMES_ENUM.PERCENTAGE_ABOUT_A_TICKET_SELLING.value,
+                default=SellerWalletService.SELLER_COMMISSION_RATE,
+            )
             
             # Commission super-vendeur (peut être la même ou différente)
             super_seller_rate = SellerWalletService.SUPER_SELLER_COMMISSION_RATE
@@ -128,6 +128,7 @@ class PublicTicketViewSet(viewsets.ReadOnlyModelViewSet):
                 ticket_price=f"{ticket.price} F CFA" if ticket else "",
                 ticket_number=eticket.name.split('N° ')[-1].split(' |')[0] if 'N° ' in eticket.name else "1",
                 order_code=order.order_id,
+                persist_qr_code=True,
             )
             
             # Créer la réponse HTTP avec le PDF
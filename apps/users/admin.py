@@ -10,7 +10,9 @@ from django.contrib import admin
 
 # Register your models here.
 from apps.users.models import User, AppRole, AppPermission, Transaction, AccountValidationRequest, ResetPasswordRequest, \
-    ZoneOfInterest, PointOfInterest
+    ZoneOfInterest, PointOfInterest, PaymentWebhookEvent
+from apps.users.tasks.transactions_tasks import process_payment_webhook_events
+from apps.users.transactions.webhooks import PaymentWebhookProcessor
 from commons.admin import BaseModelAdmin
 
 
@@ -42,6 +44,22 @@ class TransactionAdmin(BaseModelAdmin):
     ordering = ['-timestamp']
 
 
+@admin.register(PaymentWebhookEvent)
+class PaymentWebhookEventAdmin(BaseModelAdmin):
+    list_filter = ('kind', 'status', 'gateway')
+    search_fields = ("gateway_id", "event_key", "name")
+
+    ordering = ['-timestamp']
+
+    actions = ['replay_events']
+
+    @admin.action(description="Rejouer les événements")
+    def replay_events(self, request, queryset):
+        for gateway_id in PaymentWebhookProcessor.replay(queryset):
+            process_payment_webhook_events.delay(gateway_id)
+        self.message_user(request, f"{queryset.count()} événements remis en traitement.")
+
+
 @admin.register(AccountValidationRequest)
 class AccountValidationRequestAdmin(BaseModelAdmin):
     pass
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class LazyJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT sans requête sur l' utilisateur.
+
+    `request.user` est une instance de User construite depuis les claims du token ( CLAIM_FIELDS ), les autres
+    champs sont différés : le premier accès à l' un d' eux charge toute la ligne en une requête
+    ( `User.refresh_from_db` ). Les vues qui ne lisent que les claims ( permissions d' admin, accès aux
+    organisations, filtres sur `user` ) n' interrogent donc plus la table des utilisateurs.
+
+    Toute sauvegarde d' un utilisateur touchant ses claims avance `User.tokens_valid_after` ; les tokens aux
+    claims antérieurs, ceux sans claims ( émis avant ce backend ) ou d' un compte inactif passent par le
+    chargement habituel de simplejwt. Le cache n' est qu' une copie de cette date : une entrée absente est relue
+    sur la ligne, un cache indisponible périme les claims. Les `QuerySet.update()` sur User ne l' avancent pas.
+    """
+
+    # User.TOKEN_CLAIM_FIELDS
+    CLAIM_FIELDS = {
+        "isActive": "is_active",
+        "isStaff": "is_staff",
+        "isSuperuser": "is_superuser",
+        "isAppAdmin": "is_app_admin",
+        "roleId": "role_id",
+    }
+    CLAIMS_ISSUED_AT = "claimsIssuedAt"
+    CACHE_KEY_PREFIX = "auth_tokens_valid_after:"
+    CACHE_TIMEOUT = 5 * 60
+
+    @classmethod
+    def _valid_after_key(cls, user_id) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}{user_id}"
+
+    @classmethod
+    def store_tokens_valid_after(cls, user):
+        """
+            Copy `user.tokens_valid_after` in the cache.
+        """
+        valid_after = user.tokens_valid_after
+        try:
+            cache.set(cls._valid_after_key(user.pk), valid_after.timestamp() if valid_after else 0, cls.CACHE_TIMEOUT)
+        except Exception as exc:
+            logger.warning(f"Token claims cache unavailable: {exc}")
+
+    @classmethod
+    def forget_tokens_valid_after(cls, user_id):
+        try:
+            cache.delete(cls._valid_after_key(user_id))
+        except Exception as exc:
+            logger.warning(f"Token claims cache unavailable: {exc}")
+
+    @classmethod
+    def get_tokens_valid_after(cls, user_id) -> float:
+        """
+        :return: the timestamp before which the claims of the user are outdated, infinite for an unknown user
+        """
+        key = cls._valid_after_key(user_id)
+        valid_after = cache.get(key)
+        if valid_after is None:
+            row = User._base_manager.filter(pk=user_id).values_list("tokens_valid_after", flat=True)
+            if not row:
+                return float("inf")
+            valid_after = row[0].timestamp() if row[0] else 0
+            # add: a concurrent save has already stored the new value
+            cache.add(key, valid_after, cls.CACHE_TIMEOUT)
+        return valid_after
+
+    @classmethod
+    def claims_outdated(cls, token) -> bool:
+        issued_at = token.get(cls.CLAIMS_ISSUED_AT)
+        if issued_at is None:
+            return True
+        try:
+            return cls.get_tokens_valid_after(token.get(api_settings.USER_ID_CLAIM)) >= issued_at
+        except Exception as exc:
+            logger.warning(f"Token claims cache unavailable: {exc}")
+            return True
+
+    @classmethod
+    def set_claims(cls, token, user):
+        for claim, field_name in cls.CLAIM_FIELDS.items():
+            value = getattr(user, field_name)
+            token[claim] = str(value) if field_name == "role_id" and value is not None else value
+        token[cls.CLAIMS_ISSUED_AT] = time.time()
+
+    def get_claims_user(self, validated_token):
+        """
+        :return: the user built from the claims, None when the claims can not be trusted
+        """
+        if any(claim not in validated_token for claim in self.CLAIM_FIELDS):
+            return None
+        if not validated_token.get(api_settings.USER_ID_CLAIM) or self.claims_outdated(validated_token):
+            return None
+
+        claims = {api_settings.USER_ID_FIELD: validated_token[api_settings.USER_ID_CLAIM]}
+        for claim, field_name in self.CLAIM_FIELDS.items():
+            claims[field_name] = validated_token[claim]
+        if not claims["is_active"]:
+            return None
+
+        fields = [field for field in User._meta.concrete_fields if field.attname in claims]
+        try:
+            values = [field.to_python(claims[field.attname]) for field in fields]
+        except Exception as exc:
+            logger.warning(f"Invalid token claims: {exc}")
+            return None
+        user = User.from_db(router.db_for_read(User), [field.attname for field in fields], values)
+        # Untouched claims are replaced by their stored value when the row is loaded
+        user._token_claims = {field.attname: value for field, value in zip(fields, values)}
+        return user
+
+    def get_user(self, validated_token):
+        return self.get_claims_user(validated_token) or super().get_user(validated_token)
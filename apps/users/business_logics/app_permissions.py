@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+# Matrice publiée d' un bloc : une lecture ne mélange jamais deux versions
+MatrixSnapshot = namedtuple("MatrixSnapshot", ["version", "roles", "bits"])
+
+
+class AppPermissionMatrix:
+    """
+    Matrice des permissions d' administration : rôle -> ensemble des codenames.
+
+    Chargée une fois par processus ( deux requêtes ), rechargée quand un signal sur AppRole / AppPermission
+    change la version partagée dans le cache ; chaque processus la relit au plus toutes les CHECK_INTERVAL secondes.
+
+    Les permissions d' un rôle peuvent aussi être embarquées dans le JWT sous forme de bitset :
+    "<version>.<role_id>.<hex>", le bit n correspondant au n-ième codename trié. Le claim n' est lu que si sa
+    version est celle de la matrice courante et son rôle celui de l' utilisateur, sinon la matrice fait foi.
+    """
+
+    CLAIM_NAME = "appPermissions"
+    CACHE_KEY = "app_permission_matrix:version"
+    CHECK_INTERVAL = 30
+
+    _lock = threading.Lock()
+    _snapshot = None
+    _shared_version = None
+    _checked_at = 0.0
+    _stale = False
+
+    @classmethod
+    def _load(cls):
+        from apps.users.models import AppPermission, AppRole
+
+        codenames = sorted(AppPermission.objects.values_list("codename", flat=True))
+        roles = {}
+        for role_id, codename in AppRole.permissions.through.objects.filter(
+                approle__is_deleted=False, apppermission__is_deleted=False
+        ).values_list("approle_id", "apppermission__codename"):
+            roles.setdefault(str(role_id), set()).add(codename)
+
+        digest = hashlib.sha1(repr((codenames, sorted((role, sorted(perms)) for role, perms in roles.items())))
+                              .encode()).hexdigest()
+        cls._snapshot = MatrixSnapshot(
+            version=digest[:8],
+            roles={role: frozenset(perms) for role, perms in roles.items()},
+            bits={codename: index for index, codename in enumerate(codenames)},
+        )
+
+    @classmethod
+    def _get_shared_version(cls):
+        try:
+            return cache.get(cls.CACHE_KEY)
+        except Exception as exc:
+            logger.warning(f"App permission matrix version unavailable: {exc}")
+            return cls._shared_version
+
+    @classmethod
+    def _get_snapshot(cls) -> MatrixSnapshot:
+        now = time.monotonic()
+        snapshot = cls._snapshot
+        if snapshot is not None and not cls._stale and now - cls._checked_at < cls.CHECK_INTERVAL:
+            return snapshot
+        with cls._lock:
+            if cls._snapshot is not None and not cls._stale and now - cls._checked_at < cls.CHECK_INTERVAL:
+                return cls._snapshot
+            shared_version = cls._get_shared_version()
+            if cls._snapshot is None or cls._stale or shared_version != cls._shared_version:
+                cls._stale = False
+                cls._load()
+                cls._shared_version = shared_version
+            cls._checked_at = now
+            return cls._snapshot
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Reload the matrix in this process right away, and in the others at their next check.
+        """
+        try:
+            cache.set(cls.CACHE_KEY, time.time_ns(), None)
+        except Exception as exc:
+            logger.warning(f"App permission matrix version unavailable: {exc}")
+        # The current matrix keeps serving the concurrent readers until the reload
+        cls._stale = True
+
+    @classmethod
+    def get_version(cls) -> str:
+        return cls._get_snapshot().version
+
+    @classmethod
+    def get_role_permissions(cls, role_id) -> frozenset:
+        return cls._get_snapshot().roles.get(str(role_id), frozenset())
+
+    @classmethod
+    def role_has(cls, role_id, codename: str) -> bool:
+        return codename in cls.get_role_permissions(role_id)
+
+    @classmethod
+    def encode(cls, role_id) -> str:
+        """
+        :return: the bitset claim of the permissions of the role
+        """
+        snapshot = cls._get_snapshot()
+        bitset = 0
+        for codename in snapshot.roles.get(str(role_id), frozenset()):
+            bitset |= 1 << snapshot.bits[codename]
+        return f"{snapshot.version}.{role_id}.{bitset:x}"
+
+    @classmethod
+    def claim_has(cls, claim, role_id, codename: str):
+        """
+        :return: the answer of the claim, None when the claim is missing, outdated or issued for another role
+        """
+        if not claim or not isinstance(claim, str) or claim.count(".") != 2:
+            return None
+        version, claim_role_id, bitset = claim.split(".")
+        snapshot = cls._get_snapshot()
+        if version != snapshot.version or claim_role_id != str(role_id):
+            return None
+        index = snapshot.bits.get(codename)
+        if index is None:
+            return False
+        try:
+            return bool(int(bitset, 16) >> index & 1)
+        except ValueError:
+            return None
@@ -0,0 +1,40 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_datetime
+
+from apps.users.models import PaymentWebhookEvent
+from apps.users.tasks.transactions_tasks import process_payment_webhook_events
+from apps.users.transactions.webhooks import PaymentWebhookProcessor
+from apps.xlib.enums import WebhookEventStatusEnum
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = """
+    Put stored payment webhook events back in the processing queue
+    cmd_sample:
+        pym replay_payment_webhooks
+        pym replay_payment_webhooks --status FAILED IGNORED --since 2026-10-17T00:00:00
+        pym replay_payment_webhooks --gateway-id 98446301
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--status", nargs="+", default=[WebhookEventStatusEnum.FAILED.value],
+                            choices=WebhookEventStatusEnum.values())
+        parser.add_argument("--gateway-id", type=str, default=None)
+        parser.add_argument("--since", type=str, default=None)
+
+    def handle(self, **options):
+        events = PaymentWebhookEvent.objects.filter(status__in=options["status"])
+        if options["gateway_id"]:
+            events = events.filter(gateway_id=options["gateway_id"])
+        if options["since"]:
+            events = events.filter(timestamp__gte=parse_datetime(options["since"]))
+
+        gateway_ids = PaymentWebhookProcessor.replay(events)
+        for gateway_id in gateway_ids:
+            process_payment_webhook_events.delay(gateway_id)
+
+        self.stdout.write(self.style.SUCCESS(f"\n \n Events of {len(gateway_ids)} transactions queued again. \n \n "))
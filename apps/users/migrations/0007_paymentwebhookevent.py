@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-17 15:05
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_register_from'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentWebhookEvent',
+            fields=[
+                ('is_deleted', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True, verbose_name="Date d' ajout")),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('active', models.BooleanField(default=True, verbose_name="Désigne si l' instance est active")),
+                ('kind', models.CharField(choices=[('PAYMENT', 'PAYMENT'), ('WITHDRAW', 'WITHDRAW')], max_length=20, verbose_name="Type d' événement")),
+                ('gateway', models.CharField(choices=[('FEDAPAY', 'FEDAPAY'), ('PAYSTACK', 'PAYSTACK'), ('STRIPE', 'STRIPE'), ('MANUAL', 'MANUAL'), ('INTERNAL_AUTO', 'INTERNAL_AUTO'), ('FREE_SHIPPING', 'FREE_SHIPPING')], default='FEDAPAY', max_length=255, verbose_name='Passerelle')),
+                ('event_key', models.CharField(max_length=255, unique=True, verbose_name="Clé unique de l' événement")),
+                ('name', models.CharField(max_length=120, verbose_name="Nom de l' événement")),
+                ('gateway_id', models.CharField(max_length=255, verbose_name='Approbation du réseau (ID)')),
+                ('payload', models.JSONField(verbose_name='Données reçues')),
+                ('status', models.CharField(choices=[('RECEIVED', 'RECEIVED'), ('PROCESSED', 'PROCESSED'), ('IGNORED', 'IGNORED'), ('FAILED', 'FAILED')], default='RECEIVED', max_length=20, verbose_name='Statut')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Nombre de traitements')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de traitement')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Erreur')),
+            ],
+            options={
+                'verbose_name': 'Événement de paiement',
+                'verbose_name_plural': 'Événements de paiement',
+                'indexes': [models.Index(fields=['gateway_id', 'status', 'timestamp'], name='payment_webhook_pending_idx'), models.Index(fields=['status', 'timestamp'], name='payment_webhook_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:00
+
+import django.contrib.gis.db.models.fields
+from django.contrib.gis.geos import Point
+from django.db import migrations, models
+
+
+def fill_location_geography(apps, schema_editor):
+    PointOfInterest = apps.get_model('users', 'PointOfInterest')
+    if getattr(schema_editor.connection.ops, 'postgis', False):
+        schema_editor.execute(
+            f"UPDATE {PointOfInterest._meta.db_table} "
+            f"SET location_geography = ST_SetSRID(ST_MakePoint(location_long, location_lat), 4326)::geography"
+        )
+        return
+    for poi in PointOfInterest.objects.iterator(chunk_size=2000):
+        poi.location_geography = Point(poi.location_long, poi.location_lat, srid=4326)
+        poi.save(update_fields=['location_geography'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_paymentwebhookevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pointofinterest',
+            name='location_geography',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, geography=True, null=True, srid=4326, verbose_name='Coordonnées ( geography )'),
+        ),
+        migrations.AddIndex(
+            model_name='pointofinterest',
+            index=models.Index(fields=['location_lat', 'location_long'], name='poi_lat_long_idx'),
+        ),
+        migrations.RunPython(fill_location_geography, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_pointofinterest_location_geography'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymentwebhookevent',
+            name='retry_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Date du prochain traitement'),
+        ),
+    ]
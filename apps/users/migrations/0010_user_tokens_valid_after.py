@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_paymentwebhookevent_retry_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='tokens_valid_after',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Date à partir de laquelle les claims des tokens émis sont valides'),
+        ),
+    ]
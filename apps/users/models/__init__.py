@@ -4,3 +4,4 @@ from apps.users.models.transactions import *
 from apps.users.models.app_permissions import AppPermission
 from apps.users.models.app_roles import AppRole
 from apps.users.models.users import *
+from apps.users.models.webhooks import *
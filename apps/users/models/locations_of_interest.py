@@ -11,7 +11,7 @@ import logging
 from django.contrib.gis.db import models as gis_model
 from django.db import models
 
-from apps.utils.managers import GeoModelManager
+from apps.utils.managers import GeoModelManager, geography_point
 from commons.models import AbstractCommonBaseModel
 
 logger = logging.getLogger(__name__)
@@ -28,6 +28,9 @@ class PointOfInterest(AbstractCommonBaseModel):
         verbose_name="Longitude du lieu", default=0)
     location = gis_model.PointField(
         verbose_name='Coordonnées', blank=False, null=True, srid=4326)
+    # ( longitude, latitude ) en geography : distances en mètres, index GiST pour les recherches de proximité
+    location_geography = gis_model.PointField(
+        verbose_name='Coordonnées ( geography )', geography=True, blank=True, null=True, srid=4326)
     approximate_distance = models.FloatField(
         verbose_name='Distance de verification en mètre', default=100000)
     allow_notifications = models.BooleanField(
@@ -37,9 +40,19 @@ class PointOfInterest(AbstractCommonBaseModel):
     def __str__(self) -> str:
         return f'Point d\'intérêt de {self.user}'
 
+    def save(self, *args, **kwargs):
+        self.location_geography = geography_point(self.location_lat, self.location_long)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"location_lat", "location_long"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"location_geography"}
+        return super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Point Géographique d'intérêt"
         verbose_name_plural = "Point Géographique d'intérêt"
+        indexes = [
+            models.Index(fields=["location_lat", "location_long"], name="poi_lat_long_idx"),
+        ]
 
 
 class ZoneOfInterest(AbstractCommonBaseModel):
@@ -93,8 +93,14 @@ class User(AbstractBaseUser, PermissionsMixin):
         max_length=128, blank=True, null=True,
         verbose_name="Désigne la source d'inscription"
     )
+    tokens_valid_after = models.DateTimeField(
+        blank=True, null=True, editable=False,
+        verbose_name="Date à partir de laquelle les claims des tokens émis sont valides"
+    )
 
     USERNAME_FIELD = 'admin_id'
+    # Fields copied in the JWT claims, see LazyJWTAuthentication
+    TOKEN_CLAIM_FIELDS = ("is_active", "is_staff", "is_superuser", "is_app_admin", "role_id")
     REQUIRED_FIELDS = ['first_name', 'last_name', 'email']
 
     class Meta:
@@ -147,37 +153,41 @@ class User(AbstractBaseUser, PermissionsMixin):
         self.save()
 
     def save(self, *args, **kwargs):
+        # User built from the JWT claims: the untouched claims are reloaded, they are not saved from the token
+        if "_token_claims" in self.__dict__:
+            self.refresh_from_db()
         if self.admin_id == "" or not self.admin_id:
             self.admin_id = get_random_string(12)
 
+        # The claims of the tokens issued before this save can not be trusted anymore
+        update_fields = kwargs.get("update_fields")
+        if not self._state.adding and (
+                update_fields is None or {*self.TOKEN_CLAIM_FIELDS, "role"} & set(update_fields)):
+            self.tokens_valid_after = timezone.now()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "tokens_valid_after"}
+
         super(User, self).save(*args, **kwargs)
 
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # User built from the JWT claims ( LazyJWTAuthentication ): the first access to a deferred field loads
+        # every deferred field, and the claims the view has not changed, in one query
+        claims = self.__dict__.pop("_token_claims", None)
+        if claims is not None:
+            fields = list(set(fields or ()) | self.get_deferred_fields() | {
+                name for name, value in claims.items() if self.__dict__.get(name) == value
+            })
+        super(User, self).refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
     def check_organization_access(self, organization, role='MEMBER'):
-        membership_queryset = self.memberships.filter(
-            organization=organization)
-        if not membership_queryset.exists():
-            return False
-        total_weight = sum([int(element) for element in list(
-            membership_queryset.first().roles.values_list('weight', flat=True))])
-        if role == 'MEMBER':
-            return total_weight >= 1
-        if role == 'COORDINATOR':
-            return total_weight >= 2
+        from apps.organizations.services.access import OrganizationAccessContext
+
+        return OrganizationAccessContext.of(organization).has_access(self, role)
 
     def get_user_role_for_organization(self, organization) -> Literal["OWNER", "MEMBER", "COORDINATOR", None]:
-        if organization.owner == self:
-            return 'OWNER'
-        membership_queryset = self.memberships.filter(
-            organization=organization)
-        if not membership_queryset.exists():
-            return None
-        total_weight = sum([int(element) for element in list(
-            membership_queryset.first().roles.values_list('weight', flat=True))])
-        if total_weight < 2:
-            return 'MEMBER'
-        if total_weight >= 2:
-            return 'COORDINATOR'
-        return None
+        from apps.organizations.services.access import OrganizationAccessContext
+
+        return OrganizationAccessContext.of(organization).get_role(self)
 
     @property
     def has_app_admin_access(self):
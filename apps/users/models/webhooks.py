@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import hashlib
+import json
+import logging
+
+from django.db import models
+
+from apps.xlib.enums import TRANSACTIONS_POSSIBLE_GATEWAYS, WebhookEventKindEnum, WebhookEventStatusEnum
+from commons.models import AbstractCommonBaseModel
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class PaymentWebhookEvent(AbstractCommonBaseModel):
+    """
+    Événement brut reçu d' une passerelle de paiement.
+
+    Enregistré tel quel à la réception puis appliqué à sa transaction de manière asynchrone.
+    `event_key` est unique : un événement rejoué par la passerelle n' est enregistré et appliqué qu' une fois.
+    Un traitement en échec ( transaction introuvable, erreur ) est retenté à `retry_at`, jusqu' à MAX_ATTEMPTS.
+    """
+
+    kind = models.CharField(verbose_name="Type d' événement", max_length=20, choices=WebhookEventKindEnum.items())
+    gateway = models.CharField(verbose_name="Passerelle", max_length=255, choices=TRANSACTIONS_POSSIBLE_GATEWAYS.items(),
+                               default=TRANSACTIONS_POSSIBLE_GATEWAYS.FEDAPAY.value)
+    event_key = models.CharField(verbose_name="Clé unique de l' événement", max_length=255, unique=True)
+    name = models.CharField(verbose_name="Nom de l' événement", max_length=120)
+    gateway_id = models.CharField(verbose_name="Approbation du réseau (ID)", max_length=255)
+    payload = models.JSONField(verbose_name="Données reçues")
+    status = models.CharField(verbose_name="Statut", max_length=20, choices=WebhookEventStatusEnum.items(),
+                              default=WebhookEventStatusEnum.RECEIVED.value)
+    attempts = models.PositiveIntegerField(verbose_name="Nombre de traitements", default=0)
+    processed_at = models.DateTimeField(verbose_name="Date de traitement", blank=True, null=True)
+    retry_at = models.DateTimeField(verbose_name="Date du prochain traitement", blank=True, null=True)
+    error = models.TextField(verbose_name="Erreur", blank=True, default="")
+
+    class Meta:
+        verbose_name = "Événement de paiement"
+        verbose_name_plural = "Événements de paiement"
+        indexes = [
+            models.Index(fields=["gateway_id", "status", "timestamp"], name="payment_webhook_pending_idx"),
+            models.Index(fields=["status", "timestamp"], name="payment_webhook_status_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} | {self.gateway_id} | {self.status}"
+
+    @staticmethod
+    def make_event_key(gateway: str, data: dict) -> str:
+        """
+            Identify an event: the gateway event id when there is one, otherwise the event name and the state of
+            its entity, so that a replay of the same notification gives the same key.
+        """
+        if data.get("id"):
+            return f"{gateway}:{data['id']}"
+        entity = data.get("entity", {}) or {}
+        raw = json.dumps(
+            [data.get("name"), entity.get("id"), entity.get("status"), entity.get("updated_at")], default=str
+        )
+        return f"{gateway}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    @classmethod
+    def ingest(cls, kind: str, data: dict, gateway: str = TRANSACTIONS_POSSIBLE_GATEWAYS.FEDAPAY.value):
+        """
+            Store a raw webhook event once.
+        :return: ( event, created ), created is False for a replayed event
+        """
+        return cls.global_objects.get_or_create(
+            event_key=cls.make_event_key(gateway, data),
+            defaults={
+                "kind": kind,
+                "gateway": gateway,
+                "name": data.get("name", ""),
+                "gateway_id": str((data.get("entity", {}) or {}).get("id", "")),
+                "payload": data,
+            },
+        )
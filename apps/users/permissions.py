@@ -11,7 +11,7 @@ import typing
 from django.http import HttpRequest
 from rest_framework import permissions
 
-from apps.users.models import AppPermission
+from apps.users.business_logics.app_permissions import AppPermissionMatrix
 
 
 class IsCreator(permissions.BasePermission):
@@ -26,11 +26,18 @@ class HasAppAdminPermissionFor(permissions.BasePermission):
         self.codename = codename
 
     def has_permission(self, request, view):
-        if not request.user or not request.user.has_app_admin_access:
+        user = request.user
+        if not user or not user.is_authenticated or not user.is_app_admin or not user.role_id:
             return False
-        queryset = AppPermission.objects.get(codename=self.codename).app_roles.filter(pk=request.user.role_id)
 
-        if _has_access := queryset.exists():
+        # Bitset du JWT si sa version est à jour, sinon la matrice du processus : aucune requête dans les deux cas
+        token = getattr(request, "auth", None)
+        claim = token.get(AppPermissionMatrix.CLAIM_NAME) if token is not None else None
+        _has_access = AppPermissionMatrix.claim_has(claim, user.role_id, self.codename)
+        if _has_access is None:
+            _has_access = AppPermissionMatrix.role_has(user.role_id, self.codename)
+
+        if _has_access:
             request.from_admin = True
         return _has_access
 
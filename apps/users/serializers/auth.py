@@ -14,7 +14,9 @@ from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken, TokenError
 
 from apps.notifications.models import MobileDevice
+from apps.users.authentication import LazyJWTAuthentication
 from apps.users.backend import EmailOrPhoneAuthenticationBackend
+from apps.users.business_logics.app_permissions import AppPermissionMatrix
 from apps.users.models import (
     User,
 )
@@ -107,6 +109,13 @@ class TokenObtainPairSerializer(TokenObtainSerializer):
         
         # Add user role
         token['role'] = user.role.label if user.role else None
+
+        # Add app admin permissions, as a bitset
+        if user.is_app_admin and user.role_id:
+            token[AppPermissionMatrix.CLAIM_NAME] = AppPermissionMatrix.encode(user.role_id)
+
+        # Add the fields of the user built from the token, see LazyJWTAuthentication
+        LazyJWTAuthentication.set_claims(token, user)
         return token
 
     def validate(self, attrs):
@@ -134,17 +143,21 @@ class TokenObtainPairSerializer(TokenObtainSerializer):
 class TokenRefreshSerializer(serializers.Serializer):
     refresh = serializers.CharField()
     access = serializers.CharField(read_only=True)
+    # slim: only the tokens are returned, the user is loaded only when the claims of the token are outdated
+    slim = serializers.BooleanField(required=False, default=False, write_only=True)
     token_class = RefreshToken
 
     def validate(self, attrs):
         refresh = self.token_class(attrs["refresh"])
-        try:
-            user = User.objects.get(pk=refresh.payload["user_id"])
-        except:
-            raise ValueError("Cet Utilisateur n'existe pas ")
-        user_serializer = UserSerializer(
-            user, context={"request": self.context["request"]}
-        )
+        claims_outdated = LazyJWTAuthentication.claims_outdated(refresh)
+        user = None
+        if not attrs.get("slim") or claims_outdated:
+            try:
+                user = User.objects.get(pk=refresh.payload["user_id"])
+            except:
+                raise ValueError("Cet Utilisateur n'existe pas ")
+        if claims_outdated:
+            LazyJWTAuthentication.set_claims(refresh, user)
         data = {"access": str(refresh.access_token)}
 
         if api_settings.ROTATE_REFRESH_TOKENS:
@@ -162,7 +175,8 @@ class TokenRefreshSerializer(serializers.Serializer):
             refresh.set_iat()
 
             data["refresh"] = str(refresh)
-        data["user"] = user_serializer.data
+        if not attrs.get("slim"):
+            data["user"] = UserSerializer(user, context={"request": self.context["request"]}).data
 
         return data
 
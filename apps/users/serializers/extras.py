@@ -4,8 +4,6 @@ from apps.users.serializers import UserSerializer
 from apps.users.models import User
 from apps.xlib.enums import AppRolesEnum
 
-from django.utils import timezone
-
 
 class AuthResponseTypeSerializer(serializers.Serializer):
     refresh = serializers.CharField()
@@ -51,12 +49,4 @@ class UserOrganizationInfoSerializer(serializers.ModelSerializer):
 
     def _check_subscription(self, organization):
         """Vérifie si l'abonnement est actif"""
-        if not hasattr(organization, 'subscriptions'):
-            return False
-            
-        now = timezone.now().date()
-        return any(
-            sub.active_status and 
-            sub.start_date <= now <= sub.end_date
-            for sub in organization.subscriptions.all()
-        )
\ No newline at end of file
+        return organization.have_active_subscription
@@ -1,12 +1,16 @@
 import logging
 
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 from apps.events.models import Order, EventHighlighting
+from apps.events.services.inventory import TicketInventoryService
 from apps.notifications import tasks as notification_tasks
 from apps.organizations.models import Subscription, Withdraw
-from apps.users.models import Transaction
+from apps.organizations.services.subscriptions import SubscriptionStatusEngine
+from apps.users.authentication import LazyJWTAuthentication
+from apps.users.business_logics.app_permissions import AppPermissionMatrix
+from apps.users.models import AppPermission, AppRole, Transaction, User
 from apps.users.utils.transactions import update_coupon_related_to_transaction_usage
 from apps.xlib.enums import TransactionStatusEnum, TransactionKindEnum, OrderStatusEnum, DISCOUNT_USE_ENTITY_TYPES_ENUM
 
@@ -33,8 +37,7 @@ def handle_payment_transaction(sender, instance, created, **kwargs):
             # Case Subscriptions
             case TransactionKindEnum.SUBSCRIPTION.value:
                 subscription = Subscription.objects.select_related("organization").get(pk=instance.entity_id)
-                subscription.active_status = instance.paid
-                subscription.save(update_fields=['active_status'])
+                SubscriptionStatusEngine.record_payment(subscription.pk, instance.paid)
 
                 message = f"Votre paiement pour {subscription.get_entity_info['name']} a " \
                           f"{'été bien traité.' if instance.paid else 'échoué, veuillez réessayer ultérieurement.'}"
@@ -72,6 +75,9 @@ def handle_payment_transaction(sender, instance, created, **kwargs):
 
                     update_coupon_related_to_transaction_usage(instance, order.item.ticket.organization_id,
                                                                DISCOUNT_USE_ENTITY_TYPES_ENUM.USER.value)
+                else:
+                    # Failed or cancelled payment, the held tickets are put back on sale
+                    TicketInventoryService.release_for_order(order)
 
                 message = f"Votre paiement pour la commande N° {order.order_id}" \
                           f" a {'été bien traité.' if instance.paid else 'échoué, veuillez réessayer ultérieurement.'}"
@@ -97,6 +103,31 @@ def handle_payment_transaction(sender, instance, created, **kwargs):
             is_success=instance.paid
         )
 
+
+@receiver(post_save, sender=AppRole)
+@receiver(post_delete, sender=AppRole)
+@receiver(post_save, sender=AppPermission)
+@receiver(post_delete, sender=AppPermission)
+def invalidate_app_permission_matrix(sender, **kwargs):
+    AppPermissionMatrix.invalidate()
+
+
+@receiver(m2m_changed, sender=AppRole.permissions.through)
+def invalidate_app_permission_matrix_on_roles_permissions_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        AppPermissionMatrix.invalidate()
+
+
+@receiver(post_save, sender=User)
+def store_user_tokens_valid_after(sender, instance, created, **kwargs):
+    if not created:
+        LazyJWTAuthentication.store_tokens_valid_after(instance)
+
+
+@receiver(post_delete, sender=User)
+def forget_user_tokens_valid_after(sender, instance, **kwargs):
+    LazyJWTAuthentication.forget_tokens_valid_after(instance.pk)
+
 #
 # @receiver(post_save)
 # def handle_withdraw_transaction(sender, instance, created, **kwargs):
@@ -1,4 +1,6 @@
 from .transactions_tasks import *
 
 __all__ = [
+    "process_payment_webhook_events",
+    "process_stale_payment_webhook_events",
 ]
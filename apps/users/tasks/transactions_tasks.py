@@ -6,6 +6,21 @@ Created on July, 26 2022
     Wesley Eliel MONTCHO, alias DevBackend7
 """
 
+from celery import shared_task
 from celery.utils.log import get_task_logger
 
+from apps.users.transactions.webhooks import PaymentWebhookProcessor
+
 logger = get_task_logger(__name__)
+
+
+@shared_task()
+def process_payment_webhook_events(gateway_id):
+    handled = PaymentWebhookProcessor.process_transaction_events(gateway_id)
+    logger.info(f'{handled} webhook events handled for transaction {gateway_id}')
+
+
+@shared_task()
+def process_stale_payment_webhook_events():
+    for gateway_id in PaymentWebhookProcessor.get_stale_gateway_ids():
+        process_payment_webhook_events.delay(gateway_id)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Tests de l' authentification JWT sans requête sur l' utilisateur ( LazyJWTAuthentication ).
+
+Ils vérifient que :
+
+1. L' utilisateur construit depuis les claims charge ses autres champs en une requête
+2. Sa sauvegarde n' écrase pas la ligne avec les claims du token
+3. Un compte désactivé n' est plus authentifié avec ses anciens tokens
+4. La perte du cache ne rend pas valides des claims périmés
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from apps.users.authentication import LazyJWTAuthentication
+from apps.users.serializers.auth import TokenObtainPairSerializer, TokenRefreshSerializer
+
+User = get_user_model()
+
+LOCAL_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class LazyJWTAuthenticationTest(TestCase):
+    """Suite de tests de l' utilisateur construit depuis les claims du token."""
+
+    def setUp(self):
+        """Initialisation des données de test."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="User",
+        )
+        self.authentication = LazyJWTAuthentication()
+
+    def get_access_token(self, user=None):
+        refresh = TokenObtainPairSerializer.get_token(user or self.user)
+        return self.authentication.get_validated_token(str(refresh.access_token))
+
+    def test_user_is_built_from_the_claims(self):
+        """Aucune requête sur les utilisateurs une fois la date de validité en cache."""
+        token = self.get_access_token()
+        self.authentication.get_user(token)
+
+        with self.assertNumQueries(0):
+            user = self.authentication.get_user(token)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertTrue(user.is_active)
+        self.assertFalse(user.is_staff)
+
+    def test_deferred_fields_are_loaded_in_one_query(self):
+        """Le premier champ différé lu charge toute la ligne."""
+        token = self.get_access_token()
+        user = self.authentication.get_user(token)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.first_name, "Test")
+        with self.assertNumQueries(0):
+            self.assertEqual(user.email, "test@example.com")
+            self.assertEqual(user.last_name, "User")
+
+    def test_save_does_not_write_the_claims_back(self):
+        """Les claims que la vue n' a pas modifiés sont relus avant la sauvegarde."""
+        token = self.get_access_token()
+        user = self.authentication.get_user(token)
+        # Changement sans sauvegarde du modèle, donc sans avancer la date de validité des claims
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+
+        user.phone_number_validated = True
+        user.save()
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_staff)
+        self.assertTrue(self.user.phone_number_validated)
+
+    def test_save_outdates_the_claims(self):
+        """Un changement de claims sauvegardé est lu par les tokens déjà émis."""
+        token = self.get_access_token()
+        self.user.is_staff = True
+        self.user.save()
+
+        user = self.authentication.get_user(token)
+        self.assertTrue(user.is_staff)
+
+    def test_deactivated_user_is_rejected(self):
+        """Les anciens tokens d' un compte désactivé ne l' authentifient plus."""
+        token = self.get_access_token()
+        self.authentication.get_user(token)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(token)
+
+    def test_cache_loss_keeps_the_claims_outdated(self):
+        """La date de validité est relue sur la ligne quand le cache l' a perdue."""
+        token = self.get_access_token()
+        self.user.is_staff = True
+        self.user.save()
+        cache.clear()
+
+        self.assertTrue(LazyJWTAuthentication.claims_outdated(token))
+        self.assertTrue(self.authentication.get_user(token).is_staff)
+
+    def test_unavailable_cache_outdates_the_claims(self):
+        """Un cache indisponible fait passer par le chargement de l' utilisateur."""
+        token = self.get_access_token()
+        with mock.patch("apps.users.authentication.cache.get", side_effect=ConnectionError):
+            self.assertTrue(LazyJWTAuthentication.claims_outdated(token))
+
+    def test_deleted_user_claims_are_outdated(self):
+        """Les tokens d' un utilisateur supprimé ne sont plus acceptés sur leurs claims."""
+        token = self.get_access_token()
+        self.authentication.get_user(token)
+        self.user.delete()
+
+        self.assertTrue(LazyJWTAuthentication.claims_outdated(token))
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(token)
+
+    def test_slim_refresh_stamps_the_current_claims(self):
+        """Le rafraîchissement allégé relit l' utilisateur quand ses claims sont périmés."""
+        refresh = TokenObtainPairSerializer.get_token(self.user)
+        self.user.is_staff = True
+        self.user.save()
+        cache.clear()
+
+        serializer = TokenRefreshSerializer(data={"refresh": str(refresh), "slim": True}, context={"request": None})
+        serializer.is_valid(raise_exception=True)
+        token = self.authentication.get_validated_token(serializer.validated_data["access"])
+
+        self.assertTrue(token["isStaff"])
+        self.assertFalse(LazyJWTAuthentication.claims_outdated(token))
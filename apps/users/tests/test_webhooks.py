@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""Tests du traitement des webhooks de paiement ( PaymentWebhookProcessor ).
+
+Ils vérifient que :
+
+1. Un événement renvoyé par la passerelle n' est appliqué qu' une fois
+2. Un événement en échec est retenté, et repris tout de suite si la passerelle le renvoie
+3. Les événements d' une transaction sont appliqués dans leur ordre de réception
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.users.models import PaymentWebhookEvent, Transaction
+from apps.users.transactions.webhooks import PaymentWebhookProcessor
+from apps.xlib.enums import (
+    TransactionKindEnum,
+    TransactionStatusEnum,
+    TRANSACTIONS_POSSIBLE_GATEWAYS,
+    WebhookEventKindEnum,
+    WebhookEventStatusEnum,
+)
+
+User = get_user_model()
+
+GATEWAY_ID = "104578"
+
+
+def make_webhook_data(event_id: int, status: str = "approved") -> dict:
+    return {
+        "id": event_id,
+        "name": f"transaction.{status}",
+        "entity": {"id": GATEWAY_ID, "status": status},
+    }
+
+
+class PaymentWebhookProcessorTest(TestCase):
+    """Suite de tests de l' application des événements de paiement."""
+
+    def setUp(self):
+        """Initialisation des données de test."""
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpass123",
+            first_name="Test",
+            last_name="User",
+        )
+        self.transaction = Transaction.objects.create(
+            type=TransactionKindEnum.ORDER.value,
+            status=TransactionStatusEnum.PENDING.value,
+            gateway=TRANSACTIONS_POSSIBLE_GATEWAYS.FEDAPAY.value,
+            gateway_id=GATEWAY_ID,
+            user=self.user,
+            amount="1000",
+            entity_id="order-1",
+            description="Paiement pour la commande order-1"
+        )
+        # L' effet d' un événement sur sa transaction n' est pas l' objet de ces tests
+        patcher = mock.patch.object(PaymentWebhookProcessor, "apply_payment_event")
+        self.apply_payment_event = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def receive(self, data: dict) -> bool:
+        """Reproduit la vue : enregistre l' événement et indique s' il doit être traité."""
+        event, created = PaymentWebhookEvent.ingest(WebhookEventKindEnum.PAYMENT.value, data)
+        return created or PaymentWebhookProcessor.requeue(event)
+
+    def applied_event_ids(self) -> list:
+        return [call.args[0].payload["id"] for call in self.apply_payment_event.call_args_list]
+
+    def test_duplicate_event_is_applied_once(self):
+        """Un événement renvoyé après son application n' est ni enregistré ni appliqué à nouveau."""
+        self.assertTrue(self.receive(make_webhook_data(1)))
+        self.assertEqual(PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID), 1)
+
+        self.assertFalse(self.receive(make_webhook_data(1)))
+        self.assertEqual(PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID), 0)
+
+        self.assertEqual(self.applied_event_ids(), [1])
+        event = PaymentWebhookEvent.objects.get(gateway_id=GATEWAY_ID)
+        self.assertEqual(event.status, WebhookEventStatusEnum.PROCESSED.value)
+        self.assertEqual(event.attempts, 1)
+
+    def test_failed_event_is_retried(self):
+        """Un événement en échec reste en file avec une date de reprise, sans passer FAILED."""
+        self.apply_payment_event.side_effect = [RuntimeError("gateway error"), None]
+        self.receive(make_webhook_data(1))
+
+        PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID)
+        event = PaymentWebhookEvent.objects.get(gateway_id=GATEWAY_ID)
+        self.assertEqual(event.status, WebhookEventStatusEnum.RECEIVED.value)
+        self.assertIsNotNone(event.retry_at)
+        # La reprise n' est pas encore due
+        self.assertEqual(PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID), 0)
+
+        # La passerelle renvoie l' événement : il est repris tout de suite
+        self.assertTrue(self.receive(make_webhook_data(1)))
+        self.assertEqual(PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID), 1)
+        event.refresh_from_db()
+        self.assertEqual(event.status, WebhookEventStatusEnum.PROCESSED.value)
+        self.assertEqual(self.applied_event_ids(), [1, 1])
+
+    def test_missing_transaction_is_retried(self):
+        """Un événement reçu avant sa transaction n' est pas abandonné."""
+        Transaction.objects.filter(pk=self.transaction.pk).update(gateway_id="")
+        self.receive(make_webhook_data(1))
+
+        PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID)
+        event = PaymentWebhookEvent.objects.get(gateway_id=GATEWAY_ID)
+        self.assertEqual(event.status, WebhookEventStatusEnum.RECEIVED.value)
+        self.assertEqual(event.attempts, 1)
+        self.assertIsNotNone(event.retry_at)
+
+        Transaction.objects.filter(pk=self.transaction.pk).update(gateway_id=GATEWAY_ID)
+        PaymentWebhookEvent.objects.filter(pk=event.pk).update(retry_at=None)
+        PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID)
+        event.refresh_from_db()
+        self.assertEqual(event.status, WebhookEventStatusEnum.PROCESSED.value)
+
+    def test_event_gives_up_after_max_attempts(self):
+        """Après MAX_ATTEMPTS échecs l' événement passe FAILED, et un renvoi lui redonne ses essais."""
+        self.apply_payment_event.side_effect = RuntimeError("gateway error")
+        self.receive(make_webhook_data(1))
+        event = PaymentWebhookEvent.objects.get(gateway_id=GATEWAY_ID)
+
+        for _ in range(PaymentWebhookProcessor.MAX_ATTEMPTS):
+            PaymentWebhookEvent.objects.filter(pk=event.pk).update(retry_at=None)
+            PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID)
+        event.refresh_from_db()
+        self.assertEqual(event.status, WebhookEventStatusEnum.FAILED.value)
+
+        self.assertTrue(self.receive(make_webhook_data(1)))
+        event.refresh_from_db()
+        self.assertEqual(event.status, WebhookEventStatusEnum.RECEIVED.value)
+        self.assertEqual(event.attempts, 0)
+
+    def test_events_are_applied_in_reception_order(self):
+        """Les événements suivants attendent la reprise d' un événement en échec."""
+        self.apply_payment_event.side_effect = [RuntimeError("gateway error"), None, None]
+        self.receive(make_webhook_data(1, "declined"))
+        self.receive(make_webhook_data(2, "approved"))
+
+        PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID)
+        self.assertEqual(self.applied_event_ids(), [1])
+        self.assertEqual(
+            PaymentWebhookEvent.objects.get(payload__id=2).status, WebhookEventStatusEnum.RECEIVED.value
+        )
+
+        PaymentWebhookEvent.objects.filter(gateway_id=GATEWAY_ID).update(retry_at=None)
+        self.assertEqual(PaymentWebhookProcessor.process_transaction_events(GATEWAY_ID), 2)
+        self.assertEqual(self.applied_event_ids(), [1, 1, 2])
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from apps.organizations.models import Withdraw
+from apps.users.models import Transaction, PaymentWebhookEvent
+from apps.xlib.enums import (
+    TransactionStatusEnum, TransactionKindEnum, WithdrawStatusEnum, WebhookEventKindEnum, WebhookEventStatusEnum,
+)
+from apps.xlib.error_util import ErrorUtil, ErrorEnum
+from commons.constants.transactions import FEDAPAY_TRANSACTION_RETURNED_DATA_FORMAT
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class WebhookEventIgnored(Exception):
+    pass
+
+
+class PaymentWebhookProcessor:
+    """
+    Application asynchrone des événements de paiement enregistrés par les webhooks.
+
+    Les événements d' une même transaction sont traités par lot, dans leur ordre de réception, sous le verrou de
+    leurs lignes : deux workers ne traitent jamais la même transaction en même temps.
+    Un événement en échec reste RECEIVED et bloque les suivants jusqu' à sa reprise ( `retry_at`, délai
+    croissant ) ; il ne passe FAILED qu' après MAX_ATTEMPTS traitements, et revient en file si la passerelle
+    le renvoie.
+    """
+
+    PAYMENT_FAILED_STATUS = {
+        "transaction.canceled": TransactionStatusEnum.CANCELED.value,
+        "transaction.declined": TransactionStatusEnum.CANCELED.value,
+        "transaction.failed": TransactionStatusEnum.FAILED.value,
+    }
+    PAYMENT_SUCCESS_STATUS = ["transaction.approved"]
+
+    WITHDRAW_FAILED_STATUS = ["payout.failed"]
+    WITHDRAW_SUCCESS_STATUS = ["payout.sent"]
+
+    HANDLED_EVENTS = {
+        WebhookEventKindEnum.PAYMENT.value: list(PAYMENT_FAILED_STATUS) + PAYMENT_SUCCESS_STATUS,
+        WebhookEventKindEnum.WITHDRAW.value: WITHDRAW_FAILED_STATUS + WITHDRAW_SUCCESS_STATUS,
+    }
+
+    BATCH_SIZE = 100
+    # Événements restés en attente ( tâche perdue, reprise due ) repris par le balayage périodique
+    STALE_AFTER = timedelta(minutes=2)
+    MAX_ATTEMPTS = 8
+    RETRY_DELAY = timedelta(minutes=1)
+    MAX_RETRY_DELAY = timedelta(hours=1)
+
+    @classmethod
+    def is_handled(cls, kind: str, data: dict) -> bool:
+        return data.get("name") in cls.HANDLED_EVENTS[kind]
+
+    @staticmethod
+    def get_webhook_data(entity: dict) -> dict:
+        # Todo: Adapt to other gateways after
+        return {key: entity.get(key, None) for key in FEDAPAY_TRANSACTION_RETURNED_DATA_FORMAT.keys()}
+
+    @classmethod
+    def apply_payment_event(cls, event: PaymentWebhookEvent, _transaction: Transaction):
+        entity = event.payload.get("entity", {}) or {}
+        time_threshold = timezone.now() - timezone.timedelta(minutes=10)
+
+        if _transaction.completed \
+                and _transaction.status_updated_at is not None and _transaction.status_updated_at < time_threshold:
+            raise WebhookEventIgnored(ErrorUtil.get_error_detail(ErrorEnum.TRANSACTION_ALREADY_COMPLETED))
+
+        if _transaction.paid:
+            raise WebhookEventIgnored(ErrorUtil.get_error_detail(ErrorEnum.TRANSACTION_ALREADY_PAID))
+
+        transaction_status = f"transaction.{entity.get('status', None)}"
+
+        if transaction_status in cls.PAYMENT_FAILED_STATUS:
+            _transaction.status = cls.PAYMENT_FAILED_STATUS[transaction_status]
+        elif transaction_status in cls.PAYMENT_SUCCESS_STATUS:
+            _transaction.status = TransactionStatusEnum.PAID.value
+
+        _transaction.last_webhook_data = cls.get_webhook_data(entity)
+        _transaction.status_updated_at = timezone.now()
+        _transaction.save()
+
+    @classmethod
+    def apply_withdraw_event(cls, event: PaymentWebhookEvent, _transaction: Transaction):
+        entity = event.payload.get("entity", {}) or {}
+
+        if _transaction.completed:
+            raise WebhookEventIgnored(ErrorUtil.get_error_detail(ErrorEnum.TRANSACTION_ALREADY_COMPLETED))
+
+        related_withdraw = Withdraw.objects.get(pk=_transaction.entity_id)
+        transaction_status = f"payout.{entity.get('status', None)}"
+
+        if transaction_status in cls.WITHDRAW_FAILED_STATUS:
+            _transaction.status = TransactionStatusEnum.FAILED.value
+            related_withdraw.status = WithdrawStatusEnum.FAILED.value
+        elif transaction_status in cls.WITHDRAW_SUCCESS_STATUS:
+            _transaction.status = TransactionStatusEnum.RESOLVED.value
+            related_withdraw.status = WithdrawStatusEnum.FINISHED.value
+            related_withdraw.save()
+            related_withdraw.update_user_financial_account()
+
+        _transaction.last_webhook_data = cls.get_webhook_data(entity)
+        _transaction.status_updated_at = timezone.now()
+        _transaction.save()
+        related_withdraw.save()
+
+    @staticmethod
+    def get_transaction(event: PaymentWebhookEvent):
+        queryset = Transaction.objects.select_for_update().filter(gateway_id=event.gateway_id)
+        if event.kind == WebhookEventKindEnum.WITHDRAW.value:
+            queryset = queryset.filter(type=TransactionKindEnum.WITHDRAW.value)
+        return queryset.first()
+
+    @classmethod
+    def get_retry_delay(cls, attempts: int) -> timedelta:
+        return min(cls.RETRY_DELAY * 2 ** (attempts - 1), cls.MAX_RETRY_DELAY)
+
+    @classmethod
+    def fail_attempt(cls, event: PaymentWebhookEvent, error: str) -> None:
+        """
+            Schedule the retry of the event, or give up after MAX_ATTEMPTS.
+        """
+        event.error = error
+        if event.attempts >= cls.MAX_ATTEMPTS:
+            event.status = WebhookEventStatusEnum.FAILED.value
+            event.retry_at = None
+        else:
+            event.retry_at = timezone.now() + cls.get_retry_delay(event.attempts)
+
+    @classmethod
+    def process_transaction_events(cls, gateway_id: str) -> int:
+        """
+            Apply the pending events of one gateway transaction, in their reception order.
+        :return: the number of handled events
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            events = list(
+                PaymentWebhookEvent.objects.select_for_update()
+                .filter(gateway_id=gateway_id, status=WebhookEventStatusEnum.RECEIVED.value)
+                .order_by("timestamp")[:cls.BATCH_SIZE]
+            )
+
+            transactions, handled = {}, []
+            for event in events:
+                if event.retry_at is not None and event.retry_at > now:
+                    # The next events wait for this one, to be applied in order
+                    break
+                handled.append(event)
+                event.attempts += 1
+                event.processed_at = now
+                event.retry_at = None
+
+                if event.kind not in transactions:
+                    transactions[event.kind] = cls.get_transaction(event)
+                _transaction = transactions[event.kind]
+                if _transaction is None:
+                    cls.fail_attempt(event, ErrorUtil.get_error_detail(
+                        ErrorEnum.WITHDRAW_TRANSACTION_NOT_FOUND
+                        if event.kind == WebhookEventKindEnum.WITHDRAW.value
+                        else ErrorEnum.PAYMENT_TRANSACTION_NOT_FOUND
+                    ))
+                    if event.status == WebhookEventStatusEnum.RECEIVED.value:
+                        break
+                    continue
+
+                try:
+                    with transaction.atomic():
+                        if event.kind == WebhookEventKindEnum.WITHDRAW.value:
+                            cls.apply_withdraw_event(event, _transaction)
+                        else:
+                            cls.apply_payment_event(event, _transaction)
+                    event.status = WebhookEventStatusEnum.PROCESSED.value
+                    event.error = ""
+                except WebhookEventIgnored as exc:
+                    event.status = WebhookEventStatusEnum.IGNORED.value
+                    event.error = str(exc)
+                except Exception as exc:
+                    logger.exception(f"Webhook event {event.pk} of {gateway_id} failed: {exc}")
+                    _transaction.refresh_from_db()
+                    cls.fail_attempt(event, str(exc))
+                    if event.status == WebhookEventStatusEnum.RECEIVED.value:
+                        break
+
+            if handled:
+                PaymentWebhookEvent.objects.bulk_update(
+                    handled, ["status", "attempts", "processed_at", "retry_at", "error"]
+                )
+
+        if len(events) == cls.BATCH_SIZE and len(handled) == len(events) \
+                and handled[-1].status != WebhookEventStatusEnum.RECEIVED.value:
+            return len(handled) + cls.process_transaction_events(gateway_id)
+        return len(handled)
+
+    @classmethod
+    def get_stale_gateway_ids(cls):
+        now = timezone.now()
+        return (
+            PaymentWebhookEvent.objects
+            .filter(status=WebhookEventStatusEnum.RECEIVED.value, timestamp__lte=now - cls.STALE_AFTER)
+            .filter(Q(retry_at__isnull=True) | Q(retry_at__lte=now))
+            .order_by()
+            .values_list("gateway_id", flat=True)
+            .distinct()
+        )
+
+    @staticmethod
+    def requeue(event: PaymentWebhookEvent) -> bool:
+        """
+            Put an event redelivered by the gateway back in the queue, due now, unless it has already been applied.
+            A FAILED event gets a new round of attempts.
+        :return: True when the event has to be processed
+        """
+        return PaymentWebhookEvent.objects.filter(
+            pk=event.pk,
+            status__in=[WebhookEventStatusEnum.RECEIVED.value, WebhookEventStatusEnum.FAILED.value],
+        ).update(
+            attempts=Case(When(status=WebhookEventStatusEnum.FAILED.value, then=Value(0)), default=F("attempts")),
+            status=WebhookEventStatusEnum.RECEIVED.value,
+            retry_at=None,
+            updated=timezone.now(),
+        ) > 0
+
+    @staticmethod
+    def replay(queryset) -> list:
+        """
+            Put events back in the processing queue.
+        :return: the gateway ids to process
+        """
+        gateway_ids = list(queryset.order_by().values_list("gateway_id", flat=True).distinct())
+        queryset.update(status=WebhookEventStatusEnum.RECEIVED.value, attempts=0, retry_at=None,
+                        updated=timezone.now())
+        return gateway_ids
@@ -532,7 +532,7 @@ class RetrieveUserOrganizationInfoView(RetrieveAPIView):
         return User.objects.filter(pk=self.request.user.pk).prefetch_related(
             Prefetch(
                 'organizations_own',
-                queryset=Organization.objects.all().prefetch_related('subscriptions'),
+                queryset=Organization.objects.all(),
                 to_attr='owned_orgs'
             ),
             Prefetch(
@@ -12,3 +12,6 @@ from django.apps import AppConfig
 class UtilsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.utils'
+
+    def ready(self):
+        import apps.utils.signals.variables_signals
@@ -7,14 +7,79 @@ Created on November 21, 2022
 """
 
 import logging
+import math
 
-from django.db.models import F, Func
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.db.models import F, Func, Max, Q
 from django_softdelete.models import SoftDeleteManager
 
 logger = logging.getLogger(__name__)
 logger.setLevel("INFO")
 
 
+EARTH_RADIUS_KM = 6371.0
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Latitude / longitude rectangle enclosing the circle of `radius_km` around the given location.
+    :return: ( min_lat, max_lat, min_long, max_long )
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    # Near the poles the circle covers every longitude
+    delta_long = 180.0 if cos_lat < 1e-6 else min(180.0, delta_lat / cos_lat)
+    return latitude - delta_lat, latitude + delta_lat, longitude - delta_long, longitude + delta_long
+
+
+def geography_point(latitude, longitude):
+    if latitude is None or longitude is None:
+        return None
+    return Point(float(longitude), float(latitude), srid=4326)
+
+
+def has_postgis() -> bool:
+    return getattr(connection.ops, "postgis", False)
+
+
+def bounding_box_filter(dynamic_location_fields, static_location, radius_km) -> Q:
+    latitude_field_name, longitude_field_name = dynamic_location_fields
+    min_lat, max_lat, min_long, max_long = bounding_box(*static_location, radius_km)
+    return Q(**{
+        f"{latitude_field_name}__range": (min_lat, max_lat),
+        f"{longitude_field_name}__range": (min_long, max_long),
+    })
+
+
+def spherical_distance_expression(latitude_field_name, longitude_field_name, latitude, longitude):
+    """
+    Haversine distance, in kilometers, between the given location and the latitude / longitude columns.
+    """
+    class Sin(Func):
+        function = "SIN"
+
+    class Cos(Func):
+        function = "COS"
+
+    class Acos(Func):
+        function = "ACOS"
+
+    class Radians(Func):
+        function = "RADIANS"
+
+    radlat = Radians(latitude)  # given latitude
+    radlong = Radians(longitude)  # given longitude
+    radflat = Radians(F(latitude_field_name))
+    radflong = Radians(F(longitude_field_name))
+
+    # Note 3959.0 is for miles. Use 6371 for kilometers
+    return EARTH_RADIUS_KM * Acos(
+        Cos(radlat) * Cos(radflat) * Cos(radflong - radlong)
+        + Sin(radlat) * Sin(radflat)
+    )
+
+
 class GeoModelManager(SoftDeleteManager):
 
     def annotate_spherical_distance(
@@ -32,27 +97,48 @@ class GeoModelManager(SoftDeleteManager):
         @see http://stackoverflow.com/a/31715920/1373318
         """
 
-        class Sin(Func):
-            function = "SIN"
-
-        class Cos(Func):
-            function = "COS"
-
-        class Acos(Func):
-            function = "ACOS"
+        return self.get_queryset().annotate(
+            spherical_distance=spherical_distance_expression(
+                latitude_field_name, longitude_field_name, latitude, longitude
+            )
+        )
 
-        class Radians(Func):
-            function = "RADIANS"
+    def filter_bounding_box(self, dynamic_location_fields, static_location, radius_km):
+        """
+        Cheap rectangle prefilter on the latitude / longitude columns, served by their btree index.
+        """
+        return self.get_queryset().filter(bounding_box_filter(dynamic_location_fields, static_location, radius_km))
 
-        radlat = Radians(latitude)  # given latitude
-        radlong = Radians(longitude)  # given longitude
-        radflat = Radians(F(latitude_field_name))
-        radflong = Radians(F(longitude_field_name))
+    def filter_near_by(
+            self,
+            geography_field_name,
+            dynamic_location_fields,
+            static_location,
+            radius_m,
+            max_radius_m=None,
+    ):
+        """
+        Returns the locations within `radius_m` meters of the given ( lat, long ).
+        `radius_m` may be an expression ( per row radius ), bounded for the prefilter by `max_radius_m`,
+        looked up when not given.
 
-        # Note 3959.0 is for miles. Use 6371 for kilometers
-        Expression = 6371.0 * Acos(
-            Cos(radlat) * Cos(radflat) * Cos(radflong - radlong)
-            + Sin(radlat) * Sin(radflat)
-        )
+        On PostGIS: `ST_DWithin` on the geography column, served by its GiST index.
+        Elsewhere: bounding box prefilter, then the exact spherical distance on the remaining rows.
+        """
+        latitude, longitude = static_location
+        if has_postgis():
+            return self.get_queryset().filter(
+                **{f"{geography_field_name}__dwithin": (geography_point(latitude, longitude), radius_m)}
+            )
 
-        return self.get_queryset().annotate(spherical_distance=Expression)
+        if max_radius_m is None:
+            max_radius_m = radius_m if isinstance(radius_m, (int, float)) else self.get_queryset().aggregate(
+                max_radius_m=Max(radius_m)
+            )["max_radius_m"] or 0
+        queryset = self.filter_bounding_box(dynamic_location_fields, static_location, max_radius_m / 1000)
+        latitude_field_name, longitude_field_name = dynamic_location_fields
+        return queryset.annotate(
+            spherical_distance=spherical_distance_expression(
+                latitude_field_name, longitude_field_name, latitude, longitude
+            )
+        ).filter(spherical_distance__lte=radius_m / 1000)
@@ -33,7 +33,9 @@ class Variable(AbstractCommonBaseModel):
         verbose_name_plural = "Variables"
 
     def format_value(self, value):
-        return eval(self.type)(value)
+        from apps.utils.services.variables import VariableRegistry
+
+        return VariableRegistry.cast(self.type, value)
 
 
 class VariableValue(AbstractCommonBaseModel):
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+import logging
+import os
+import threading
+import time
+from decimal import Decimal
+
+from django.conf import settings
+
+from apps.utils.models import Variable, VariableValue
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+_MISSING = object()
+
+
+class VariableRegistry:
+    """
+    Registre typé des variables de configuration ( Variable / VariableValue ).
+
+    Toutes les variables sont chargées en 2 requêtes et gardées dans la mémoire du processus pendant TTL secondes.
+    Toute modification d' une variable vide le registre de chaque processus via le pub/sub Redis.
+    """
+
+    TTL = 300
+    INVALIDATION_CHANNEL = "variables_registry:invalidate"
+
+    CASTERS = {
+        "int": int,
+        "float": float,
+        "str": str,
+    }
+
+    _variables = None
+    _expires_at = 0
+    _lock = threading.Lock()
+    _listener_pid = None
+
+    @classmethod
+    def cast(cls, variable_type, value):
+        return cls.CASTERS.get(variable_type, str)(value)
+
+    @classmethod
+    def _load(cls):
+        variables = {
+            pk: (name, variable_type, [])
+            for pk, name, variable_type in Variable.objects.values_list("pk", "name", "type")
+        }
+        # Même ordre que `possible_values.first()`
+        for variable_id, value in VariableValue.objects.order_by("pk").values_list("variable_id", "value"):
+            if variable_id in variables:
+                variables[variable_id][2].append(value)
+        return {name: (variable_type, values) for name, variable_type, values in variables.values()}
+
+    @classmethod
+    def _get_variables(cls):
+        cls._ensure_listener()
+        variables = cls._variables
+        if variables is None or time.monotonic() >= cls._expires_at:
+            with cls._lock:
+                if cls._variables is None or time.monotonic() >= cls._expires_at:
+                    cls._variables = cls._load()
+                    cls._expires_at = time.monotonic() + cls.TTL
+                variables = cls._variables
+        return variables
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._variables = None
+            cls._expires_at = 0
+
+    @classmethod
+    def _redis_client(cls):
+        import redis
+
+        return redis.Redis.from_url(settings.CACHES["default"]["LOCATION"])
+
+    @classmethod
+    def invalidate(cls):
+        """
+            Clear the registry of the current process and of every other process through Redis pub/sub.
+        """
+        cls.clear()
+        try:
+            cls._redis_client().publish(cls.INVALIDATION_CHANNEL, "1")
+        except Exception as exc:
+            logger.warning(f"Variables registry invalidation not published, the TTL will apply: {exc}")
+
+    @classmethod
+    def _ensure_listener(cls):
+        # Un thread d' écoute par processus ( les workers forkés ne l' héritent pas )
+        if cls._listener_pid == os.getpid():
+            return
+        with cls._lock:
+            if cls._listener_pid == os.getpid():
+                return
+            cls._listener_pid = os.getpid()
+        thread = threading.Thread(target=cls._listen, name="variables-registry-listener", daemon=True)
+        thread.start()
+
+    @classmethod
+    def _listen(cls):
+        while True:
+            try:
+                pubsub = cls._redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(cls.INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        cls.clear()
+            except Exception as exc:
+                logger.warning(f"Variables registry listener disconnected: {exc}")
+            # Reconnexion : les invalidations manquées entre temps sont couvertes par le vidage
+            cls.clear()
+            time.sleep(5)
+
+    @classmethod
+    def _get_entry(cls, name):
+        entry = cls._get_variables().get(name)
+        if entry is None:
+            raise Variable.DoesNotExist(f"Variable {name} does not exist.")
+        return entry
+
+    @classmethod
+    def get(cls, name, default=_MISSING):
+        """
+            Return the first value of the variable, cast with the variable type.
+        """
+        try:
+            variable_type, values = cls._get_entry(name)
+            if not values:
+                raise VariableValue.DoesNotExist(f"Variable {name} has no value.")
+            return cls.cast(variable_type, values[0])
+        except (Variable.DoesNotExist, VariableValue.DoesNotExist, ValueError):
+            if default is _MISSING:
+                raise
+            return default
+
+    @classmethod
+    def get_int(cls, name, default=_MISSING):
+        value = cls.get(name, default)
+        return value if value is default else int(value)
+
+    @classmethod
+    def get_float(cls, name, default=_MISSING):
+        value = cls.get(name, default)
+        return value if value is default else float(value)
+
+    @classmethod
+    def get_decimal(cls, name, default=_MISSING):
+        try:
+            variable_type, values = cls._get_entry(name)
+            if not values:
+                raise VariableValue.DoesNotExist(f"Variable {name} has no value.")
+            return Decimal(values[0])
+        except (Variable.DoesNotExist, VariableValue.DoesNotExist, ArithmeticError):
+            if default is _MISSING:
+                raise
+            return default
+
+    @classmethod
+    def get_list(cls, name, cast=None, default=_MISSING):
+        """
+            Return all the values of the variable, cast with `cast` or the variable type.
+        """
+        try:
+            variable_type, values = cls._get_entry(name)
+        except Variable.DoesNotExist:
+            if default is _MISSING:
+                raise
+            return default
+        return [cast(value) if cast else cls.cast(variable_type, value) for value in values]
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 17/10/2026
+
+@author:
+    Wesley Eliel MONTCHO, alias DevBackend7
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.utils.models import Variable, VariableValue
+from apps.utils.services.variables import VariableRegistry
+
+
+@receiver(post_save, sender=Variable)
+@receiver(post_delete, sender=Variable)
+@receiver(post_save, sender=VariableValue)
+@receiver(post_delete, sender=VariableValue)
+def invalidate_variables_registry(sender, instance, **kwargs):
+    transaction.on_commit(VariableRegistry.invalidate)
@@ -44,6 +44,9 @@ class ErrorEnum(BaseEnum):
     MISSING_DATE = "MISSING_DATE"
     INVALID_DATE_FORMAT = "INVALID_DATE_FORMAT"
     MISSING_DATE_RANGE = "MISSING_DATE_RANGE"
+    INVALID_LOCATION = "INVALID_LOCATION"
+    INVALID_CURSOR = "INVALID_CURSOR"
+    PAGE_NUMBER_NOT_SUPPORTED = "PAGE_NUMBER_NOT_SUPPORTED"
     ORGANIZATION_WITH_THIS_NAME_ALREADY_EXISTS = (
         "ORGANIZATION_WITH_THIS_NAME_ALREADY_EXISTS"
     )
@@ -279,6 +282,8 @@ class NOTIFICATION_TYPE_TEMPLATE_BY_CHANNEL_ENUM(BaseEnum):
 class NOTIFICATION_STATUS_ENUM(BaseEnum):
     FAILED = "FAILED"
     SUCCESS = "SUCCESS"
+    PENDING = "PENDING"  # waiting for a delivery worker
+    SENDING = "SENDING"  # claimed by a delivery worker
 
 
 class NOTIFICATION_CHANNELS_ENUM(BaseEnum):
@@ -374,3 +379,22 @@ class ChatRoomRolesEnum(BaseEnum):
 class OrganizationRolesEnum(BaseEnum):
     MEMBER = "Member"
     COORDINATOR = "Coordinator"
+
+
+class TicketHoldStatusEnum(BaseEnum):
+    HELD = "HELD"  # tickets are reserved while the order is being paid
+    CONFIRMED = "CONFIRMED"  # order has been paid, tickets are sold
+    RELEASED = "RELEASED"  # payment has failed, tickets are back on sale
+    EXPIRED = "EXPIRED"  # payment has been abandoned, tickets are back on sale
+
+
+class WebhookEventKindEnum(BaseEnum):
+    PAYMENT = "PAYMENT"  # payment transaction event
+    WITHDRAW = "WITHDRAW"  # payout event
+
+
+class WebhookEventStatusEnum(BaseEnum):
+    RECEIVED = "RECEIVED"  # event is stored, waiting to be processed
+    PROCESSED = "PROCESSED"  # event has been applied to its transaction
+    IGNORED = "IGNORED"  # event has nothing left to apply ( transaction already completed )
+    FAILED = "FAILED"  # event processing has failed, it can be replayed
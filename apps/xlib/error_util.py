@@ -15,6 +15,11 @@ ERROR_MAP = {
     ErrorEnum.MISSING_DEVICE_REGISTRATION_ID.value: "Le token du téléphone est manquant.",
     ErrorEnum.INVALID_DATE_FORMAT.value: "Le format de la date est invalide. Utilisez le format YYYY-MM-DD.",
     ErrorEnum.MISSING_DATE_RANGE.value: "L' intervalle de dates est manquant.",
+    ErrorEnum.INVALID_LOCATION.value: "La position est invalide : lat, long, rayon ( en mètres ) ou bbox "
+                                      "( min_long,min_lat,max_long,max_lat ) incorrects.",
+    ErrorEnum.INVALID_CURSOR.value: "Le curseur de pagination est invalide.",
+    ErrorEnum.PAGE_NUMBER_NOT_SUPPORTED.value: "La pagination par numéro de page ( p ) n' est plus supportée : "
+                                               "suivez le lien `next`, qui porte le paramètre `cursor`.",
     ErrorEnum.EMPTY_OR_NULL_ORGANIZATION_PK_IN_URL.value: "La clé primaire de l' organisation est vide ou nulle dans"
                                                           " l' URL.",
     ErrorEnum.INACTIVE_ORGANIZATION.value: "Cette organisation n' est pas active.",
@@ -161,7 +161,7 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.LazyJWTAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "apps.docs.CustomAutoSchema",
     "EXCEPTION_HANDLER": "drf_standardized_errors.handler.exception_handler",
@@ -211,6 +211,9 @@ DRF_LOGGER_QUEUE_MAX_SIZE = 30
 DRF_API_LOGGER_DATABASE = True
 DRF_LOGGER_INTERVAL = 10
 
+# "sync": notifications are sent by the celery tasks, "async": they are left to `run_delivery_worker`
+NOTIFICATIONS_DELIVERY_MODE = os.environ.get("NOTIFICATIONS_DELIVERY_MODE", "sync")
+
 # Todo: Specially target DB logging queries, if other logging types added
 ENABLE_DB_QUERIES_LOGGING = bool(int(os.environ.get("ENABLE_DB_QUERIES_LOGGING", "0")))
 if ENABLE_DB_QUERIES_LOGGING:
@@ -267,14 +270,22 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.utils.tasks.db_tasks.backup_db",
         "schedule": crontab(minute=0, hour="*/6"),
     },
-    "notifications_about_approach_of_favourite_event": {
-        "task": "apps.notifications.tasks.notifications_tasks.notify_users_about_the_approach_of_favourite_event",
-        "schedule": crontab(minute=0, hour="*/1"),
+    "dispatch_due_notifications": {
+        "task": "apps.notifications.tasks.notifications_tasks.dispatch_due_notifications",
+        "schedule": crontab(minute="*/1"),
     },
     "update_subscriptions_active_status": {
         "task": "apps.organizations.tasks.subscriptions_tasks.update_subscriptions_active_status",
         "schedule": crontab(minute=0, hour="*/1"),
     },
+    "expire_ticket_holds": {
+        "task": "apps.events.tasks.eticket_tasks.expire_ticket_holds",
+        "schedule": crontab(minute="*/1"),
+    },
+    "process_stale_payment_webhook_events": {
+        "task": "apps.users.tasks.transactions_tasks.process_stale_payment_webhook_events",
+        "schedule": crontab(minute="*/2"),
+    },
     "scan-send-reports-every-5min": {
         "task": "apps.super_sellers.tasks.reporting_tasks.scan_and_send_scheduled_reports",
         "schedule": crontab(minute="*/5"),
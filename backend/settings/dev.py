@@ -65,6 +65,13 @@ CHANNEL_LAYERS = {
     },
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": environ.get("CACHE_REDIS_URL", "redis://127.0.0.1:6379/1"),
+    },
+}
+
 CELERY_BROKER_URL = "redis://localhost:6379/0"
 CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
 
@@ -107,6 +114,8 @@ if USE_AWS:
         },
     }
 
+GATE_MANIFEST_SIGNING_KEY = environ.get("GATE_MANIFEST_SIGNING_KEY")
+
 SELLER_INVITATION_EXPIRY_DAYS = int(environ.get("SELLER_INVITATION_EXPIRY_DAYS", 7))
 GUPSHUP_API_BASE = "https://api.gupshup.io"
 GUPSHUP_API_KEY = environ.get("GUPSHUP_API_KEY")
@@ -71,6 +71,13 @@ CHANNEL_LAYERS = {
     },
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": environ.get("CACHE_REDIS_URL", "redis://redis_service:6379/1"),
+    },
+}
+
 CELERY_BROKER_URL = environ.get("CELERY_BROKER", "redis://redis_service:6379/0")
 CELERY_RESULT_BACKEND = environ.get("CELERY_BROKER", "redis://redis_service:6379/0")
 
@@ -125,6 +132,8 @@ sentry_sdk.init(
     release="production",
 )
 
+GATE_MANIFEST_SIGNING_KEY = environ.get("GATE_MANIFEST_SIGNING_KEY")
+
 SELLER_INVITATION_EXPIRY_DAYS = int(environ.get("SELLER_INVITATION_EXPIRY_DAYS", 7))
 GUPSHUP_API_BASE = "https://api.gupshup.io"
 GUPSHUP_API_KEY = environ.get("GUPSHUP_API_KEY")
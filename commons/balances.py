@@ -0,0 +1,49 @@
+from django.db import connection
+
+
+def apply_balance_deltas(model, pk, deltas: dict, minimums: dict = None, assignments: dict = None):
+    """
+    Apply signed deltas to decimal columns of one row in a single `UPDATE ... RETURNING` statement.
+
+    The row is only updated when every column of `minimums` stays greater than or equal to its minimum after
+    the deltas, so that a concurrent debit can never make a balance negative.
+
+    :param model: the model class
+    :param pk: primary key of the row
+    :param deltas: {field_name: signed amount}
+    :param minimums: {field_name: minimum value after the update}
+    :param assignments: {field_name: value} plain assignments done in the same statement
+    :return: {field_name: new value} for the fields of `deltas`, None when a minimum was not satisfied
+    """
+    quote_name = connection.ops.quote_name
+    opts = model._meta
+    set_clauses, where_clauses, params = [], [], []
+
+    for field_name, amount in deltas.items():
+        column = quote_name(opts.get_field(field_name).column)
+        set_clauses.append(f"{column} = {column} + %s")
+        params.append(amount)
+    for field_name, value in (assignments or {}).items():
+        field = opts.get_field(field_name)
+        set_clauses.append(f"{quote_name(field.column)} = %s")
+        params.append(field.get_db_prep_value(value, connection))
+
+    where_clauses.append(f"{quote_name(opts.pk.column)} = %s")
+    params.append(opts.pk.get_db_prep_value(pk, connection))
+    for field_name, minimum in (minimums or {}).items():
+        column = quote_name(opts.get_field(field_name).column)
+        where_clauses.append(f"{column} + %s >= %s")
+        params.extend([deltas.get(field_name, 0), minimum])
+
+    returning = [quote_name(opts.get_field(field_name).column) for field_name in deltas]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {quote_name(opts.db_table)} SET {', '.join(set_clauses)} "
+            f"WHERE {' AND '.join(where_clauses)} RETURNING {', '.join(returning)}",
+            params,
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+    return dict(zip(deltas, row))